@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+仪表盘数据HTTP接口
+将 dashboard_data.json 读入内存，按分区预先编码好响应体、gzip压缩版本和强ETag，
+请求时只做查表；客户端带 If-None-Match 时返回304。数据文件被重新生成后自动热加载。
+用法:
+  python api_server.py [--host 127.0.0.1] [--port 8000] [--data data/dashboard_data.json]
+接口: /news /tools /opportunities /metadata
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from atomic_io import CorruptDataError, load_json
+from serializer import compress, dumps
+
+DEFAULT_DATA_FILE = Path("data/dashboard_data.json")
+
+# 接口路径 -> 构造响应数据的函数
+ENDPOINTS = {
+    '/news': lambda data: data.get('environmental_news', []),
+    '/tools': lambda data: data.get('ai_tools', []),
+    '/opportunities': lambda data: data.get('opportunities', []),
+    '/metadata': lambda data: {
+        'last_updated': data.get('last_updated'),
+        'current_date': data.get('current_date'),
+        **data.get('metadata', {})
+    },
+}
+
+
+class Representation:
+    """一个接口的预编码响应：原始和gzip两种内容编码各有自己的强ETag"""
+    __slots__ = ('body', 'gzip_body', 'etag', 'gzip_etag')
+
+    def __init__(self, payload):
+        self.body = dumps(payload)
+        self.gzip_body = compress(self.body, 'gz')
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+
+
+class DashboardStore:
+    """内存中的仪表盘数据，按文件的修改时间和大小检测变化并重新加载
+
+    检查间隔内的请求不访问文件系统；重新加载失败（文件损坏、校验和文件尚未写入等）时继续提供旧数据，
+    并在下一个检查间隔重试
+    """
+
+    def __init__(self, path=DEFAULT_DATA_FILE, check_interval=1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.representations = {}
+        self.last_modified = None
+        self.signature = None
+        self.next_check = 0.0
+        self.reloads = 0
+        self.reload()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self):
+        """重新读取数据文件并预编码所有接口，返回是否成功"""
+        signature = self._stat()
+        if signature is None:
+            print(f"📂 文件 {self.path} 不存在，接口暂无数据")
+            return False
+        try:
+            data = load_json(self.path)
+        except (OSError, CorruptDataError) as e:
+            # 不记录本次的文件签名，下次检查时重试（发布过程中数据文件先于.sha256更新）
+            print(f"⚠️  重新加载 {self.path} 失败，继续使用旧数据: {e}")
+            return False
+
+        self.representations = {path: Representation(build(data)) for path, build in ENDPOINTS.items()}
+        self.last_modified = formatdate(signature[0] / 1e9, usegmt=True)
+        self.signature = signature
+        self.reloads += 1
+        print(f"🔁 已加载 {self.path}（第 {self.reloads} 次）")
+        return True
+
+    def get(self, path):
+        """返回接口的预编码响应，必要时先检查文件是否变化"""
+        now = time.monotonic()
+        if now >= self.next_check:
+            with self.lock:
+                if now >= self.next_check:
+                    if self._stat() != self.signature:
+                        self.reload()
+                    self.next_check = now + self.check_interval
+        return self.representations.get(path)
+
+
+def _etag_matches(header, etags):
+    """If-None-Match 是否命中任一ETag（支持逗号分隔的列表、*和弱校验前缀W/）"""
+    if header is None:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or any(value.removeprefix('W/') in etags for value in candidates)
+
+
+def _accepts_gzip(header):
+    """Accept-Encoding 中是否接受gzip（q=0 表示拒绝）"""
+    for part in (header or '').split(','):
+        coding, *params = part.split(';')
+        if coding.strip().lower() not in ('gzip', '*'):
+            continue
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+class DashboardRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'EnvDashboardAPI/1.0'
+    # 响应头和响应体分两次写出，关闭Nagle算法避免与延迟ACK叠加出约40ms的等待
+    disable_nagle_algorithm = True
+    store = None
+    quiet = True
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        path = urlsplit(self.path).path.rstrip('/') or '/'
+        representation = self.store.get(path)
+        if representation is None:
+            body = dumps({'error': 'not found', 'endpoints': sorted(ENDPOINTS)})
+            self.send_response(404)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        use_gzip = _accepts_gzip(self.headers.get('Accept-Encoding'))
+        etag = representation.gzip_etag if use_gzip else representation.etag
+        body = representation.gzip_body if use_gzip else representation.body
+
+        if _etag_matches(self.headers.get('If-None-Match'), (representation.etag, representation.gzip_etag)):
+            self.send_response(304)
+            self.send_common_headers(etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_common_headers(etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def send_common_headers(self, etag):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.store.last_modified)
+        # 允许缓存但每次都需要重新验证，数据更新后客户端立即拿到新内容
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def create_server(host='127.0.0.1', port=8000, data_file=DEFAULT_DATA_FILE, quiet=True, check_interval=1.0):
+    """创建接口服务器（未启动）；port为0时由系统分配端口"""
+    handler = type('Handler', (DashboardRequestHandler,), {
+        'store': DashboardStore(data_file, check_interval=check_interval),
+        'quiet': quiet,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve_in_background(host='127.0.0.1', port=8000, data_file=DEFAULT_DATA_FILE, quiet=True):
+    """在后台线程中运行接口服务器，返回服务器对象（调用shutdown()停止）"""
+    server = create_server(host, port, data_file, quiet)
+    threading.Thread(target=server.serve_forever, name='api-server', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="仪表盘数据HTTP接口")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--data', default=str(DEFAULT_DATA_FILE))
+    parser.add_argument('--verbose', action='store_true', help='打印每个请求的访问日志')
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.data, quiet=not args.verbose)
+    host, port = server.server_address[:2]
+    print(f"🌐 仪表盘接口已启动: http://{host}:{port}  ({', '.join(ENDPOINTS)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("👋 接口服务已停止")
+
+
+if __name__ == "__main__":
+    main()
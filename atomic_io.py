@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+原子文件写入与校验
+先写入同目录的临时文件并fsync，再用rename替换目标文件，中途失败时目标文件保持原样，
+不会留下截断的JSON。可选写入 <文件名>.sha256 校验文件（sha256sum格式），
+读取时核对校验和，损坏的文件立即报错，而不是被解析失败后悄悄换成备用内容
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class CorruptDataError(ValueError):
+    """数据文件与校验和不符或无法解析"""
+
+
+def checksum_path(path):
+    path = Path(path)
+    return path.with_name(f"{path.name}.sha256")
+
+
+def sha256_file(path):
+    """分块计算文件哈希，不把整个文件读入内存"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fsync_dir(directory):
+    """rename之后同步目录项，确保断电后新文件名已落盘（部分平台不支持打开目录）"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _replace(path, data):
+    """写入临时文件、fsync后替换目标文件"""
+    directory = path.parent
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def _write_checksum(path, data):
+    digest = hashlib.sha256(data).hexdigest()
+    _replace(checksum_path(path), f"{digest}  {path.name}\n".encode('utf-8'))
+
+
+def atomic_write(path, data, checksum=False):
+    """原子写入字节或字符串（UTF-8）；checksum为True时同时写入.sha256校验文件
+
+    先替换数据文件再写校验文件，两步之间崩溃时校验不通过，按损坏处理；
+    不需要校验时删除可能残留的旧校验文件，避免误报
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    _replace(path, data)
+    if checksum:
+        _write_checksum(path, data)
+    else:
+        try:
+            os.remove(checksum_path(path))
+        except FileNotFoundError:
+            pass
+
+
+def write_if_changed(path, data, checksum=False):
+    """内容与现有文件字节完全一致时跳过写入（校验文件缺失时补写），返回是否写入数据文件"""
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if path.exists() and path.read_bytes() == data:
+        if checksum:
+            try:
+                recorded = read_checksum(path)
+            except CorruptDataError:
+                recorded = None
+            if recorded != hashlib.sha256(data).hexdigest():
+                _write_checksum(path, data)
+        return False
+    atomic_write(path, data, checksum=checksum)
+    return True
+
+
+def read_checksum(path):
+    """读取校验文件中记录的哈希，没有校验文件时返回None"""
+    try:
+        content = checksum_path(path).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+    fields = content.split()
+    if not fields:
+        raise CorruptDataError(f"{checksum_path(path)}: 校验文件为空")
+    return fields[0]
+
+
+def verify_file(path, data=None, digest=None):
+    """核对文件与校验文件是否一致；可传入已读取的内容或已算好的哈希，避免重复读取
+
+    没有校验文件时不做检查；不一致时抛出CorruptDataError
+    """
+    expected = read_checksum(path)
+    if expected is None:
+        return False
+    if digest is None:
+        digest = hashlib.sha256(data).hexdigest() if data is not None else sha256_file(path)
+    if digest != expected:
+        raise CorruptDataError(f"{path}: 校验和不符（期望 {expected[:12]}…，实际 {digest[:12]}…），文件可能被截断或损坏")
+    return True
+
+
+def load_json(path):
+    """读取并校验JSON文件，校验和不符或无法解析时抛出CorruptDataError"""
+    data = Path(path).read_bytes()
+    verify_file(path, data=data)
+    try:
+        return json.loads(data)
+    except ValueError as e:
+        raise CorruptDataError(f"{path}: 无法解析JSON（{e}）") from e
+
+
+class AtomicWriter:
+    """流式写入同目录的临时文件，正常退出时原子替换目标文件
+
+    内容与现有文件完全相同时丢弃临时文件、不改动目标文件，退出后 changed 表示是否替换；
+    with块中抛出异常时删除临时文件，目标文件保持原样
+    """
+
+    def __init__(self, path, encoding='utf-8'):
+        self.path = Path(path)
+        self.encoding = encoding
+        self.changed = False
+        self.file = None
+        self.tmp_name = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self.tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix='.tmp')
+        self.file = os.fdopen(fd, 'w', encoding=self.encoding, newline='\n')
+        return self
+
+    def write(self, text):
+        return self.file.write(text)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            self.file.close()
+            if exc_type is None and not self._same_as_existing():
+                os.replace(self.tmp_name, self.path)
+                _fsync_dir(self.path.parent)
+                self.changed = True
+        finally:
+            if not self.changed:
+                try:
+                    os.remove(self.tmp_name)
+                except FileNotFoundError:
+                    pass
+        return False
+
+    def _same_as_existing(self):
+        try:
+            if os.path.getsize(self.path) != os.path.getsize(self.tmp_name):
+                return False
+        except FileNotFoundError:
+            return False
+        return sha256_file(self.path) == sha256_file(self.tmp_name)
@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""
+性能基准测试脚本
+用法:
+  python benchmark.py selection [--sizes 100000 1000000]
+  python benchmark.py pipeline [--sizes 1000 10000 100000] [--output bench_results.json] [--baseline 旧结果.json]
+  python benchmark.py html [--pages fixtures/fenner_news.html] [--repeat 20]
+  python benchmark.py dedup [--pages fixtures/fenner_news.html] [--sizes 5000 20000 80000]
+  python benchmark.py serialize [--sizes 1000 100000] [--repeat 3]
+  python benchmark.py report [--sizes 1000 10000 100000] [--formats md html txt]
+  python benchmark.py profiles [--size 20000] [--profiles 2 8 16]
+  python benchmark.py api [--clients 1 8 32] [--requests 500] [--data data/dashboard_data.json]
+  python benchmark.py startup [--modules run_pipeline ...] [--budget-ms 300] [--output startup.json]
+"""
+
+import argparse
+import contextlib
+import datetime
+import http.client
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import threading
+import tracemalloc
+from pathlib import Path
+from urllib.parse import urljoin
+
+import api_server
+import html_extract
+import profiles
+import report_renderer
+import serializer
+from data_processor import DashboardDataProcessor
+from ranking import load_ranking
+from selection import DiversityTopK
+
+# 合成数据使用的取值范围，与各抓取脚本产出的字段保持一致
+CJK_CHARS = [chr(code) for code in range(0x4e00, 0x4e00 + 3000)]
+EN_WORDS = ['climate', 'carbon', 'river', 'forest', 'policy', 'data', 'model', 'survey',
+            'biodiversity', 'wetland', 'drought', 'bushfire', 'satellite', 'python', 'gis']
+NEWS_SOURCES = ['ANU Fenner School', '澳大利亚气候委员会', '世界气象组织', 'Nature Ecology & Evolution']
+NEWS_CATEGORIES = ['climate', 'academic', 'policy']
+URGENCIES = ['high', 'medium', 'low']
+TOOL_CATEGORIES = ['GIS', '编程', 'programming', '配置']
+TOOL_DIFFICULTIES = ['初级', '中级', '中高级', '高级']
+OPPORTUNITY_TYPES = ['志愿者', '兼职研究', '全职就业', '配置提示']
+ENTRY_POINTS = ['run_pipeline', 'scrape_env_news', 'scrape_ai_tools', 'scrape_opportunities',
+                'data_processor', 'history_store', 'daemon', 'api_server', 'snapshot_store']
+# 默认排序规则编译出的工具排序键，作为各选择基准的排序依据
+tool_sort_key = load_ranking().key('ai_tools')
+LOCATIONS = ['堪培拉ACT - ANU Acton校区', '堪培拉ACT及NSW边界地区', 'Namadgi National Park', '悉尼NSW']
+
+
+def random_text(rng, cjk_chars, en_words=0):
+    words = ' '.join(rng.choice(EN_WORDS) for _ in range(en_words))
+    return words + ''.join(rng.choice(CJK_CHARS) for _ in range(cjk_chars))
+
+
+def random_date(rng):
+    day = datetime.date(2026, 1, 1) + datetime.timedelta(days=rng.randrange(365))
+    return day.strftime('%Y-%m-%d')
+
+
+def iter_news(n, seed=0):
+    """逐条生成与 environmental_news.json 结构一致的合成新闻"""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            'title': random_text(rng, 16, 2),
+            'description': random_text(rng, 80, 5),
+            'source': rng.choice(NEWS_SOURCES),
+            'date': random_date(rng),
+            'category': rng.choice(NEWS_CATEGORIES),
+            'link': f"https://example.org/news/{i}",
+            'urgency': rng.choice(URGENCIES)
+        }
+
+
+def generate_news(n, seed=0):
+    """生成与 environmental_news.json 结构一致的合成新闻"""
+    return list(iter_news(n, seed))
+
+
+def generate_tools(n, seed=0):
+    """生成与 ai_tools.json 结构一致的合成工具推荐"""
+    rng = random.Random(seed)
+    return [
+        {
+            'name': f"tool-{rng.randrange(n)}",
+            'summary': random_text(rng, 30, 3),
+            'usefulness': random_text(rng, 100),
+            'technical': random_text(rng, 80, 4),
+            'category': rng.choice(TOOL_CATEGORIES),
+            'difficulty': rng.choice(TOOL_DIFFICULTIES),
+            'link': f"https://github.com/example/tool-{i}",
+            'stars': rng.randrange(100, 50000)
+        }
+        for i in range(n)
+    ]
+
+
+def generate_opportunities(n, seed=0):
+    """生成与 opportunities.json 结构一致的合成实践机会"""
+    rng = random.Random(seed)
+    return [
+        {
+            'title': random_text(rng, 14, 1),
+            'description': random_text(rng, 90),
+            'organization': random_text(rng, 6, 1),
+            'location': rng.choice(LOCATIONS),
+            'type': rng.choice(OPPORTUNITY_TYPES),
+            'commitment': '每周6-10小时',
+            'skills': random_text(rng, 20),
+            'benefits': random_text(rng, 30),
+            'contact': f"contact{i}@example.org",
+            'link': f"https://example.org/opportunities/{i}",
+            'deadline': '持续开放申请',
+            'requirements': random_text(rng, 30)
+        }
+        for i in range(n)
+    ]
+
+
+def write_synthetic_inputs(data_dir, n, seed=0):
+    """在data_dir中写入三个规模为n的合成抓取结果文件"""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    last_updated = datetime.datetime.now().isoformat()
+    for filename, key, items in [
+        ('environmental_news.json', 'news', generate_news(n, seed)),
+        ('ai_tools.json', 'tools', generate_tools(n, seed)),
+        ('opportunities.json', 'opportunities', generate_opportunities(n, seed)),
+    ]:
+        with open(data_dir / filename, 'w', encoding='utf-8') as f:
+            json.dump({'last_updated': last_updated, key: items}, f, ensure_ascii=False, indent=2)
+
+
+def full_sort_select(items, sort_key, group_field, limit, free_picks=3):
+    """优化前的做法：完整排序后贪心遍历，作为对照组"""
+    ordered = sorted(items, key=sort_key)
+    selected = []
+    seen = set()
+    for item in ordered:
+        if len(selected) >= limit:
+            break
+        group = item.get(group_field, 'other')
+        if len(selected) < free_picks or group not in seen:
+            selected.append(item)
+            seen.add(group)
+    return selected
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_selection(sizes):
+    """对比完整排序与有界堆Top-K选择的耗时"""
+    selector = DiversityTopK(
+        5, tool_sort_key, group_key=lambda item: item.get('category', 'other'),
+        free_picks=3, group_cap=1
+    )
+    print(f"{'items':>10} {'full sort':>12} {'top-k':>12} {'speedup':>9}")
+    for n in sizes:
+        items = generate_tools(n)
+        baseline, sort_seconds = timed(full_sort_select, items, tool_sort_key, 'category', 5)
+        selected, topk_seconds = timed(selector.select, items)
+        assert baseline == selected, "Top-K选择结果与完整排序不一致"
+        print(f"{n:>10} {sort_seconds:>11.3f}s {topk_seconds:>11.3f}s {sort_seconds / topk_seconds:>8.2f}x")
+
+
+def bench_serialize(sizes, repeat):
+    """比较标准库/orjson、缩进/紧凑格式的编码耗时和输出大小，以及紧凑格式的压缩后大小"""
+    backends = ['json'] + (['orjson'] if serializer.orjson is not None else [])
+    print(f"{'items':>10} {'backend':<8} {'format':<8} {'encode':>10} {'size KB':>10} {'speedup':>7} {'smaller':>7}")
+    for n in sizes:
+        data = {
+            'environmental_news': generate_news(n),
+            'ai_tools': generate_tools(n),
+            'opportunities': generate_opportunities(n),
+        }
+        baseline_seconds = baseline_size = None
+        compact = None
+        for backend in backends:
+            for pretty in (True, False):
+                encoded, seconds = None, float('inf')
+                for _ in range(repeat):
+                    result, elapsed = timed(serializer.dumps, data, pretty, backend)
+                    encoded, seconds = result, min(seconds, elapsed)
+                if baseline_seconds is None:
+                    # 基线为原先的写法：标准库 + indent=2
+                    baseline_seconds, baseline_size = seconds, len(encoded)
+                if not pretty:
+                    compact = encoded
+                print(f"{n:>10} {backend:<8} {'pretty' if pretty else 'compact':<8} {seconds * 1000:>8.1f}ms "
+                      f"{len(encoded) / 1024:>10.1f} {baseline_seconds / seconds:>6.1f}x "
+                      f"{1 - len(encoded) / baseline_size:>7.0%}")
+        for fmt in serializer.compression_formats():
+            packed, seconds = timed(serializer.compress, compact, fmt)
+            print(f"{n:>10} {fmt:<8} {'compact':<8} {seconds * 1000:>8.1f}ms "
+                  f"{len(packed) / 1024:>10.1f} {'':>7} {1 - len(packed) / baseline_size:>7.0%}")
+
+
+def bench_report(sizes, formats):
+    """报告条数逐级增大时各格式的渲染耗时；每条记录的耗时保持不变说明渲染成本与条数成线性关系"""
+    runs = [[fmt] for fmt in formats] + ([formats] if len(formats) > 1 else [])
+    print(f"{'items':>10} {'formats':<14} {'render':>10} {'per item':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            data = {
+                'last_updated': datetime.datetime.now().isoformat(),
+                'environmental_news': generate_news(n),
+                'ai_tools': generate_tools(n),
+                'opportunities': generate_opportunities(n),
+                'metadata': {'total_items': 3 * n},
+            }
+            for run in runs:
+                renderer = report_renderer.ReportRenderer(run, dict.fromkeys(report_renderer.DEFAULT_COUNTS))
+                _, seconds = timed(renderer.render, data, Path(tmp))
+                print(f"{n:>10} {'+'.join(run):<14} {seconds * 1000:>8.1f}ms {seconds / (3 * n) * 1e6:>8.2f}us")
+
+
+def synthetic_profiles(count, base_ranking):
+    """合成受众配置：地区轮换，一半配置只改条数（与前一个配置共用排序规则）"""
+    regions = ['ACT', '悉尼', 'Namadgi', 'NSW']
+    configs = []
+    for i in range(count):
+        config = {'name': f"p{i}", 'region': regions[(i // 2) % len(regions)]}
+        if i % 2:
+            config['limits'] = {'environmental_news': 4 + i % 5, 'opportunities': 4 + i % 7}
+        configs.append(config)
+    return [profiles.Profile.from_config(config, base_ranking) for config in configs]
+
+
+def run_profile_separately(data_dir, profile):
+    """优化前的做法：每个配置完整运行一遍处理器"""
+    processor = DashboardDataProcessor(incremental=False, ranking=profile.ranking)
+    processor.data_dir = Path(data_dir) / profile.name
+    processor.data_dir.mkdir(exist_ok=True)
+    for filename in ('environmental_news.json', 'ai_tools.json', 'opportunities.json'):
+        (processor.data_dir / filename).write_bytes((Path(data_dir) / filename).read_bytes())
+    processor.selectors = {
+        section: profiles.build_selector(section, profile.ranking.key(section), limit,
+                                         profile.ranking.descending(section),
+                                         profiles.RECORD_TYPES[section].group_of)
+        for section, limit in profile.limits.items()
+    }
+    processor.process_all_data()
+
+
+def bench_profiles(size, counts):
+    """多受众配置：逐个配置重跑处理器 vs 共用加载和打分的一次处理（串行/进程池）"""
+    print(f"{'profiles':>8} {'separate':>10} {'shared':>10} {'pooled':>10} {'speedup':>8}")
+    base_ranking = load_ranking()
+    for count in counts:
+        profile_list = synthetic_profiles(count, base_ranking)
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_synthetic_inputs(data_dir, size)
+            seconds = {}
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                for profile in profile_list:
+                    run_profile_separately(data_dir, profile)
+                seconds['separate'] = time.perf_counter() - start
+
+                for mode, use_pool in (('shared', False), ('pooled', True)):
+                    processor = DashboardDataProcessor(incremental=False, profiles=profile_list)
+                    processor.data_dir = Path(data_dir)
+                    processor.use_pool = use_pool
+                    _, seconds[mode] = timed(processor.process_profiles)
+        best = min(seconds['shared'], seconds['pooled'])
+        print(f"{count:>8} {seconds['separate']:>9.2f}s {seconds['shared']:>9.2f}s {seconds['pooled']:>9.2f}s "
+              f"{seconds['separate'] / best:>7.1f}x")
+
+
+def api_client(port, requests, revalidate, latencies, errors):
+    """单个客户端：保持连接，轮流请求各接口；revalidate时带上次的ETag，大多返回304"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    paths = list(api_server.ENDPOINTS)
+    etags = {}
+    try:
+        for i in range(requests):
+            path = paths[i % len(paths)]
+            headers = {'Accept-Encoding': 'gzip'}
+            if revalidate and path in etags:
+                headers['If-None-Match'] = etags[path]
+            start = time.perf_counter()
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            if response.status not in (200, 304):
+                errors.append(response.status)
+            etags[path] = response.getheader('ETag')
+    finally:
+        connection.close()
+
+
+def bench_api(client_counts, requests, data_file):
+    """并发客户端压测HTTP接口，分别测量完整响应和带ETag重新验证（304）的吞吐量与延迟"""
+    server = api_server.serve_in_background(port=0, data_file=data_file)
+    port = server.server_address[1]
+    print(f"{'clients':>8} {'mode':<11} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    try:
+        for clients in client_counts:
+            for revalidate in (False, True):
+                latencies, errors = [], []
+                threads = [
+                    threading.Thread(target=api_client, args=(port, requests, revalidate, latencies, errors))
+                    for _ in range(clients)
+                ]
+                start = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+
+                latencies.sort()
+                p50 = latencies[len(latencies) // 2] * 1000
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+                mode = 'etag/304' if revalidate else 'full'
+                print(f"{clients:>8} {mode:<11} {len(latencies):>9} {len(latencies) / elapsed:>9.0f} "
+                      f"{p50:>8.2f} {p99:>8.2f} {len(errors):>7}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def pipeline_stages(processor):
+    """按执行顺序列出处理流程的各个阶段"""
+    return [
+        ('process_environmental_news', processor.process_environmental_news),
+        ('process_ai_tools', processor.process_ai_tools),
+        ('process_opportunities', processor.process_opportunities),
+        ('add_metadata', processor.add_metadata),
+        ('json_serialization', lambda: serializer.dumps(processor.final_data)),
+        ('generate_summary_report', processor.generate_summary_report),
+    ]
+
+
+def run_pipeline_stages(data_dir, measure_memory):
+    """执行一遍处理流程，返回各阶段的耗时或峰值内存"""
+    processor = DashboardDataProcessor(incremental=False)
+    processor.data_dir = Path(data_dir)
+    results = {}
+    for name, stage in pipeline_stages(processor):
+        if measure_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            stage()
+            results[name] = tracemalloc.get_traced_memory()[1] - base
+        else:
+            start = time.perf_counter()
+            stage()
+            results[name] = time.perf_counter() - start
+    return results
+
+
+def bench_pipeline(sizes, output, baseline=None):
+    """在不同输入规模下测量各处理阶段的耗时和峰值内存，结果写入JSON文件"""
+    report = {
+        'created_at': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {}
+    }
+
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_synthetic_inputs(data_dir, n)
+
+            # 计时与内存分开测量，避免tracemalloc的开销影响耗时数据
+            seconds = run_pipeline_stages(data_dir, measure_memory=False)
+            tracemalloc.start()
+            try:
+                peak_bytes = run_pipeline_stages(data_dir, measure_memory=True)
+            finally:
+                tracemalloc.stop()
+
+        report['results'][str(n)] = {
+            name: {'seconds': round(seconds[name], 6), 'peak_bytes': peak_bytes[name]}
+            for name in seconds
+        }
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    previous = {}
+    if baseline:
+        with open(baseline, 'r', encoding='utf-8') as f:
+            previous = json.load(f)['results']
+
+    print(f"{'items':>8} {'stage':<28} {'seconds':>10} {'peak MB':>9} {'vs baseline':>12}")
+    for size, stages in report['results'].items():
+        for name, stat in stages.items():
+            ratio = ''
+            old = previous.get(size, {}).get(name)
+            if old and old['seconds']:
+                ratio = f"{stat['seconds'] / old['seconds']:.2f}x"
+            print(f"{size:>8} {name:<28} {stat['seconds']:>10.4f} {stat['peak_bytes'] / 1e6:>9.2f} {ratio:>12}")
+    print(f"📁 基准结果已保存到 {output}")
+
+
+def full_soup_extract(content, base_url, limit=3):
+    """优化前的做法：用html.parser构建整页的BeautifulSoup树，作为对照组"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    results = []
+    for item in soup.find_all(html_extract.NEWS_TAGS, class_=html_extract.NEWS_CLASSES)[:limit]:
+        title_elem = item.find(html_extract.TITLE_TAGS)
+        if not title_elem:
+            continue
+        desc_elem = item.find(html_extract.DESC_TAGS, class_=html_extract.DESC_CLASSES)
+        if not desc_elem:
+            desc_elem = item.find('p')
+        link_elem = item.find('a')
+        href = link_elem.get('href') if link_elem else None
+        results.append({
+            'title': title_elem.get_text(strip=True),
+            'description': desc_elem.get_text(strip=True) if desc_elem else None,
+            'link': urljoin(base_url, href) if href else base_url
+        })
+    return results
+
+
+FENNER_NEWS_URL = 'https://fennerschool.anu.edu.au/news-events/news'
+
+
+def html_parsers():
+    """HTML解析方式 {名称: parse(content, base_url)}，lxml未安装时不含lxml"""
+    parsers = {
+        'full soup': full_soup_extract,
+        'soup+strainer': lambda content, url: html_extract.extract_news_items(content, url, backend='soup'),
+    }
+    if html_extract.lxml_available():
+        parsers['lxml'] = lambda content, url: html_extract.extract_news_items(content, url, backend='lxml')
+    return parsers
+
+
+def _proc_status_kb(field):
+    with open('/proc/self/status', encoding='ascii') as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def parse_peak_rss(page, name):
+    """在当前进程中解析一次页面，返回常驻内存峰值相对解析前的增量（字节）
+
+    向 /proc/self/clear_refs 写入5会把峰值（VmHWM）重置为当前常驻内存，
+    之前的导入、解析器初始化和读取页面不计入；只在Linux上可用
+    """
+    content = Path(page).read_bytes()
+    parse = html_parsers()[name]
+    # 先解析一个空页面，完成解析器的延迟导入和初始化
+    parse(b'<html><body></body></html>', FENNER_NEWS_URL)
+    with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+        f.write('5')
+    before = _proc_status_kb('VmRSS')
+    parse(content, FENNER_NEWS_URL)
+    return (_proc_status_kb('VmHWM') - before) * 1024
+
+
+def html_peak_rss(page, name):
+    """在新进程中测量一次解析的常驻内存峰值增量（字节），不支持的平台返回None
+
+    tracemalloc只统计Python对象，看不到libxml2等C库的分配；常驻内存统计整个进程
+    """
+    if not Path('/proc/self/clear_refs').exists():
+        return None
+    code = f"import benchmark; print(benchmark.parse_peak_rss({str(page)!r}, {name!r}))"
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                          cwd=Path(__file__).parent)
+    return int(proc.stdout.split()[-1])
+
+
+def bench_html(pages, repeat):
+    """对比整页BeautifulSoup、SoupStrainer和lxml三种解析方式的耗时与内存
+
+    py MB 为tracemalloc统计的Python堆峰值，不包含lxml在libxml2中的分配；
+    rss MB 为新进程中解析一次时常驻内存峰值的增量，包含C库的分配（仅Linux，其他平台显示n/a）
+    """
+    base_url = FENNER_NEWS_URL
+    parsers = list(html_parsers().items())
+
+    print(f"{'page':<28} {'parser':<14} {'ms/page':>9} {'py MB':>9} {'rss MB':>9} {'speedup':>9}")
+    for page in pages:
+        content = Path(page).read_bytes()
+        expected = full_soup_extract(content, base_url)
+        baseline_seconds = None
+        for name, parse in parsers:
+            assert parse(content, base_url) == expected, f"{name} 的解析结果与整页BeautifulSoup不一致"
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse(content, base_url)
+            seconds = (time.perf_counter() - start) / repeat
+
+            tracemalloc.start()
+            try:
+                parse(content, base_url)
+                peak_bytes = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            rss_bytes = html_peak_rss(Path(page).resolve(), name)
+            rss = f"{rss_bytes / 1e6:>9.2f}" if rss_bytes is not None else f"{'n/a':>9}"
+
+            if baseline_seconds is None:
+                baseline_seconds = seconds
+            print(f"{Path(page).name:<28} {name:<14} {seconds * 1000:>9.2f} {peak_bytes / 1e6:>9.2f} "
+                  f"{rss} {baseline_seconds / seconds:>8.2f}x")
+
+
+def bench_dedup(pages, sizes):
+    """检查模板化标题的系列报道不被误合并、跨来源转载被合并，并测量流式去重的耗时与峰值内存"""
+    base_url = 'https://fennerschool.anu.edu.au/news-events/news'
+    processor = DashboardDataProcessor()
+    failures = []
+    for page in pages:
+        stories = html_extract.extract_news_items(Path(page).read_bytes(), base_url, limit=None)
+        for story in stories:
+            story['source'] = 'ANU Fenner School'
+        # 同一报道被另一个来源转载，标题略有改动
+        reposts = [dict(story, source='澳大利亚气候委员会', link=f"{story['link']}#repost",
+                        title=f"{story['title']} |") for story in stories]
+        kept = list(processor.deduplicate('environmental_news', stories + reposts))
+        distinct = len({story['link'] for story in stories})
+        print(f"{Path(page).name}: {len(stories)} 条报道（{distinct} 个不同链接）+ {len(reposts)} 条转载 → 保留 {len(kept)} 条")
+        if len(kept) != distinct:
+            failures.append(page)
+
+    print(f"{'items':>10} {'seconds':>9} {'peak MB':>9} {'kept':>10}")
+    for n in sizes:
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            kept = sum(1 for _ in processor.deduplicate('environmental_news', iter_news(n)))
+            seconds = time.perf_counter() - start
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        print(f"{n:>10} {seconds:>9.2f} {peak_bytes / 1e6:>9.2f} {kept:>10}")
+
+    if failures:
+        print(f"❌ 去重结果与不同报道数不一致: {', '.join(failures)}")
+        sys.exit(1)
+    print("✅ 不同报道全部保留，跨来源转载全部合并")
+
+
+def import_profile(module):
+    """用 python -X importtime 导入模块，返回 (模块自身的累计导入耗时, 耗时最多的直接依赖)，单位为微秒"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          capture_output=True, text=True, check=True)
+    total = 0
+    children = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # 缩进表示导入层级：两个空格为上一级模块的直接依赖
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            # 子模块先于父模块输出，遇到其他顶层模块（如site）时丢弃它的依赖
+            if name.strip() == module:
+                total = int(cumulative)
+                break
+            children = []
+        elif depth == 1:
+            children.append((int(cumulative), name.strip()))
+    return total, sorted(children, reverse=True)
+
+
+def wall_time(code, repeat):
+    """启动解释器执行code的墙钟时间中位数（秒）"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_startup(modules, repeat, budget_ms=None, output=None):
+    """记录各入口模块的导入耗时和启动延迟，超出预算时以非零状态退出"""
+    bare = wall_time('pass', repeat)
+    results = {}
+    print(f"解释器空启动: {bare * 1000:.1f} ms")
+    print(f"{'module':<24} {'import ms':>10} {'startup ms':>11}  heaviest imports")
+    for module in modules:
+        import_us, children = import_profile(module)
+        startup = wall_time(f'import {module}', repeat) - bare
+        heaviest = ', '.join(f"{name} {us / 1000:.0f}ms" for us, name in children[:3])
+        results[module] = {
+            'import_ms': round(import_us / 1000, 2),
+            'startup_ms': round(startup * 1000, 2),
+            'heaviest': [[name, round(us / 1000, 2)] for us, name in children[:5]]
+        }
+        print(f"{module:<24} {import_us / 1000:>10.1f} {startup * 1000:>11.1f}  {heaviest}")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created_at': datetime.datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'bare_startup_ms': round(bare * 1000, 2),
+                'results': results
+            }, f, ensure_ascii=False, indent=2)
+        print(f"📁 启动耗时已保存到 {output}")
+
+    if budget_ms is not None:
+        over = [m for m, r in results.items() if r['import_ms'] > budget_ms]
+        if over:
+            print(f"❌ 导入耗时超出 {budget_ms}ms 预算: {', '.join(over)}")
+            sys.exit(1)
+        print(f"✅ 所有入口模块的导入耗时都在 {budget_ms}ms 预算内")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="仪表盘数据处理性能基准")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    selection_parser = subparsers.add_parser('selection', help='Top-K选择 vs 完整排序')
+    selection_parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+
+    pipeline_parser = subparsers.add_parser('pipeline', help='各处理阶段的耗时与峰值内存')
+    pipeline_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    pipeline_parser.add_argument('--output', default='bench_results.json')
+    pipeline_parser.add_argument('--baseline', help='与之前保存的基准结果对比')
+
+    html_parser = subparsers.add_parser('html', help='Fenner新闻页面的HTML解析耗时、Python堆峰值与常驻内存峰值')
+    html_parser.add_argument('--pages', nargs='+', default=['fixtures/fenner_news.html'])
+    html_parser.add_argument('--repeat', type=int, default=20)
+
+    dedup_parser = subparsers.add_parser('dedup', help='近似重复检测的正确性检查与流式去重的峰值内存')
+    dedup_parser.add_argument('--pages', nargs='+', default=['fixtures/fenner_news.html'])
+    dedup_parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 20000, 80000])
+
+    serialize_parser = subparsers.add_parser('serialize', help='JSON编码后端与输出格式的耗时和大小')
+    serialize_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000])
+    serialize_parser.add_argument('--repeat', type=int, default=3)
+
+    report_parser = subparsers.add_parser('report', help='摘要报告渲染耗时随条数的变化')
+    report_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    report_parser.add_argument('--formats', nargs='+', default=list(report_renderer.FORMATS))
+
+    profiles_parser = subparsers.add_parser('profiles', help='多受众配置：逐个重跑 vs 共用加载和打分')
+    profiles_parser.add_argument('--size', type=int, default=20000)
+    profiles_parser.add_argument('--profiles', type=int, nargs='+', default=[2, 8, 16])
+
+    api_parser = subparsers.add_parser('api', help='HTTP接口在并发客户端下的吞吐量与延迟')
+    api_parser.add_argument('--clients', type=int, nargs='+', default=[1, 8, 32])
+    api_parser.add_argument('--requests', type=int, default=500, help='每个客户端的请求数')
+    api_parser.add_argument('--data', default='data/dashboard_data.json')
+
+    startup_parser = subparsers.add_parser('startup', help='各入口模块的导入耗时（python -X importtime）')
+    startup_parser.add_argument('--modules', nargs='+', default=ENTRY_POINTS)
+    startup_parser.add_argument('--repeat', type=int, default=5)
+    startup_parser.add_argument('--budget-ms', type=float, help='任一入口模块导入耗时超过该值时返回非零状态')
+    startup_parser.add_argument('--output', help='将结果写入JSON文件')
+
+    args = parser.parse_args()
+    if args.command == 'selection':
+        bench_selection(args.sizes)
+    elif args.command == 'pipeline':
+        bench_pipeline(args.sizes, args.output, args.baseline)
+    elif args.command == 'html':
+        bench_html(args.pages, args.repeat)
+    elif args.command == 'dedup':
+        bench_dedup(args.pages, args.sizes)
+    elif args.command == 'serialize':
+        bench_serialize(args.sizes, args.repeat)
+    elif args.command == 'report':
+        bench_report(args.sizes, args.formats)
+    elif args.command == 'profiles':
+        bench_profiles(args.size, args.profiles)
+    elif args.command == 'api':
+        bench_api(args.clients, args.requests, args.data)
+    elif args.command == 'startup':
+        bench_startup(args.modules, args.repeat, args.budget_ms, args.output)
+
+
+if __name__ == "__main__":
+    main()
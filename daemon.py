@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+仪表盘常驻服务
+进程常驻运行，抓取器的HTTP会话、响应缓存和排序规则只初始化一次；每个数据来源按自己的
+刷新间隔（Source.interval）调度，来源的结果有变化时才重建对应分区，并增量重新生成
+dashboard_data.json，未变化的分区直接沿用上次的处理结果。
+用法:
+  python daemon.py [--once] [--no-save-raw] [--metrics] [--interval 来源名称=秒 ...] [--serve 端口]
+"""
+
+import argparse
+import datetime
+import hashlib
+import heapq
+import signal
+import threading
+import time
+
+from data_processor import DashboardDataProcessor
+from metrics import metrics
+from ranking import load_ranking
+from resilience import resilience
+from run_pipeline import PipelineRunner
+from serializer import dumps
+from sources import SourceRegistry, SourceScheduler
+
+# 来源失败时的重试间隔（秒），不超过来源自身的刷新间隔
+RETRY_INTERVAL = 15 * 60
+
+
+def format_duration(seconds):
+    if seconds >= 3600:
+        return f"{seconds / 3600:g} 小时"
+    if seconds >= 60:
+        return f"{seconds / 60:.0f} 分钟"
+    return f"{seconds:.0f} 秒"
+
+
+class DashboardDaemon(PipelineRunner):
+    def __init__(self, save_raw=True, max_workers=8, intervals=None):
+        super().__init__(save_raw=save_raw, max_workers=max_workers)
+        self.ranking = load_ranking()
+        self.stop_event = threading.Event()
+
+        self.scrapers = []
+        self.registry = SourceRegistry()
+        for name, scraper_cls, filename in self.SCRAPERS:
+            scraper = scraper_cls()
+            scraper.register_sources(self.registry)
+            self.scrapers.append((name, scraper, filename))
+        self.scheduler = SourceScheduler(self.registry, max_workers=max_workers)
+
+        # 命令行指定的间隔覆盖来源声明的默认值
+        for source in self.registry.sources():
+            if intervals and source.name in intervals:
+                source.interval = intervals[source.name]
+
+        # 各来源最近一次成功的结果及其内容哈希
+        self.results = {}
+        self.digests = {}
+        # 各数据文件最近一次的载荷，未变化的分区原样交给处理器，使其命中增量缓存
+        self.payloads = {}
+        # (到期时间, 注册序号, 来源名称)，启动时所有来源立即到期
+        self.queue = [(0.0, index, source.name) for index, source in enumerate(self.registry.sources())]
+        heapq.heapify(self.queue)
+
+    def log(self, message):
+        print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] {message}")
+
+    def due_sources(self, now):
+        """取出所有已到期的来源"""
+        by_name = {source.name: source for source in self.registry.sources()}
+        due = []
+        while self.queue and self.queue[0][0] <= now:
+            _, index, name = heapq.heappop(self.queue)
+            due.append((index, by_name[name]))
+        return due
+
+    def refresh(self, due):
+        """运行到期的来源，返回结果有变化的分区集合"""
+        # 每轮重设请求截止时间；熔断状态跨轮次保留，挂起的主机在冷却期内不再占用时间
+        resilience.start_run()
+        results = self.scheduler.run_sources([source for _, source in due])
+        changed = set()
+        now = time.monotonic()
+        for index, source in due:
+            if source.name in self.scheduler.failures and source.name in self.results:
+                # 失败时保留上次的真实结果，不用备用内容覆盖，并提前重试
+                self.log(f"⚠️  {source.name} 本次失败，保留上次结果")
+                heapq.heappush(self.queue, (now + min(RETRY_INTERVAL, source.interval), index, source.name))
+                continue
+
+            items = results[source.name]
+            digest = hashlib.sha256(dumps(items)).hexdigest()
+            if digest != self.digests.get(source.name):
+                self.results[source.name] = items
+                self.digests[source.name] = digest
+                changed.add(source.section)
+                self.log(f"🔄 {source.name}: {len(items)} 条记录，内容有变化")
+            else:
+                self.log(f"✔️  {source.name}: 内容未变化")
+            heapq.heappush(self.queue, (now + source.interval, index, source.name))
+        return changed
+
+    def rebuild(self, changed):
+        """重建变化的分区并增量生成仪表盘数据"""
+        for name, scraper, filename in self.scrapers:
+            if scraper.SECTION not in changed:
+                continue
+            items = [item for source in self.registry.sources(scraper.SECTION)
+                     for item in self.results.get(source.name, [])]
+            payload = self.finish_scraper(name, scraper, filename, items)
+            if payload is not None:
+                self.payloads[filename] = payload
+
+        start = time.perf_counter()
+        processor = DashboardDataProcessor(raw_data=dict(self.payloads), ranking=self.ranking)
+        processor.process_all_data()
+        processor.generate_summary_report()
+        self.log(f"📊 仪表盘数据已更新（{', '.join(sorted(changed))}），耗时 {time.perf_counter() - start:.2f}s")
+
+    def run_once(self):
+        """处理一轮到期的来源，返回是否重新生成了仪表盘数据"""
+        due = self.due_sources(time.monotonic())
+        if not due:
+            return False
+        changed = self.refresh(due)
+        if not changed:
+            return False
+        self.rebuild(changed)
+        return True
+
+    def next_wakeup(self):
+        """距离下一个来源到期的秒数"""
+        return max(0.0, self.queue[0][0] - time.monotonic()) if self.queue else None
+
+    def serve(self):
+        """持续运行直到收到SIGINT/SIGTERM"""
+        self.log(f"🚀 常驻服务已启动，共 {len(self.registry)} 个数据来源")
+        for source in self.registry.sources():
+            print(f"   {source.name:<32} 每 {format_duration(source.interval)}")
+        while not self.stop_event.is_set():
+            self.run_once()
+            # 每轮结束时导出并清空本轮的指标
+            metrics.flush()
+            wait = self.next_wakeup()
+            if wait:
+                self.log(f"💤 {format_duration(wait)}后运行下一个来源")
+            self.stop_event.wait(wait)
+        self.log("👋 常驻服务已停止")
+
+    def stop(self, *_):
+        self.stop_event.set()
+
+
+def interval_arg(value):
+    """解析 --interval 的 来源名称=秒，格式不对时由argparse报错"""
+    name, separator, seconds = value.partition('=')
+    try:
+        seconds = float(seconds)
+    except ValueError:
+        seconds = None
+    if not (separator and name and seconds is not None and seconds > 0):
+        raise argparse.ArgumentTypeError(f"应为 来源名称=秒（秒数为正数），收到 {value!r}")
+    return name, seconds
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="仪表盘常驻服务")
+    parser.add_argument('--once', action='store_true', help='运行所有来源一次后退出（与单次流水线的结果一致）')
+    parser.add_argument('--no-save-raw', action='store_true', help='不写入中间JSON文件')
+    parser.add_argument('--metrics', action='store_true',
+                        help='每轮结束时将本轮的运行指标追加到 data/run_metrics.jsonl')
+    parser.add_argument('--interval', type=interval_arg, action='append', default=[], metavar='来源名称=秒',
+                        help='覆盖来源的刷新间隔，可重复指定')
+    parser.add_argument('--serve', type=int, metavar='端口',
+                        help='同时在后台提供HTTP接口（api_server.py），数据更新后自动热加载')
+    args = parser.parse_args(argv)
+    args.intervals = dict(args.interval)
+    return parser, args
+
+
+def main(argv=None):
+    parser, args = parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+    daemon = DashboardDaemon(save_raw=not args.no_save_raw, intervals=args.intervals)
+    unknown = sorted(set(args.intervals) - {source.name for source in daemon.registry.sources()})
+    if unknown:
+        parser.error(f"未知的来源: {', '.join(unknown)}")
+    if args.serve is not None:
+        from api_server import serve_in_background
+
+        serve_in_background(port=args.serve)
+        print(f"🌐 仪表盘接口已启动: http://127.0.0.1:{args.serve}")
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    try:
+        if args.once:
+            daemon.run_once()
+        else:
+            daemon.serve()
+    finally:
+        metrics.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,89 @@
 
 import json
 import datetime
+import hashlib
 import os
+import sys
 from pathlib import Path
 
+from atomic_io import CorruptDataError, atomic_write, load_json, sha256_file, verify_file, write_if_changed
+from dedup import DEFAULT_MAX_ENTRIES, NearDuplicateFilter
+from metrics import metrics
+from ranking import load_ranking
+from profiles import (DEFAULT_LIMITS, RECORD_TYPES, build_selector, load_profiles,
+                      select_profiles)
+from report_renderer import ReportRenderer
+from serializer import dumps, format_report, publish_json
+from stream_loader import has_section, iter_section_items
+
+# 处理逻辑变化时递增，使旧的分区缓存全部失效
+MANIFEST_VERSION = 4
+
+# 每次运行都会变化、但不代表数据变化的字段
+VOLATILE_FIELDS = ('last_updated', 'current_date')
+VOLATILE_METADATA_FIELDS = ('last_processing_time', 'next_update')
+# 每条记录中随抓取日期变化的字段
+VOLATILE_ITEM_FIELDS = ('date',)
+
+# 各分区的输入文件和其中的数据列表字段
+SECTION_SOURCES = {
+    'environmental_news': ("environmental_news.json", 'news'),
+    'ai_tools': ("ai_tools.json", 'tools'),
+    'opportunities': ("opportunities.json", 'opportunities')
+}
+
 class DashboardDataProcessor:
-    def __init__(self):
+    def __init__(self, raw_data=None, incremental=True, streaming=False, ranking=None,
+                 pretty_copy=False, precompress=False, report_formats=('md',), report_counts=None,
+                 profiles=None, max_workers=None):
         self.data_dir = Path("data")
+        # 排序规则来自配置文件（默认 ranking.json），编译为各分区的排序键
+        self.ranking = ranking or load_ranking()
+        # 编排器直接传入的内存数据 {文件名: 载荷}，可跳过JSON文件往返
+        self.raw_data = raw_data or {}
+        # 流式模式：逐条读取输入（优先使用同名.jsonl文件），内存占用与输入大小无关
+        self.streaming = streaming
+
+        # 发布的 dashboard_data.json 为紧凑格式，可另存缩进副本和预压缩的.gz/.br文件
+        self.pretty_copy = pretty_copy
+        self.precompress = precompress
+
+        # 摘要报告：模板预先编译，一次遍历同时输出各格式；report_counts 覆盖各分区的条数
+        self.report_renderer = ReportRenderer(report_formats, report_counts)
+
+        # 增量处理：按输入内容哈希复用上次的分区结果
+        self.incremental = incremental
+        self.cache_dir = Path(".cache/processor")
+        self.manifest = self.load_manifest() if incremental else {}
+        self.section_hashes = {}
+        self.reused_sections = set()
+
+        # 各分区近似重复检测比较的文本字段和区分不同记录的规则：新闻和机会同一来源（机构）链接不同的
+        # 记录是不同的报道/岗位，工具链接（仓库地址）不同即为不同的工具
+        self.dedup_rules = {
+            'environmental_news': {'text_fields': ['title', 'description'], 'source_field': 'source'},
+            'ai_tools': {'text_fields': ['name', 'summary'], 'distinct_links': True},
+            'opportunities': {'text_fields': ['title', 'description'], 'source_field': 'organization'}
+        }
+
+        # 各分区的记录类型，只为入选的项构造，用于按规范字段顺序输出
+        self.record_types = dict(RECORD_TYPES)
+
+        # 各分区的选取规则：新闻取最优6条；工具最多5个、机会最多6个，
+        # 前3项自由入选，之后每个类别/类型只再选一项。排序键和类别直接作用于输入字典
+        self.selectors = {
+            section: build_selector(section, self.ranking.key(section), limit,
+                                    self.ranking.descending(section), RECORD_TYPES[section].group_of)
+            for section, limit in DEFAULT_LIMITS.items()
+        }
+
+        # 多受众配置：每个配置另外输出 dashboard_data.<配置名>.json，输入只加载和去重一次
+        self.profiles = profiles or []
+        self.max_workers = max_workers
+        # None时按工作量自动决定是否使用进程池
+        self.use_pool = None
+        # 本次运行中各分区去重后的输入（仅在配置了受众配置时保留）
+        self.deduplicated = {}
         self.final_data = {
             'last_updated': datetime.datetime.now().isoformat(),
             'current_date': datetime.datetime.now().strftime('%Y年%m月%d日'),
@@ -21,12 +98,19 @@ class DashboardDataProcessor:
         }
 
     def load_json_file(self, filename):
-        """安全加载JSON文件"""
+        """加载并校验JSON文件；文件损坏（校验和不符或被截断）时抛出CorruptDataError，
+        不再悄悄改用备用内容
+        """
+        if filename in self.raw_data:
+            return self.raw_data[filename]
+
         filepath = self.data_dir / filename
         if filepath.exists():
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return load_json(filepath)
+            except CorruptDataError as e:
+                print(f"❌ 数据文件已损坏: {e}")
+                raise
             except Exception as e:
                 print(f"⚠️  加载 {filename} 时出错: {e}")
                 return None
@@ -34,37 +118,181 @@ class DashboardDataProcessor:
             print(f"📂 文件 {filename} 不存在")
             return None
 
+    def load_manifest(self):
+        """读取增量处理清单，版本或排序规则不符时视为空清单"""
+        manifest_file = self.cache_dir / "manifest.json"
+        try:
+            manifest = load_json(manifest_file)
+            if manifest.get('version') == MANIFEST_VERSION and manifest.get('ranking') == self.ranking.digest:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def save_manifest(self):
+        """保存各输入文件/分区的内容哈希和本次的时间戳字段"""
+        sections = dict(self.manifest.get('sections', {}))
+        sections.update(self.section_hashes)
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'ranking': self.ranking.digest,
+            'sections': sections,
+            'volatile': {
+                'final_data': {k: self.final_data[k] for k in VOLATILE_FIELDS},
+                'metadata': {k: self.final_data['metadata'][k] for k in VOLATILE_METADATA_FIELDS}
+            }
+        }
+        atomic_write(self.cache_dir / "manifest.json",
+                     json.dumps(manifest, ensure_ascii=False, indent=2), checksum=True)
+
+    @staticmethod
+    def hash_bytes(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def hash_payload(self, payload):
+        """计算数据载荷的内容哈希，忽略载荷自身的 last_updated 时间戳
+
+        记录列表按每条记录的编码排序后再计算，抓取器每次打乱顺序（工具、机会）但内容相同的输入
+        得到相同的哈希，可以复用上次的处理结果
+        """
+        content = {}
+        for k, v in payload.items():
+            if k == 'last_updated':
+                continue
+            if isinstance(v, list):
+                v = sorted(json.dumps(item, ensure_ascii=False, sort_keys=True) for item in v)
+            content[k] = v
+        encoded = json.dumps(content, ensure_ascii=False, sort_keys=True)
+        return self.hash_bytes(encoded.encode('utf-8'))
+
+    def load_cached_section(self, section):
+        """读取分区的缓存处理结果"""
+        try:
+            return load_json(self.cache_dir / f"{section}.json")
+        except (OSError, ValueError):
+            # 缓存缺失或损坏时重新处理该分区
+            return None
+
+    def hash_file(self, filepath):
+        """分块计算文件哈希，不把整个文件读入内存"""
+        return sha256_file(filepath)
+
+    def section_source(self, filename):
+        """流式模式下优先使用同名的JSON Lines文件"""
+        if self.streaming:
+            jsonl_path = self.data_dir / filename.replace('.json', '.jsonl')
+            if jsonl_path.exists():
+                return jsonl_path
+        return self.data_dir / filename
+
+    def load_section(self, section, filename, key):
+        """加载分区的数据列表；输入未变化时同时返回上次缓存的处理结果
+
+        返回 (数据列表或迭代器, 缓存结果)，数据不可用时数据列表为None。
+        先比较文件字节哈希，命中时无需解析JSON；否则再比较去掉时间戳后的内容哈希
+        """
+        previous = self.manifest.get('sections', {}).get(section, {})
+        hashes = {}
+        source = self.section_source(filename)
+
+        if self.incremental and filename not in self.raw_data and source.exists():
+            hashes['file'] = self.hash_file(source)
+            if hashes['file'] == previous.get('file'):
+                cached = self.load_cached_section(section)
+                if cached is not None:
+                    self.section_hashes[section] = previous
+                    return None, cached
+
+        if self.streaming and filename not in self.raw_data:
+            if not source.exists():
+                print(f"📂 文件 {source.name} 不存在")
+                return None, None
+            # 逐块读取前先整体核对校验和（分块计算，内存占用不变），损坏的文件直接报错
+            verify_file(source, digest=hashes.get('file'))
+            if source.suffix == '.json' and not has_section(source, key):
+                return None, None
+            if self.incremental:
+                self.section_hashes[section] = hashes
+            return iter_section_items(source, key), None
+
+        data = self.load_json_file(filename)
+        items = data.get(key) if data and isinstance(data, dict) else None
+        if not self.incremental or items is None:
+            return items, None
+
+        hashes['content'] = self.hash_payload(data)
+        self.section_hashes[section] = hashes
+        if hashes['content'] == previous.get('content'):
+            return items, self.load_cached_section(section)
+        return items, None
+
+    def select(self, section, items):
+        """去重后选取：直接在输入字典上打分，只为入选的项构造记录以规范输出字段顺序
+
+        配置了受众配置时保留去重结果，供 process_profiles 直接使用；否则流式去重，不保留输入
+        """
+        items = self.deduplicate(section, items)
+        if self.profiles:
+            items = self.deduplicated[section] = list(items)
+        return self.rank_and_select(section, items)
+
+    def rank_and_select(self, section, items):
+        """对去重后的输入字典打分并选取"""
+        record_type = self.record_types[section]
+        selector = self.selectors[section]
+        return [record_type(**item).to_dict() for item in selector.select(items)]
+
+    def deduplicate(self, section, items):
+        """在选取之前流式去除近似重复项"""
+        # 内存中的列表完整索引；流式输入限制索引条数，内存占用与输入规模无关
+        max_entries = None if isinstance(items, list) else DEFAULT_MAX_ENTRIES
+        dedup_filter = NearDuplicateFilter(max_entries=max_entries, **self.dedup_rules[section])
+        yield from dedup_filter.filter(items)
+        if dedup_filter.merged:
+            print(f"🧹 {section}: 合并了 {dedup_filter.merged} 条近似重复记录")
+
+    def reuse_section(self, section, cached):
+        """直接使用缓存的分区结果"""
+        self.final_data[section] = cached
+        self.reused_sections.add(section)
+        print(f"♻️  {section} 输入未变化，沿用上次处理结果")
+
+    def cache_section(self, section):
+        """保存分区的处理结果，供下次运行复用"""
+        if not self.incremental or section not in self.section_hashes:
+            return
+        atomic_write(self.cache_dir / f"{section}.json", dumps(self.final_data[section]), checksum=True)
+
+    def write_if_changed(self, filepath, content):
+        """内容与现有文件字节完全一致时跳过写入，返回是否写入"""
+        return write_if_changed(filepath, content)
+
+    @metrics.timed('processor.process_environmental_news')
     def process_environmental_news(self):
         """处理环境科学新闻数据"""
-        news_data = self.load_json_file("environmental_news.json")
-        if news_data and 'news' in news_data:
-            news_items = news_data['news']
-
-            # 按紧急程度和时效性排序
-            def sort_key(item):
-                urgency_priority = {'high': 0, 'medium': 1, 'low': 2}
-                category_priority = {'climate': 0, 'academic': 1, 'policy': 2}
-                return (
-                    urgency_priority.get(item.get('urgency', 'medium'), 1),
-                    category_priority.get(item.get('category', 'academic'), 1),
-                    item.get('date', ''),
-                    item.get('title', '')
-                )
-
-            news_items.sort(key=sort_key, reverse=True)
-
-            # 限制数量并确保内容质量
-            processed_news = []
-            for item in news_items[:6]:  # 最多6条新闻
-                if item.get('title') and len(item['title']) > 10:
-                    processed_news.append(item)
+        news_items, cached = self.load_section('environmental_news', "environmental_news.json", 'news')
+        if cached is not None:
+            self.reuse_section('environmental_news', cached)
+            return
+
+        if news_items is not None:
+            # 按紧急程度和时效性选取最优的新闻
+            top_news = self.select('environmental_news', news_items)
+
+            processed_news = self.filter_news(top_news)
 
             self.final_data['environmental_news'] = processed_news
+            self.cache_section('environmental_news')
             print(f"📰 处理了 {len(processed_news)} 条环境科学新闻")
         else:
             print("⚠️  未找到环境新闻数据，使用备用内容")
             self.add_fallback_news()
 
+    @staticmethod
+    def filter_news(items):
+        """确保内容质量：去掉标题缺失或过短的新闻"""
+        return [item for item in items if item.get('title') and len(item['title']) > 10]
+
     def add_fallback_news(self):
         """添加备用新闻内容"""
         fallback_news = [
@@ -80,38 +308,20 @@ class DashboardDataProcessor:
         ]
         self.final_data['environmental_news'] = fallback_news
 
+    @metrics.timed('processor.process_ai_tools')
     def process_ai_tools(self):
         """处理AI工具推荐数据"""
-        tools_data = self.load_json_file("ai_tools.json")
-        if tools_data and 'tools' in tools_data:
-            tools_items = tools_data['tools']
-
-            # 按类别和实用性排序
-            def sort_key(item):
-                category_priority = {'GIS': 0, '编程': 1, 'programming': 1, '配置': 2}
-                difficulty_priority = {'初级': 0, '中级': 1, '中高级': 2, '高级': 3}
-                return (
-                    category_priority.get(item.get('category', 'programming'), 1),
-                    difficulty_priority.get(item.get('difficulty', '中级'), 1),
-                    item.get('name', '')
-                )
-
-            tools_items.sort(key=sort_key)
-
-            # 确保工具多样性
-            processed_tools = []
-            categories_seen = set()
-
-            for item in tools_items:
-                if len(processed_tools) >= 5:  # 最多5个工具
-                    break
-
-                category = item.get('category', 'other')
-                if len(processed_tools) < 3 or category not in categories_seen:
-                    processed_tools.append(item)
-                    categories_seen.add(category)
+        tools_items, cached = self.load_section('ai_tools', "ai_tools.json", 'tools')
+        if cached is not None:
+            self.reuse_section('ai_tools', cached)
+            return
+
+        if tools_items is not None:
+            # 按类别和实用性排序，并确保工具多样性
+            processed_tools = self.select('ai_tools', tools_items)
 
             self.final_data['ai_tools'] = processed_tools
+            self.cache_section('ai_tools')
             print(f"🤖 处理了 {len(processed_tools)} 个AI工具推荐")
         else:
             print("⚠️  未找到工具数据，使用备用内容")
@@ -132,38 +342,20 @@ class DashboardDataProcessor:
         ]
         self.final_data['ai_tools'] = fallback_tools
 
+    @metrics.timed('processor.process_opportunities')
     def process_opportunities(self):
         """处理实践机会数据"""
-        opp_data = self.load_json_file("opportunities.json")
-        if opp_data and 'opportunities' in opp_data:
-            opp_items = opp_data['opportunities']
-
-            # 按类型和地理位置优先级排序
-            def sort_key(item):
-                type_priority = {'志愿者': 0, '兼职研究': 1, '全职就业': 2, '配置提示': 3}
-                location_priority = 0 if 'ACT' in item.get('location', '') else 1
-                return (
-                    type_priority.get(item.get('type', '其他'), 2),
-                    location_priority,
-                    item.get('title', '')
-                )
-
-            opp_items.sort(key=sort_key)
-
-            # 确保机会类型多样性
-            processed_opportunities = []
-            types_seen = set()
-
-            for item in opp_items:
-                if len(processed_opportunities) >= 6:  # 最多6个机会
-                    break
-
-                opp_type = item.get('type', 'other')
-                if len(processed_opportunities) < 3 or opp_type not in types_seen:
-                    processed_opportunities.append(item)
-                    types_seen.add(opp_type)
+        opp_items, cached = self.load_section('opportunities', "opportunities.json", 'opportunities')
+        if cached is not None:
+            self.reuse_section('opportunities', cached)
+            return
+
+        if opp_items is not None:
+            # 按类型和地理位置优先级排序，并确保机会类型多样性
+            processed_opportunities = self.select('opportunities', opp_items)
 
             self.final_data['opportunities'] = processed_opportunities
+            self.cache_section('opportunities')
             print(f"💼 处理了 {len(processed_opportunities)} 个实践机会")
         else:
             print("⚠️  未找到机会数据，使用备用内容")
@@ -186,18 +378,24 @@ class DashboardDataProcessor:
         ]
         self.final_data['opportunities'] = fallback_opportunities
 
+    @metrics.timed('processor.add_metadata')
     def add_metadata(self):
         """添加元数据和统计信息"""
+        self.final_data['metadata'] = self.build_metadata(self.final_data)
+
+    @staticmethod
+    def build_metadata(final_data):
+        """根据各分区的结果生成元数据"""
         total_items = (
-            len(self.final_data['environmental_news']) + 
-            len(self.final_data['ai_tools']) + 
-            len(self.final_data['opportunities'])
+            len(final_data['environmental_news']) + 
+            len(final_data['ai_tools']) + 
+            len(final_data['opportunities'])
         )
 
         current_time = datetime.datetime.now()
         next_update = current_time + datetime.timedelta(days=1)
 
-        self.final_data['metadata'] = {
+        return {
             'total_items': total_items,
             'last_processing_time': current_time.strftime('%Y-%m-%d %H:%M:%S AEST'),
             'next_update': next_update.strftime('%Y-%m-%d %H:%M:%S AEST'),
@@ -210,12 +408,13 @@ class DashboardDataProcessor:
                 'Environmental Consulting Firms'
             ],
             'categories': {
-                'news': len(self.final_data['environmental_news']),
-                'tools': len(self.final_data['ai_tools']),
-                'opportunities': len(self.final_data['opportunities'])
+                'news': len(final_data['environmental_news']),
+                'tools': len(final_data['ai_tools']),
+                'opportunities': len(final_data['opportunities'])
             }
         }
 
+    @metrics.timed('processor.process_all_data')
     def process_all_data(self):
         """执行完整的数据处理流程"""
         print("📊 开始数据处理和整合...")
@@ -229,12 +428,32 @@ class DashboardDataProcessor:
         self.process_opportunities()
         self.add_metadata()
 
-        # 保存最终整合数据
+        # 所有分区都未变化时沿用上次的时间戳，使输出与上次完全一致
         output_file = self.data_dir / "dashboard_data.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.final_data, f, ensure_ascii=False, indent=2)
+        if self.incremental and len(self.reused_sections) == 3 and 'volatile' in self.manifest:
+            self.final_data.update(self.manifest['volatile']['final_data'])
+            self.final_data['metadata'].update(self.manifest['volatile']['metadata'])
+        else:
+            # 输入的抓取日期每天都会变化；选出的记录除日期外与已发布的文件相同时同样保持不变
+            self.keep_volatile_fields(output_file, self.final_data)
+
+        # 保存最终整合数据
+        with metrics.span('processor.serialize'):
+            report = publish_json(output_file, self.final_data,
+                                  pretty_copy=self.pretty_copy, precompress=self.precompress,
+                                  checksum=True)
+        for section in ('environmental_news', 'ai_tools', 'opportunities'):
+            metrics.items(f"processor.{section}", len(self.final_data[section]))
+
+        if output_file in report['written']:
+            print(f"✅ 数据处理完成！最终数据保存到 {output_file}")
+        else:
+            print(f"📋 数据无变化，{output_file} 保持不变")
+        print(format_report(output_file, report))
+
+        if self.incremental:
+            self.save_manifest()
 
-        print(f"✅ 数据处理完成！最终数据保存到 {output_file}")
         print(f"📈 总共处理了 {self.final_data['metadata']['total_items']} 条记录")
         print(f"   📰 新闻: {self.final_data['metadata']['categories']['news']} 条")
         print(f"   🤖 工具: {self.final_data['metadata']['categories']['tools']} 个")
@@ -242,75 +461,153 @@ class DashboardDataProcessor:
 
         return self.final_data
 
-    def generate_summary_report(self):
-        """生成数据摘要报告"""
-        report_file = self.data_dir / "daily_summary.md"
-
-        current_date = datetime.datetime.now().strftime('%Y年%m月%d日')
-
-        report_content = f"""# 环境科学每日摘要报告
-
-**生成时间**: {current_date} {datetime.datetime.now().strftime('%H:%M AEST')}
-
-## 📊 数据统计
-- 环境科学新闻: {len(self.final_data['environmental_news'])} 条
-- AI工具推荐: {len(self.final_data['ai_tools'])} 个  
-- 实践机会: {len(self.final_data['opportunities'])} 个
-- 总计: {self.final_data['metadata']['total_items']} 条记录
-
-## 🌳 今日环境科学亮点
-"""
-
-        for i, news in enumerate(self.final_data['environmental_news'][:3], 1):
-            report_content += f"""
-### {i}. {news['title']}
-- **来源**: {news['source']}
-- **类别**: {news['category']} 
-- **紧急程度**: {news['urgency']}
-- **摘要**: {news['description'][:150]}...
-- **链接**: {news['link']}
-"""
-
-        report_content += f"""
-
-## 🚀 推荐工具亮点
-"""
-
-        for i, tool in enumerate(self.final_data['ai_tools'][:2], 1):
-            report_content += f"""
-### {i}. {tool['name']} ({tool['category']} - {tool['difficulty']})
-- **功能**: {tool['summary']}
-- **实用性**: {tool['usefulness'][:200]}...
-- **链接**: {tool['link']}
-"""
-
-        report_content += f"""
-
-## 💼 热门实践机会
-"""
-
-        for i, opp in enumerate(self.final_data['opportunities'][:2], 1):
-            report_content += f"""
-### {i}. {opp['title']} ({opp['type']})
-- **机构**: {opp['organization']}
-- **地点**: {opp['location']}
-- **承诺**: {opp['commitment']}
-- **联系**: {opp['contact']}
-"""
-
-        report_content += f"""
+    def load_items(self, section):
+        """分区去重后的完整输入；数据不可用时返回None
+
+        process_all_data 已处理过的分区直接使用其去重结果，沿用缓存的分区才重新加载和去重
+        """
+        if section in self.deduplicated:
+            return self.deduplicated[section]
+        filename, key = SECTION_SOURCES[section]
+        source = self.section_source(filename)
+        if self.streaming and filename not in self.raw_data:
+            if not source.exists():
+                return None
+            verify_file(source)
+            if source.suffix == '.json' and not has_section(source, key):
+                return None
+            items = iter_section_items(source, key)
+        else:
+            data = self.load_json_file(filename)
+            items = data.get(key) if data and isinstance(data, dict) else None
+            if items is None:
+                return None
+        return list(self.deduplicate(section, items))
 
----
-*本报告由自动化系统生成 | 下次更新: {self.final_data['metadata']['next_update']}*
-*数据来源: {', '.join(self.final_data['metadata']['data_sources'])}*
-"""
+    @metrics.timed('processor.process_profiles')
+    def process_profiles(self):
+        """为每个受众配置生成 dashboard_data.<配置名>.json
 
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        各分区的输入只加载和去重一次，所有配置共用；不同配置只重复打分（规则相同时共用）和选取
+        """
+        if not self.profiles:
+            return {}
+        print(f"👥 为 {len(self.profiles)} 个受众配置生成仪表盘数据...")
+        self.data_dir.mkdir(exist_ok=True)
 
-        print(f"📋 每日摘要报告已生成: {report_file}")
+        fallbacks = {
+            'environmental_news': self.add_fallback_news,
+            'ai_tools': self.add_fallback_tools,
+            'opportunities': self.add_fallback_opportunities
+        }
+        items = {}
+        fallback_sections = {}
+        with metrics.span('processor.profiles.load'):
+            for section in SECTION_SOURCES:
+                section_items = self.load_items(section)
+                if section_items is None:
+                    print(f"⚠️  未找到 {section} 数据，各配置使用备用内容")
+                    fallbacks[section]()
+                    fallback_sections[section] = self.final_data[section]
+                else:
+                    items[section] = section_items
+
+        with metrics.span('processor.profiles.select'):
+            selected = select_profiles(self.profiles, items, self.max_workers, self.use_pool)
+
+        outputs = {}
+        for profile in self.profiles:
+            sections = dict(fallback_sections, **selected[profile.name])
+            sections['environmental_news'] = self.filter_news(sections['environmental_news'])
+            final_data = {
+                'last_updated': self.final_data['last_updated'],
+                'current_date': self.final_data['current_date'],
+                **{section: sections[section] for section in SECTION_SOURCES}
+            }
+            final_data['metadata'] = self.build_metadata(final_data)
+
+            output_file = self.data_dir / f"dashboard_data.{profile.name}.json"
+            self.keep_volatile_fields(output_file, final_data)
+            report = publish_json(output_file, final_data, pretty_copy=self.pretty_copy,
+                                  precompress=self.precompress, checksum=True)
+            status = '已生成' if output_file in report['written'] else '无变化'
+            categories = final_data['metadata']['categories']
+            print(f"   {profile.name}: {output_file} {status}（新闻 {categories['news']} 条，"
+                  f"工具 {categories['tools']} 个，机会 {categories['opportunities']} 个）")
+            outputs[profile.name] = final_data
+        return outputs
+
+    @staticmethod
+    def keep_volatile_fields(output_file, final_data):
+        """各分区除抓取日期外与现有文件相同时沿用其时间戳字段和记录日期，使输出与上次完全一致"""
+        try:
+            previous = load_json(output_file)
+        except (OSError, ValueError):
+            return
+
+        def stable(items):
+            return [{k: v for k, v in item.items() if k not in VOLATILE_ITEM_FIELDS} for item in items]
+
+        sections = {section: previous.get(section) for section in SECTION_SOURCES}
+        if any(not isinstance(items, list) or stable(items) != stable(final_data[section])
+               for section, items in sections.items()):
+            return
+        final_data.update(sections)
+        final_data.update({k: previous[k] for k in VOLATILE_FIELDS if k in previous})
+        final_data['metadata'].update({k: previous.get('metadata', {})[k] for k in VOLATILE_METADATA_FIELDS
+                                       if k in previous.get('metadata', {})})
+
+    @metrics.timed('processor.generate_summary_report')
+    def generate_summary_report(self):
+        """生成数据摘要报告（daily_summary.md，以及 report_formats 中的其他格式）"""
+        changes = self.report_renderer.render(self.final_data, self.data_dir)
+        for report_file, changed in changes.items():
+            if changed:
+                print(f"📋 每日摘要报告已生成: {report_file}")
+            else:
+                print(f"📋 摘要报告无变化，{report_file} 保持不变")
 
 if __name__ == "__main__":
-    processor = DashboardDataProcessor()
+    # --full: 忽略增量清单，重新处理所有分区
+    # --stream: 流式读取输入，适用于大规模历史数据
+    # --ranking <文件>: 使用指定的排序规则配置
+    # --pretty: 另存缩进格式的 dashboard_data.pretty.json
+    # --precompress: 另存预压缩的 dashboard_data.json.gz（安装brotli时还有.br）
+    # --report-formats md,html,txt: 摘要报告的输出格式
+    # --report-counts 分区=条数,...: 报告中各分区的条数，如 environmental_news=5,ai_tools=3
+    # --profiles [文件]: 按受众配置（默认 profiles.json）另外生成 dashboard_data.<配置名>.json
+    # --workers <数量>: 配置较多时使用的进程数（默认为CPU核数）
+    ranking = None
+    if '--ranking' in sys.argv[1:]:
+        ranking = load_ranking(sys.argv[sys.argv.index('--ranking') + 1])
+    profiles = None
+    if '--profiles' in sys.argv[1:]:
+        position = sys.argv.index('--profiles') + 1
+        path = sys.argv[position] if position < len(sys.argv) and not sys.argv[position].startswith('--') else None
+        profiles = load_profiles(path, ranking)
+    max_workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv[1:] else None
+    report_formats = ('md',)
+    if '--report-formats' in sys.argv[1:]:
+        report_formats = sys.argv[sys.argv.index('--report-formats') + 1].split(',')
+    report_counts = {}
+    if '--report-counts' in sys.argv[1:]:
+        for pair in sys.argv[sys.argv.index('--report-counts') + 1].split(','):
+            section, _, count = pair.partition('=')
+            if not count.isdigit():
+                raise ValueError(f"--report-counts 的格式应为 分区=条数: {pair!r}")
+            report_counts[section] = int(count)
+    processor = DashboardDataProcessor(
+        incremental='--full' not in sys.argv[1:],
+        streaming='--stream' in sys.argv[1:],
+        ranking=ranking,
+        pretty_copy='--pretty' in sys.argv[1:],
+        precompress='--precompress' in sys.argv[1:],
+        report_formats=report_formats,
+        report_counts=report_counts,
+        profiles=profiles,
+        max_workers=max_workers
+    )
     processor.process_all_data()
+    processor.process_profiles()
     processor.generate_summary_report()
+    metrics.export()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+近似重复检测
+对文本做中英文混合切分（中文按字二元组、英文按单词），计算单排列MinHash
+（one permutation hashing）签名，再用分段LSH索引只比较落入同一桶的候选项，
+整体复杂度为亚二次。候选项按特征集合的精确Jaccard相似度确认，签名只用于找候选；
+流式输入时索引只保留最近的有限条，内存占用与输入规模无关
+"""
+
+import hashlib
+import re
+import unicodedata
+from array import array
+from collections import deque
+
+# 特征哈希的低5位决定分桶，高32位作为桶内取最小值的依据
+NUM_BINS = 32
+_ROTATION_OFFSET = 1 << 32
+
+# 流式输入时索引保留的签名条数：同一报道的转载通常相距不远，超出后淘汰最早的签名
+DEFAULT_MAX_ENTRIES = 1024
+
+# 中日韩统一表意文字按字切分，其他连续的字母数字按词切分
+_TOKEN = re.compile(r'[㐀-䶿一-鿿豈-﫿]+|[^\W_㐀-䶿一-鿿豈-﫿]+')
+_CJK = re.compile(r'[㐀-䶿一-鿿豈-﫿]')
+
+
+def tokenize(text):
+    """将中英文混合文本切分为特征集合：中文为字二元组，英文为单词"""
+    text = unicodedata.normalize('NFKC', text).casefold()
+    features = set()
+    for token in _TOKEN.findall(text):
+        if _CJK.match(token) and len(token) > 1:
+            features.update(token[i:i + 2] for i in range(len(token) - 1))
+        else:
+            features.add(token)
+    return features
+
+
+def feature_hash(feature):
+    """特征的64位哈希；使用blake2b而不是内置hash，结果不随进程的哈希种子变化"""
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def minhash(hashes):
+    """由特征哈希集合计算MinHash签名（64位无符号整数数组），空集合返回None
+
+    空桶借用其后第一个非空桶的值并加上偏移（旋转致密化）。特征很少时各桶高度相关，
+    签名会高估相似度，因此只用于LSH找候选，是否重复由 jaccard 判断
+    """
+    if not hashes:
+        return None
+
+    bins = [None] * NUM_BINS
+    for h in hashes:
+        index = h & (NUM_BINS - 1)
+        value = h >> 32
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+
+    if None not in bins:
+        return array('Q', bins)
+
+    dense = list(bins)
+    for index in range(NUM_BINS):
+        if bins[index] is None:
+            offset = 1
+            while bins[(index + offset) % NUM_BINS] is None:
+                offset += 1
+            dense[index] = bins[(index + offset) % NUM_BINS] + offset * _ROTATION_OFFSET
+    return array('Q', dense)
+
+
+def jaccard(hashes, other):
+    """两个特征哈希集合的精确Jaccard相似度"""
+    shared = len(hashes.intersection(other))
+    return shared / (len(hashes) + len(other) - shared)
+
+
+class _Entry:
+    __slots__ = ('hashes', 'source', 'link', 'band_keys')
+
+    def __init__(self, hashes, source, link, band_keys):
+        # 特征哈希按排序后的紧凑数组保存，每个特征8字节
+        self.hashes = hashes
+        self.source = source
+        self.link = link
+        self.band_keys = band_keys
+
+
+class NearDuplicateFilter:
+    """过滤近似重复项，保留每组中最先出现的一项
+
+    text_fields 的文本按特征集合的精确Jaccard相似度不低于threshold时视为重复。
+    指定 source_field 时，同一来源、链接不同的两项是该来源的不同报道，不合并
+    （模板化标题的系列报道不会被误判），只合并不同来源对同一报道的转载；
+    distinct_links 为True时，链接不同的两项一律不合并（如不同仓库地址的工具）。
+    签名被切成bands段，任一段完全相同的两项才会被比较：默认8段×4行时，
+    相似度0.8的两项成为候选的概率约98%。
+    max_entries 为None时索引保留全部签名（内存中的列表输入）；流式输入时指定上限，
+    超出后淘汰最早加入的，内存占用有上限，但相距更远的重复项不再被发现
+    """
+
+    def __init__(self, text_fields, threshold=0.8, bands=8, source_field=None, distinct_links=False,
+                 max_entries=None):
+        self.text_fields = text_fields
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_BINS // bands
+        self.source_field = source_field
+        self.distinct_links = distinct_links
+        self.max_entries = max_entries
+        self.buckets = {}
+        self.entries = deque()
+        self.merged = 0
+
+    def feature_hashes(self, item):
+        text = ' '.join(str(item.get(field) or '') for field in self.text_fields)
+        return {feature_hash(feature) for feature in tokenize(text)}
+
+    def _distinct(self, source, link, entry):
+        """根据来源和链接即可判定为不同记录"""
+        if link and entry.link and link != entry.link:
+            return self.distinct_links or (source and source == entry.source)
+        return False
+
+    def is_duplicate(self, item):
+        """判断是否与索引中的项近似重复；不重复时将其加入索引"""
+        hashes = self.feature_hashes(item)
+        signature = minhash(hashes)
+        if signature is None:
+            return False
+
+        source = item.get(self.source_field) if self.source_field else None
+        link = item.get('link')
+        # 整数元组的hash不受哈希种子影响；不同段内容偶然得到相同的键只会多比较一次
+        band_keys = tuple(
+            hash((band, *signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        )
+        checked = set()
+        for key in band_keys:
+            for entry in self.buckets.get(key, ()):
+                if id(entry) in checked:
+                    continue
+                checked.add(id(entry))
+                if self._distinct(source, link, entry):
+                    continue
+                if jaccard(hashes, entry.hashes) >= self.threshold:
+                    self.merged += 1
+                    return True
+
+        self._add(_Entry(array('Q', sorted(hashes)), source, link, band_keys))
+        return False
+
+    def _add(self, entry):
+        for key in entry.band_keys:
+            self.buckets.setdefault(key, []).append(entry)
+        if self.max_entries is None:
+            return
+        self.entries.append(entry)
+        if len(self.entries) > self.max_entries:
+            self._evict(self.entries.popleft())
+
+    def _evict(self, entry):
+        for key in entry.band_keys:
+            bucket = self.buckets[key]
+            bucket.remove(entry)
+            if not bucket:
+                del self.buckets[key]
+
+    def filter(self, items):
+        """逐项产出非重复的记录，可直接用于列表或流式迭代器"""
+        for item in items:
+            if not self.is_duplicate(item):
+                yield item
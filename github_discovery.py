@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+GitHub项目发现引擎
+所有关键词并行搜索并分页（每页100条），按响应头 X-RateLimit-Remaining/X-RateLimit-Reset
+控制节奏：配额用完时等到重置时间，等待过长则停止本次搜索。仓库元数据按 full_name
+缓存在本地并设有效期，按更新时间排序的结果页中全部是未变化的已缓存仓库时不再往后翻页；
+候选池由本次获取的仓库和缓存中仍有效的仓库组成，同样的配额下候选远多于每个关键词取一条。
+python github_discovery.py 针对本地模拟的搜索API运行一次完整发现
+"""
+
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+
+from atomic_io import atomic_write, load_json
+from metrics import metrics
+from serializer import dumps
+
+GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+
+DEFAULT_KEYWORDS = [
+    'environmental-data', 'climate-analysis', 'gis-tools', 'earth-observation',
+    'remote-sensing', 'hydrology', 'biodiversity', 'air-quality',
+    'climate-model', 'geospatial', 'ecology', 'carbon-emissions',
+]
+
+# 缓存中保留的仓库字段
+REPO_FIELDS = ('full_name', 'name', 'description', 'html_url', 'stargazers_count',
+               'language', 'topics', 'updated_at', 'pushed_at')
+
+
+class RateLimitExhausted(Exception):
+    """配额已用完，且距离重置的时间超过允许的等待上限"""
+
+
+class RateLimitTracker:
+    """根据响应头跟踪剩余配额
+
+    并发请求在发出前先预扣一次配额，响应头中的剩余次数再减去仍在途中的请求，避免同时
+    发出的请求超出配额；尚未收到任何响应头时只放行一个探测请求。
+    配额用完时等到 X-RateLimit-Reset，超过max_wait则抛出RateLimitExhausted
+    """
+
+    def __init__(self, max_wait=60, reserve=0):
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self.remaining = None
+        self.reset_at = None
+        self.in_flight = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, headers):
+        """请求结束后调用（失败时传入空字典）；Retry-After（二级限流）视为配额在该时间后恢复"""
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            remaining = headers.get('X-RateLimit-Remaining')
+            reset = headers.get('X-RateLimit-Reset')
+            retry_after = headers.get('Retry-After')
+            if remaining is not None:
+                self.remaining = max(int(remaining) - self.in_flight, 0)
+            if reset is not None:
+                self.reset_at = float(reset)
+            if retry_after is not None:
+                self.remaining = 0
+                self.reset_at = time.time() + float(retry_after)
+
+    def _take(self):
+        """尝试预扣一次配额，返回需要等待的秒数（0表示已取得）"""
+        with self._lock:
+            now = time.time()
+            if self.reset_at is not None and now >= self.reset_at:
+                # 已过重置时间，剩余次数未知，等下一个响应头更新
+                self.remaining = None
+                self.reset_at = None
+            if self.remaining is None:
+                if self.in_flight:
+                    return 0.05
+                self.in_flight += 1
+                return 0
+            if self.remaining > self.reserve:
+                self.remaining -= 1
+                self.in_flight += 1
+                return 0
+            return max(self.reset_at - now, 0) + 1 if self.reset_at is not None else 1
+
+    async def acquire(self):
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            if wait > self.max_wait:
+                raise RateLimitExhausted(f"配额已用完，{wait:.0f}s 后重置")
+            self.waited += wait
+            metrics.incr('github.rate_limit_wait_seconds', wait)
+            await asyncio.sleep(wait)
+
+
+class RepoCache:
+    """按 full_name 缓存仓库元数据，超过ttl的条目视为过期
+
+    同时记录每个关键词最近一次完整翻页的时间：只有在有效期内完整翻过页的关键词才允许
+    提前停止，因此每个ttl周期内每个关键词至少完整搜索一次，已消失的仓库会自然过期
+    """
+
+    def __init__(self, path=".cache/github_repos.json", ttl=24 * 3600):
+        self.path = Path(path)
+        self.ttl = ttl
+        try:
+            data = load_json(self.path)
+            self.entries, self.scans = data['repos'], data['scans']
+        except (OSError, ValueError, KeyError, TypeError):
+            # 缓存缺失或损坏时从空缓存开始
+            self.entries, self.scans = {}, {}
+
+    def fresh(self, full_name, now=None):
+        entry = self.entries.get(full_name)
+        if entry and (now or time.time()) - entry['seen_at'] <= self.ttl:
+            return entry
+        return None
+
+    def is_unchanged(self, repo, now=None):
+        """仓库已在缓存中且更新时间未变"""
+        entry = self.fresh(repo['full_name'], now)
+        return entry is not None and entry['repo'].get('updated_at') == repo.get('updated_at')
+
+    def put(self, repo, keyword, now=None):
+        self.entries[repo['full_name']] = {
+            'repo': {field: repo.get(field) for field in REPO_FIELDS},
+            'keyword': keyword,
+            'seen_at': now or time.time()
+        }
+
+    def scanned_recently(self, keyword, now=None):
+        return (now or time.time()) - self.scans.get(keyword, 0) <= self.ttl
+
+    def mark_scanned(self, keyword, now=None):
+        self.scans[keyword] = now or time.time()
+
+    def touch_keyword(self, keyword, now=None):
+        """提前停止时，该关键词其余已缓存的仓库视为仍然存在"""
+        now = now or time.time()
+        for entry in self.entries.values():
+            if entry['keyword'] == keyword and now - entry['seen_at'] <= self.ttl:
+                entry['seen_at'] = now
+
+    def pool(self, now=None):
+        """缓存中仍在有效期内的全部仓库"""
+        now = now or time.time()
+        return [entry for entry in self.entries.values() if now - entry['seen_at'] <= self.ttl]
+
+    def save(self):
+        """删除过期条目后原子写入"""
+        now = time.time()
+        self.entries = {name: entry for name, entry in self.entries.items() if now - entry['seen_at'] <= self.ttl}
+        atomic_write(self.path, dumps({'repos': self.entries, 'scans': self.scans}), checksum=True)
+
+
+class GitHubDiscovery:
+    """并行分页搜索多个关键词，返回去重后的候选仓库
+
+    max_requests 为单次运行的请求预算：每个关键词先取第一页，剩余预算用于后续分页；
+    超出当前配额窗口的请求由RateLimitTracker等到重置后再发出
+    """
+
+    def __init__(self, fetcher, keywords=None, search_url=GITHUB_SEARCH_URL,
+                 query='{keyword} language:python stars:>100', per_page=100, max_pages=3,
+                 max_requests=24, cache=None, tracker=None):
+        self.fetcher = fetcher
+        self.keywords = list(keywords or DEFAULT_KEYWORDS)
+        self.search_url = search_url
+        self.query = query
+        self.per_page = per_page
+        self.max_pages = max_pages
+        self.max_requests = max_requests
+        self.cache = cache if cache is not None else RepoCache()
+        self.tracker = tracker or RateLimitTracker()
+        self.stats = {'requests': 0, 'pages': 0, 'fetched': 0, 'new': 0, 'unchanged': 0, 'stopped_early': 0}
+        self.headers = {'Accept': 'application/vnd.github.v3+json'}
+        token = os.environ.get('GITHUB_TOKEN')
+        if token:
+            # 认证后搜索配额从每分钟10次提高到30次
+            self.headers['Authorization'] = f"Bearer {token}"
+
+    def _take_budget(self):
+        if self.stats['requests'] >= self.max_requests:
+            return False
+        self.stats['requests'] += 1
+        return True
+
+    async def _fetch_page(self, keyword, page):
+        """请求一页结果；因配额用完被拒绝（403/429）时按响应头等待后重试一次，失败返回None"""
+        for attempt in range(2):
+            try:
+                await self.tracker.acquire()
+            except RateLimitExhausted as e:
+                print(f"⏳ GitHub搜索 {keyword}: {e}，停止翻页")
+                return None
+            try:
+                response = await self.fetcher.fetch(self.search_url, headers=self.headers, params={
+                    'q': self.query.format(keyword=keyword),
+                    'sort': 'updated',
+                    'per_page': self.per_page,
+                    'page': page,
+                })
+            except Exception as e:
+                self.tracker.update({})
+                print(f"GitHub API error for {keyword}: {e}")
+                return None
+            self.tracker.update(response.headers)
+            if response.status_code == 200:
+                return response
+            if response.status_code in (403, 429) and self.tracker.remaining == 0 and attempt == 0:
+                metrics.incr('github.rate_limited')
+                continue
+            print(f"GitHub API error for {keyword}: HTTP {response.status_code}")
+            return None
+        return None
+
+    async def _search_keyword(self, keyword):
+        """按更新时间逐页搜索一个关键词，直到结果取完、页数或预算用完、或整页都未变化"""
+        for page in range(1, self.max_pages + 1):
+            if not self._take_budget():
+                return
+            response = await self._fetch_page(keyword, page)
+            if response is None:
+                return
+
+            try:
+                items = response.json()['items']
+            except (ValueError, KeyError, TypeError) as e:
+                # 响应体不是预期的JSON（如代理返回的错误页），按失败的页处理
+                print(f"GitHub API error for {keyword}: 无法解析响应 ({e!r})")
+                return
+            self.stats['pages'] += 1
+            self.stats['fetched'] += len(items)
+            unchanged = 0
+            for repo in items:
+                if self.cache.is_unchanged(repo):
+                    unchanged += 1
+                else:
+                    self.stats['new'] += 1
+                self.cache.put(repo, keyword)
+            self.stats['unchanged'] += unchanged
+
+            if len(items) < self.per_page or page == self.max_pages:
+                self.cache.mark_scanned(keyword)
+                return
+            if unchanged == len(items) and self.cache.scanned_recently(keyword):
+                # 结果按更新时间排序，后面的页只会更旧，在最近一次完整搜索中都已缓存
+                self.cache.touch_keyword(keyword)
+                self.stats['stopped_early'] += 1
+                return
+
+    async def _discover(self):
+        await asyncio.gather(*(self._search_keyword(keyword) for keyword in self.keywords))
+
+    def discover(self):
+        """运行一次发现，返回候选仓库列表 [{'repo':..., 'keyword':..., 'seen_at':...}]（按星标降序）
+
+        缓存可能由使用其他关键词的运行写入，候选池只包含本次关键词找到的仓库
+        """
+        asyncio.run(self._discover())
+        self.cache.save()
+        keywords = set(self.keywords)
+        pool = sorted((entry for entry in self.cache.pool() if entry['keyword'] in keywords),
+                      key=lambda entry: entry['repo'].get('stargazers_count') or 0, reverse=True)
+        metrics.items('github.candidates', len(pool))
+        print(f"🔭 GitHub发现: {self.stats['requests']} 次请求 / {self.stats['pages']} 页，"
+              f"获取 {self.stats['fetched']} 个仓库（新增或更新 {self.stats['new']}），"
+              f"提前停止翻页 {self.stats['stopped_early']} 个关键词，候选池 {len(pool)} 个")
+        return pool
+
+
+def mock_search_server(total_per_keyword=250, rate_limit=30, window=60):
+    """本地模拟的GitHub搜索API：按 q/page/per_page 返回确定的结果，配额每window秒重置一次"""
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlsplit
+
+    state = {'remaining': rate_limit, 'reset': time.time() + window, 'requests': 0}
+    lock = threading.Lock()
+
+    class SearchHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            query = parse_qs(urlsplit(self.path).query)
+            keyword = query['q'][0].split()[0]
+            page = int(query.get('page', ['1'])[0])
+            per_page = int(query.get('per_page', ['30'])[0])
+            with lock:
+                state['requests'] += 1
+                if time.time() >= state['reset']:
+                    state['remaining'], state['reset'] = rate_limit, time.time() + window
+                state['remaining'] -= 1
+                remaining, reset = state['remaining'], state['reset']
+
+            if remaining < 0:
+                status, payload = 403, {'message': 'API rate limit exceeded'}
+            else:
+                start = (page - 1) * per_page
+                status, payload = 200, {
+                    'total_count': total_per_keyword,
+                    'items': [
+                        {
+                            'full_name': f"mock/{keyword}-{index}",
+                            'name': f"{keyword}-{index}",
+                            'description': f"Mock {keyword} project #{index}",
+                            'html_url': f"https://github.com/mock/{keyword}-{index}",
+                            'stargazers_count': 100 + (index * 37) % 900,
+                            'language': 'Python',
+                            'topics': [keyword],
+                            'updated_at': '2026-01-01T00:00:00Z',
+                            'pushed_at': '2026-01-01T00:00:00Z',
+                        }
+                        for index in range(start, min(start + per_page, total_per_keyword))
+                    ]
+                }
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('X-RateLimit-Limit', str(rate_limit))
+            self.send_header('X-RateLimit-Remaining', str(max(remaining, 0)))
+            self.send_header('X-RateLimit-Reset', str(int(reset)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SearchHandler)
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    # 针对本地模拟API（每3秒20次配额）运行两次：第一次超出配额时等待重置后继续翻页；
+    # 第二次结果未变化，每个关键词在第一页后即停止
+    import tempfile
+
+    from http_client import AsyncFetcher
+
+    server = mock_search_server(rate_limit=20, window=3)
+    search_url = f"http://127.0.0.1:{server.server_port}/search/repositories"
+    tracker = RateLimitTracker()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for run in (1, 2):
+            discovery = GitHubDiscovery(AsyncFetcher(), search_url=search_url, max_requests=30,
+                                        cache=RepoCache(Path(cache_dir) / 'repos.json'), tracker=tracker)
+            start = time.perf_counter()
+            pool = discovery.discover()
+            print(f"   第 {run} 次: 耗时 {time.perf_counter() - start:.2f}s，"
+                  f"各请求累计等待配额 {tracker.waited:.1f}s，模拟服务器累计收到 {server.state['requests']} 个请求")
+    server.shutdown()
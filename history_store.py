@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+抓取结果历史库
+所有抓取器保存数据时同时写入本地SQLite库，每条记录按标准化的标题+链接
+生成稳定的内容键去重，并按来源、类别和日期建立索引，便于查询历史和"本次新增"
+"""
+
+import datetime
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import unicodedata
+from pathlib import Path
+
+# 各分区中作为标题/来源/类别的字段
+SECTION_FIELDS = {
+    'news': {'title': 'title', 'source': 'source', 'category': 'category'},
+    'tools': {'title': 'name', 'source': None, 'category': 'category'},
+    'opportunities': {'title': 'title', 'source': 'organization', 'category': 'type'},
+}
+
+# 各分区对应的抓取结果文件（文件中的记录列表字段与分区同名）
+SECTION_FILES = {
+    'news': 'environmental_news.json',
+    'tools': 'ai_tools.json',
+    'opportunities': 'opportunities.json',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    section TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    item_count INTEGER NOT NULL,
+    new_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    section TEXT NOT NULL,
+    content_key TEXT NOT NULL,
+    source TEXT,
+    category TEXT,
+    date TEXT,
+    first_run INTEGER NOT NULL,
+    last_run INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (section, content_key)
+);
+CREATE INDEX IF NOT EXISTS idx_items_source ON items (section, source);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items (section, category);
+CREATE INDEX IF NOT EXISTS idx_items_date ON items (section, date);
+CREATE INDEX IF NOT EXISTS idx_items_first_run ON items (section, first_run);
+"""
+
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """统一全半角、大小写和空白，使同一内容得到相同的键"""
+    text = unicodedata.normalize('NFKC', text or '')
+    return _SPACES.sub(' ', text).strip().casefold()
+
+
+def normalize_link(link):
+    """去掉链接的锚点和末尾斜杠"""
+    link = (link or '').split('#', 1)[0].strip()
+    return link.rstrip('/').lower()
+
+
+def content_key(section, item):
+    """由标准化的标题和链接生成稳定的内容键"""
+    title_field = SECTION_FIELDS[section]['title']
+    basis = f"{normalize_text(item.get(title_field))}\n{normalize_link(item.get('link'))}"
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()
+
+
+class HistoryStore:
+    def __init__(self, db_path="data/history.sqlite3"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 多个抓取器可能在不同线程中同时写入，等待锁释放而不是立即失败
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, section, items, run_at=None):
+        """记录一次抓取结果，返回 (本次运行ID, 新增条数)；run_at 默认为当前时间"""
+        fields = SECTION_FIELDS[section]
+        run_at = run_at or datetime.datetime.now()
+        today = run_at.strftime('%Y-%m-%d')
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (section, run_at, item_count, new_count) VALUES (?, ?, ?, 0)",
+                (section, run_at.isoformat(), len(items))
+            )
+            run_id = cursor.lastrowid
+
+            rows = []
+            for item in items:
+                rows.append((
+                    section,
+                    content_key(section, item),
+                    item.get(fields['source']) if fields['source'] else None,
+                    item.get(fields['category']),
+                    item.get('date') or today,
+                    run_id,
+                    run_id,
+                    json.dumps(item, ensure_ascii=False)
+                ))
+
+            # 已存在的记录只更新最后出现的运行，保留首次出现时的内容
+            self.conn.executemany(
+                """INSERT INTO items (section, content_key, source, category, date, first_run, last_run, payload)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (section, content_key) DO UPDATE SET last_run = excluded.last_run""",
+                rows
+            )
+
+            new_count = self.conn.execute(
+                "SELECT COUNT(*) FROM items WHERE section = ? AND first_run = ?", (section, run_id)
+            ).fetchone()[0]
+            self.conn.execute("UPDATE runs SET new_count = ? WHERE id = ?", (new_count, run_id))
+
+        return run_id, new_count
+
+    def last_run_id(self, section):
+        row = self.conn.execute("SELECT MAX(id) FROM runs WHERE section = ?", (section,)).fetchone()
+        return row[0]
+
+    def new_since(self, section, run_id):
+        """返回在指定运行之后首次出现的记录"""
+        rows = self.conn.execute(
+            "SELECT payload FROM items WHERE section = ? AND first_run > ? ORDER BY first_run",
+            (section, run_id)
+        )
+        return [json.loads(row['payload']) for row in rows]
+
+    def new_in_last_run(self, section):
+        """返回最近一次运行中首次出现的记录"""
+        run_id = self.last_run_id(section)
+        rows = self.conn.execute(
+            "SELECT payload FROM items WHERE section = ? AND first_run = ?", (section, run_id)
+        )
+        return [json.loads(row['payload']) for row in rows]
+
+    def query(self, section, source=None, category=None, since=None):
+        """按来源、类别和日期查询历史记录"""
+        sql = "SELECT payload FROM items WHERE section = ?"
+        params = [section]
+        if source is not None:
+            sql += " AND source = ?"
+            params.append(source)
+        if category is not None:
+            sql += " AND category = ?"
+            params.append(category)
+        if since is not None:
+            sql += " AND date >= ?"
+            params.append(since)
+        sql += " ORDER BY date DESC"
+        return [json.loads(row['payload']) for row in self.conn.execute(sql, params)]
+
+
+def rebuild_from_snapshots(db_path="data/history.sqlite3", snapshot_root=None):
+    """由快照库重建历史库：按日期依次把每份快照中的抓取结果作为一次运行写入
+
+    快照库随仓库提交，是历史的持久来源；历史库只是它的本地索引，丢失后可随时重建。
+    只有内容变化的日子才有快照，其余日子没有新增记录，重建结果中不包含这些运行
+    """
+    from snapshot_store import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+
+    snapshots = SnapshotStore(snapshot_root or DEFAULT_SNAPSHOT_DIR)
+    db_path = Path(db_path)
+    db_path.unlink(missing_ok=True)
+    store = HistoryStore(db_path)
+    try:
+        dates = snapshots.manifest_dates()
+        for date in dates:
+            documents = snapshots.restore(date)
+            run_at = datetime.datetime.fromisoformat(date)
+            for section, filename in SECTION_FILES.items():
+                items = documents.get(filename, {}).get(section)
+                if items is not None:
+                    store.record(section, items, run_at)
+    finally:
+        store.close()
+    return len(dates)
+
+
+if __name__ == "__main__":
+    # --rebuild: 由 snapshots/ 快照库重建历史库
+    if '--rebuild' in sys.argv[1:]:
+        count = rebuild_from_snapshots()
+        print(f"🗃️  已由 {count} 份快照重建历史库")
+        sys.exit(0)
+
+    store = HistoryStore()
+    for section in sys.argv[1:] or list(SECTION_FIELDS):
+        new_items = store.new_in_last_run(section)
+        print(f"🆕 {section}: 最近一次运行新增 {len(new_items)} 条")
+        for item in new_items:
+            print(f"   - {item.get(SECTION_FIELDS[section]['title'])}")
+    store.close()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Fenner School新闻页面解析
+优先使用lxml和预编译的XPath一次性定位新闻条目；未安装lxml时回退到BeautifulSoup，
+并用SoupStrainer只构建新闻条目所在的子树。两种解析库都在首次解析时才导入
+"""
+
+import importlib.util
+import re
+from urllib.parse import urljoin
+
+NEWS_TAGS = ['article', 'div']
+NEWS_CLASSES = ['news-item', 'news-article', 'post', 'content-item']
+TITLE_TAGS = ['h1', 'h2', 'h3', 'h4', 'a']
+DESC_TAGS = ['p', 'div']
+DESC_CLASSES = ['summary', 'excerpt', 'description', 'content']
+
+# SoupStrainer在解析阶段拿到的是未拆分的class字符串，需按单词边界匹配任一类名
+_NEWS_CLASS_PATTERN = re.compile(r'(?:^|\s)(?:' + '|'.join(map(re.escape, NEWS_CLASSES)) + r')(?:\s|$)')
+
+_xpaths = None
+
+
+def lxml_available():
+    """是否安装了lxml；只查找模块而不导入，避免拖慢启动"""
+    return importlib.util.find_spec('lxml') is not None
+
+
+def _has_class(classes):
+    return ' or '.join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in classes
+    )
+
+
+def _is_tag(tags):
+    return ' or '.join(f"self::{tag}" for tag in tags)
+
+
+def _compiled_xpaths():
+    """首次解析时才导入lxml并编译XPath"""
+    global _xpaths
+    if _xpaths is None:
+        from lxml import etree
+
+        _xpaths = {
+            # 与BeautifulSoup的 find_all/find 语义一致：按文档顺序匹配任一标签和任一类名
+            'news_items': etree.XPath(f"//*[({_is_tag(NEWS_TAGS)}) and ({_has_class(NEWS_CLASSES)})]"),
+            'title': etree.XPath(f"(.//*[{_is_tag(TITLE_TAGS)}])[1]"),
+            'desc': etree.XPath(f"(.//*[({_is_tag(DESC_TAGS)}) and ({_has_class(DESC_CLASSES)})])[1]"),
+            'first_p': etree.XPath("(.//p)[1]"),
+            'first_a': etree.XPath("(.//a)[1]"),
+            # get_text() 不包含脚本、样式和模板中的文本
+            'text': etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]"),
+        }
+    return _xpaths
+
+
+def _lxml_text(xpaths, element):
+    """等价于 BeautifulSoup 的 get_text(strip=True)"""
+    return ''.join(part.strip() for part in xpaths['text'](element))
+
+
+def _first(xpath, element):
+    found = xpath(element)
+    return found[0] if found else None
+
+
+def parse_with_lxml(content, base_url, limit=3):
+    from lxml import html as lxml_html
+
+    xpaths = _compiled_xpaths()
+    root = lxml_html.fromstring(content)
+    results = []
+    for item in xpaths['news_items'](root)[:limit]:
+        title_elem = _first(xpaths['title'], item)
+        if title_elem is None:
+            continue
+        desc_elem = _first(xpaths['desc'], item)
+        if desc_elem is None:
+            desc_elem = _first(xpaths['first_p'], item)
+        link_elem = _first(xpaths['first_a'], item)
+        href = link_elem.get('href') if link_elem is not None else None
+        results.append({
+            'title': _lxml_text(xpaths, title_elem),
+            'description': _lxml_text(xpaths, desc_elem) if desc_elem is not None else None,
+            'link': urljoin(base_url, href) if href else base_url
+        })
+    return results
+
+
+def parse_with_soup(content, base_url, limit=3):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    # 只为新闻条目构建子树，跳过导航、页脚等无关内容
+    strainer = SoupStrainer(NEWS_TAGS, class_=_NEWS_CLASS_PATTERN)
+    soup = BeautifulSoup(content, 'html.parser', parse_only=strainer)
+    results = []
+    for item in soup.find_all(NEWS_TAGS, class_=NEWS_CLASSES)[:limit]:
+        title_elem = item.find(TITLE_TAGS)
+        if not title_elem:
+            continue
+        desc_elem = item.find(DESC_TAGS, class_=DESC_CLASSES)
+        if not desc_elem:
+            desc_elem = item.find('p')
+        link_elem = item.find('a')
+        href = link_elem.get('href') if link_elem else None
+        results.append({
+            'title': title_elem.get_text(strip=True),
+            'description': desc_elem.get_text(strip=True) if desc_elem else None,
+            'link': urljoin(base_url, href) if href else base_url
+        })
+    return results
+
+
+def extract_news_items(content, base_url, limit=3, backend=None):
+    """提取新闻条目的标题、描述和链接，描述缺失时为None
+
+    backend 可为 'lxml' 或 'soup'，默认在lxml可用时使用lxml
+    """
+    if backend is None:
+        backend = 'lxml' if lxml_available() else 'soup'
+    if backend == 'lxml':
+        return parse_with_lxml(content, base_url, limit)
+    return parse_with_soup(content, base_url, limit)
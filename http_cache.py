@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+HTTP条件请求缓存
+将响应体和校验信息(ETag/Last-Modified)持久化到磁盘，
+再次请求时发送 If-None-Match/If-Modified-Since，服务器返回304时直接复用缓存内容
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from atomic_io import atomic_write
+
+# 描述传输编码的响应头：缓存保存的是requests解码后的响应体，这些头与之不符，存储和还原时都去掉
+_TRANSFER_HEADERS = ('Content-Encoding', 'Content-Length', 'Transfer-Encoding')
+
+
+def _body_headers(headers, body):
+    """去掉传输编码相关的头，并按解码后的响应体重写 Content-Length"""
+    headers = CaseInsensitiveDict(headers)
+    for name in _TRANSFER_HEADERS:
+        headers.pop(name, None)
+    headers['Content-Length'] = str(len(body))
+    return headers
+
+
+class HTTPCache:
+    """磁盘响应缓存，支持TTL过期和按总大小淘汰
+
+    各条目的存储时间和大小保存在内存索引中，首次写入时扫描一次缓存目录建立，
+    之后每次写入只更新索引，总大小超过上限时才淘汰
+    """
+
+    def __init__(self, cache_dir=".cache/http", ttl=7 * 24 * 3600, max_bytes=50 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        # {元数据路径: (存储时间, 响应体大小)}，None表示尚未扫描目录
+        self._index = None
+        self._total = 0
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, url):
+        """读取未过期的缓存条目，返回 (元数据, 响应体) 或 None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if time.time() - meta['stored_at'] > self.ttl:
+                self._remove(meta_path, body_path)
+                return None
+            return meta, body_path.read_bytes()
+        except (OSError, ValueError, KeyError):
+            # 缓存缺失或损坏都按未命中处理
+            return None
+
+    def put(self, url, response):
+        """保存带有校验信息的200响应"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+
+        body = response.content
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'headers': dict(_body_headers(response.headers, body)),
+            'size': len(body)
+        }
+        meta_path, body_path = self._paths(url)
+        # 先写响应体再写元数据，元数据存在时响应体一定完整
+        atomic_write(body_path, body)
+        atomic_write(meta_path, json.dumps(meta, ensure_ascii=False))
+
+        self._count('stored')
+        with self._lock:
+            self._load_index()
+            self._index_add(meta_path, meta['stored_at'], meta['size'])
+            over_budget = self._total > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def refresh(self, url):
+        """304确认内容未变后，重置条目的TTL计时"""
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            meta['stored_at'] = time.time()
+            atomic_write(meta_path, json.dumps(meta, ensure_ascii=False))
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            if self._index is not None and meta_path in self._index:
+                self._index[meta_path] = (meta['stored_at'], self._index[meta_path][1])
+
+    def _remove(self, meta_path, body_path):
+        for path in (meta_path, body_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            if self._index is not None and meta_path in self._index:
+                self._total -= self._index.pop(meta_path)[1]
+
+    def _load_index(self):
+        """首次使用时扫描缓存目录建立大小索引（调用方持有锁）"""
+        if self._index is not None:
+            return
+        self._index = {}
+        self._total = 0
+        for meta_path in self.cache_dir.glob('*.json'):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            self._index_add(meta_path, meta.get('stored_at', 0), meta.get('size', 0))
+
+    def _index_add(self, meta_path, stored_at, size):
+        previous = self._index.get(meta_path)
+        if previous is not None:
+            self._total -= previous[1]
+        self._index[meta_path] = (stored_at, size)
+        self._total += size
+
+    def evict(self):
+        """缓存总大小超过上限时，按存储时间从旧到新淘汰"""
+        with self._lock:
+            self._load_index()
+            if self._total <= self.max_bytes:
+                return
+            entries = sorted((stored_at, meta_path) for meta_path, (stored_at, _) in self._index.items())
+
+        for _, meta_path in entries:
+            with self._lock:
+                if self._total <= self.max_bytes:
+                    break
+            self._remove(meta_path, meta_path.with_suffix('.body'))
+            self._count('evicted')
+
+    def summary(self):
+        """缓存命中情况的单行描述，用于运行日志"""
+        return (f"命中 {self.stats['hits']} / 未命中 {self.stats['misses']}"
+                f" / 新存储 {self.stats['stored']} / 淘汰 {self.stats['evicted']}")
+
+
+class CachingAdapter(HTTPAdapter):
+    """为GET请求自动附加条件请求头，并在304时用缓存内容还原完整响应"""
+
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        cached = self.cache.get(request.url)
+        if cached:
+            meta, _ = cached
+            if meta.get('etag'):
+                request.headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request.headers['If-Modified-Since'] = meta['last_modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached:
+            meta, body = cached
+            response.content  # 读完空响应体，把连接归还连接池
+            headers = CaseInsensitiveDict(meta['headers'])
+            headers.update(response.headers)
+            response.status_code = 200
+            # 旧版本缓存的条目可能仍带有上游的编码头，还原时同样按解码后的响应体重写
+            response.headers = _body_headers(headers, body)
+            response._content = body
+            response.from_cache = True
+            self.cache.refresh(request.url)
+            self.cache._count('hits')
+        else:
+            response.from_cache = False
+            self.cache._count('misses')
+            if response.status_code == 200 and not kwargs.get('stream'):
+                self.cache.put(request.url, response)
+
+        return response
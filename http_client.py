@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+共享的异步HTTP抓取层
+基于asyncio调度、requests连接池执行请求，提供按主机的并发上限、
+令牌桶限速和统一超时，替代抓取脚本中固定的 time.sleep 间隔；
+重试、熔断和运行截止时间由 resilience.py 提供
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import CachingAdapter
+from metrics import metrics
+from resilience import resilience as shared_resilience
+
+
+class TokenBucket:
+    """令牌桶限速器：rate为每秒补充的令牌数，capacity为允许的突发请求数"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self):
+        """尝试取出一个令牌，返回需要等待的秒数（0表示已取得）"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        """等待直到取得一个令牌"""
+        while True:
+            wait = self._try_take()
+            if not wait:
+                return
+            metrics.incr('http.rate_limit_wait_seconds', wait)
+            await asyncio.sleep(wait)
+
+
+class AsyncFetcher:
+    """并发HTTP抓取客户端，同一主机的请求共享keep-alive连接池"""
+
+    def __init__(self, session=None, per_host_limit=4, timeout=10, rate_limits=None, cache=None,
+                 connect_timeout=3.05, resilience=None):
+        self.session = session or requests.Session()
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        # 连接超时单独设短：无响应的主机几秒内失败，不必等满读取超时
+        self.connect_timeout = connect_timeout
+        # 默认使用模块级共享实例，同一次运行中所有抓取器共用熔断状态和截止时间
+        self.resilience = resilience or shared_resilience
+        # {主机名: TokenBucket}，未配置的主机不限速
+        self.rate_limits = dict(rate_limits or {})
+        self.cache = cache
+
+        # 连接池大小与并发上限一致，保证并发请求都能复用keep-alive连接；
+        # 传入HTTPCache时，会话上的所有GET请求都透明地走条件请求缓存
+        if cache is not None:
+            adapter = CachingAdapter(cache, pool_connections=8, pool_maxsize=per_host_limit)
+        else:
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=per_host_limit)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # 信号量绑定在事件循环上，每个循环各自维护一份
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _host_semaphore(self, host):
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphores[host]
+
+    async def fetch(self, url, params=None, headers=None):
+        """异步GET请求，返回requests.Response
+
+        连接错误、超时和可重试的状态码按退避策略重试；重试用完后返回最后一次响应，
+        或抛出最后一次异常。主机熔断或运行时限已到时抛出异常，不发出请求
+        """
+        host = urlsplit(url).hostname or ''
+        resilience = self.resilience
+        breaker = resilience.breaker(host)
+        attempt = 0
+        while True:
+            resilience.before_request(host)
+            response, error = None, None
+            try:
+                async with self._host_semaphore(host):
+                    bucket = self.rate_limits.get(host)
+                    if bucket:
+                        await bucket.acquire()
+                    timeout = resilience.request_timeout(self.timeout)
+                    start = time.perf_counter()
+                    try:
+                        response = await asyncio.to_thread(
+                            self.session.get, url, params=params, headers=headers,
+                            timeout=(min(self.connect_timeout, timeout), timeout)
+                        )
+                    except (requests.ConnectionError, requests.Timeout) as e:
+                        error = e
+                    except Exception:
+                        metrics.incr('http.errors')
+                        breaker.record_failure()
+                        raise
+            except asyncio.CancelledError:
+                # 被取消的请求没有结果，若它是半开状态的试探请求，需要释放试探资格
+                breaker.cancel_probe()
+                raise
+
+            if error is not None:
+                metrics.incr('http.errors')
+                breaker.record_failure()
+                delay = resilience.backoff(attempt)
+                if delay is None:
+                    raise error
+            else:
+                metrics.http(host, response.status_code, time.perf_counter() - start,
+                             len(response.content), getattr(response, 'from_cache', False))
+                if response.status_code not in resilience.policy.retry_statuses:
+                    breaker.record_success()
+                    return response
+                # 429说明主机可用，只是限流，不计入熔断
+                if response.status_code == 429:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                delay = resilience.backoff(attempt, response)
+                if delay is None:
+                    return response
+
+            metrics.incr('http.retries')
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _gather(self, requests_list):
+        tasks = [self.fetch(**request) for request in requests_list]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def fetch_all(self, requests_list):
+        """并发执行一组请求
+
+        requests_list 中每项为 fetch() 的关键字参数字典。
+        返回与输入顺序一致的列表，元素为 Response 或请求时抛出的异常
+        """
+        if not requests_list:
+            return []
+        return asyncio.run(self._gather(requests_list))
+
+    def get(self, url, params=None, headers=None):
+        """同步获取单个URL，请求失败时抛出异常"""
+        result = self.fetch_all([{'url': url, 'params': params, 'headers': headers}])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+if __name__ == "__main__":
+    # 本地桩服务器演示：每个请求延迟0.5秒，5个并发请求总耗时应接近单个请求
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(0.5)
+            body = b'ok'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    fetcher = AsyncFetcher(per_host_limit=5, rate_limits={'127.0.0.1': TokenBucket(rate=20, capacity=5)})
+    start = time.perf_counter()
+    results = fetcher.fetch_all([{'url': f"{base_url}/item/{i}"} for i in range(5)])
+    elapsed = time.perf_counter() - start
+
+    print(f"📡 {len(results)} 个请求完成，状态码 {[r.status_code for r in results]}，总耗时 {elapsed:.2f}s")
+    server.shutdown()
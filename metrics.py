@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+轻量级运行指标采集
+为抓取和处理流程提供计时区间、计数器和HTTP请求统计，运行结束后以JSON Lines
+格式写入 data/run_metrics.jsonl。未启用时各接口只做一次布尔判断，几乎没有开销。
+设置环境变量 DASHBOARD_METRICS=1 或在编排脚本中传入 --metrics 以启用
+"""
+
+import contextlib
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Metrics:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.run_id = datetime.datetime.now().strftime('%Y%m%dT%H%M%S')
+        self.records = []
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def reset(self):
+        """清空已采集的指标并开始新的一次运行（常驻服务每轮调用）"""
+        with self._lock:
+            self.run_id = datetime.datetime.now().strftime('%Y%m%dT%H%M%S')
+            self.records = []
+            self.counters = {}
+
+    def _record(self, record):
+        record['run_id'] = self.run_id
+        with self._lock:
+            self.records.append(record)
+
+    @contextlib.contextmanager
+    def _span(self, name, labels):
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record({
+                'type': 'span',
+                'name': name,
+                'seconds': round(time.perf_counter() - start, 6),
+                'started_at': started_at,
+                'thread': threading.current_thread().name,
+                **labels
+            })
+
+    def span(self, name, **labels):
+        """计时区间上下文管理器"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, labels)
+
+    def timed(self, name):
+        """为函数或方法整体计时的装饰器"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._span(name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def incr(self, name, value=1):
+        """累加计数器"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def items(self, stage, count):
+        """记录某个阶段产出的记录条数"""
+        if not self.enabled:
+            return
+        self._record({'type': 'items', 'name': stage, 'count': count})
+
+    def http(self, host, status, seconds, nbytes, from_cache=False):
+        """记录一次HTTP请求的状态、延迟和响应体大小"""
+        if not self.enabled:
+            return
+        self._record({
+            'type': 'http',
+            'name': host,
+            'status': status,
+            'seconds': round(seconds, 6),
+            'bytes': nbytes,
+            'from_cache': from_cache
+        })
+        self.incr('http.requests')
+        self.incr('http.bytes', nbytes)
+
+    def summary(self):
+        """按名称汇总计时区间：次数、总耗时和最大耗时"""
+        spans = {}
+        for record in self.records:
+            if record['type'] in ('span', 'http'):
+                key = f"{record['type']}:{record['name']}"
+                stat = spans.setdefault(key, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+                stat['count'] += 1
+                stat['total_seconds'] += record['seconds']
+                stat['max_seconds'] = max(stat['max_seconds'], record['seconds'])
+        return spans
+
+    def export(self, path="data/run_metrics.jsonl", append=False):
+        """将本次运行的全部指标写入JSON Lines文件，并打印最耗时的区间；append为True时追加到文件末尾"""
+        if not self.enabled:
+            return
+
+        summary = self.summary()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a' if append else 'w', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.write(json.dumps({
+                'type': 'summary',
+                'run_id': self.run_id,
+                'spans': summary,
+                'counters': self.counters
+            }, ensure_ascii=False) + '\n')
+
+        print("📏 耗时最多的阶段:")
+        ranked = sorted(summary.items(), key=lambda kv: kv[1]['total_seconds'], reverse=True)
+        for name, stat in ranked[:8]:
+            print(f"   {name:<48} {stat['count']:>4}次 {stat['total_seconds']:8.3f}s")
+        print(f"📁 运行指标已保存到 {path}")
+
+    def flush(self, path="data/run_metrics.jsonl"):
+        """追加导出本轮的指标后清空，长期运行时内存占用不随轮数增长；本轮没有指标时不写入"""
+        if not self.enabled or not (self.records or self.counters):
+            return
+        self.export(path, append=True)
+        self.reset()
+
+
+metrics = Metrics(enabled=os.environ.get('DASHBOARD_METRICS') == '1')
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+多受众配置（profile）
+每个配置可以覆盖排序规则（地区、类别优先级等）和各分区的选取条数，处理器为每个配置输出
+dashboard_data.<配置名>.json。输入只加载和去重一次；排序键按不同的规则各算一次，
+规则相同、只有条数不同的配置共用同一份打分结果，每个配置只重复最后的选取。
+总工作量（打分和选取的条数）足以抵消进程池开销且有多个CPU时，按“分区 × 排序规则”分组交给进程池并行处理。
+"""
+
+import copy
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ranking import Ranking, compile_key, load_ranking
+from records import NewsItem, OpportunityItem, ToolItem
+from selection import DiversityTopK
+
+DEFAULT_PROFILES_FILE = Path(__file__).with_name('profiles.json')
+
+# 各分区的记录类型
+RECORD_TYPES = {
+    'environmental_news': NewsItem,
+    'ai_tools': ToolItem,
+    'opportunities': OpportunityItem
+}
+
+# 各分区默认选取的条数：新闻6条、工具5个、机会6个
+DEFAULT_LIMITS = {'environmental_news': 6, 'ai_tools': 5, 'opportunities': 6}
+
+# 进程池的开销模型（python benchmark.py profiles 实测）：打分和选取每条约0.85微秒；
+# 进程池固定开销约20毫秒，另外每条输入约2.2微秒（工作进程继承并遍历输入）
+SELECT_SECONDS_PER_ITEM = 0.85e-6
+POOL_STARTUP_SECONDS = 0.02
+POOL_SECONDS_PER_ITEM = 2.2e-6
+
+_PROFILE_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def build_selector(section, sort_key, limit, descending=False, group_key=None):
+    """分区的选取规则：新闻直接取最优limit条；工具和机会前3项自由入选，之后每个类别/类型只再选一项"""
+    if section == 'environmental_news':
+        return DiversityTopK(limit, sort_key, reverse=descending)
+    return DiversityTopK(limit, sort_key, group_key=group_key, free_picks=3, group_cap=1, reverse=descending)
+
+
+class Profile:
+    """一个受众配置：名称、完整的排序规则和各分区的选取条数"""
+
+    def __init__(self, name, ranking, limits=None):
+        if not _PROFILE_NAME.match(name):
+            raise ValueError(f"配置名只能包含字母、数字、下划线和连字符: {name!r}")
+        self.name = name
+        self.ranking = ranking
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+
+    @classmethod
+    def from_config(cls, config, base_ranking):
+        """由配置字典构造，未指定的部分沿用 base_ranking
+
+        {"name": 配置名,
+         "region": ["悉尼", "NSW"],            机会按地点包含任一关键词优先（替换location规则的contains）
+         "ranking": {分区: 规则} 或 规则文件路径,  按分区整体替换排序规则
+         "limits": {分区: 条数}}
+        """
+        ranking_config = copy.deepcopy(base_ranking.config)
+        overrides = config.get('ranking', {})
+        if isinstance(overrides, str):
+            with open(overrides, 'r', encoding='utf-8') as f:
+                overrides = json.load(f)
+        ranking_config.update(copy.deepcopy(overrides))
+
+        region = config.get('region')
+        if region is not None:
+            terms = [term for term in ranking_config['opportunities']['keys']
+                     if term.get('field') == 'location' and 'contains' in term]
+            if not terms:
+                raise ValueError(f"配置 {config['name']} 指定了region，但机会的排序规则中没有location规则")
+            for term in terms:
+                term['contains'] = [region] if isinstance(region, str) else list(region)
+
+        unknown = set(config.get('limits', {})) - set(DEFAULT_LIMITS)
+        if unknown:
+            raise ValueError(f"配置 {config['name']} 中有未知的分区: {', '.join(sorted(unknown))}")
+        return cls(config['name'], Ranking(ranking_config), config.get('limits'))
+
+    def __repr__(self):
+        return f"Profile({self.name!r}, limits={self.limits})"
+
+
+def load_profiles(path=None, base_ranking=None):
+    """读取配置文件（JSON列表），默认使用仓库根目录的 profiles.json"""
+    path = Path(path or DEFAULT_PROFILES_FILE)
+    with open(path, 'r', encoding='utf-8') as f:
+        configs = json.load(f)
+    base_ranking = base_ranking or load_ranking()
+    profiles = [Profile.from_config(config, base_ranking) for config in configs]
+    names = [profile.name for profile in profiles]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"配置名重复: {', '.join(sorted(duplicates))}")
+    return profiles
+
+
+def scoring_groups(profiles, sections):
+    """按（分区, 排序规则）分组，返回 [(分区, 规则, {配置名: 条数})]；规则相同的配置只打分一次"""
+    groups = {}
+    for profile in profiles:
+        for section in sections:
+            spec = profile.ranking.config[section]
+            signature = (section, json.dumps(spec, ensure_ascii=False, sort_keys=True))
+            if signature not in groups:
+                groups[signature] = (section, spec, {})
+            groups[signature][2][profile.name] = profile.limits[section]
+    return list(groups.values())
+
+
+class SharedSections:
+    """各分区去重后的输入，类别只计算一次，所有配置共用"""
+
+    def __init__(self, items):
+        self.items = items
+        self._groups = {}
+
+    def groups(self, section):
+        """分区中各项的类别"""
+        if section not in self._groups:
+            self._groups[section] = list(map(RECORD_TYPES[section].group_of, self.items[section]))
+        return self._groups[section]
+
+    def select(self, section, spec, limits):
+        """按一套排序规则打分一次，再为每个配置各选取一次，返回 {配置名: 选取结果}"""
+        items = self.items[section]
+        record_type = RECORD_TYPES[section]
+        groups = self.groups(section)
+        ranks = list(map(compile_key(spec['keys'], name=f"{section}_rank_key"), items))
+        descending = spec.get('order', 'asc') == 'desc'
+
+        # 选取在下标上进行，打分结果无需为每个配置复制；只为入选的项构造记录
+        results = {}
+        for name, limit in limits.items():
+            selector = build_selector(section, ranks.__getitem__, limit, descending, groups.__getitem__)
+            results[name] = [record_type(**items[index]).to_dict() for index in selector.select(range(len(items)))]
+        return results
+
+
+# 进程池中每个工作进程持有一份共享输入，通过初始化函数传入一次，不随每个任务重复序列化
+_worker_sections = None
+
+
+def _init_worker(items):
+    global _worker_sections
+    _worker_sections = SharedSections(items)
+
+
+def _select_in_worker(section, spec, limits):
+    return _worker_sections.select(section, spec, limits)
+
+
+def _available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def should_use_pool(groups, items, max_workers=None):
+    """按总工作量估算并行节省的时间是否超过进程池的开销
+
+    每个分组打分一次、每个配置再选取一次，工作量为各分组的条数 ×（1 + 配置数）；
+    只有一个CPU或一个分组时进程池不会更快
+    """
+    workers = min(max_workers or _available_cpus(), len(groups))
+    if workers < 2:
+        return False
+    work = sum(len(items[section]) * (1 + len(limits)) for section, _, limits in groups)
+    saved = work * SELECT_SECONDS_PER_ITEM * (1 - 1 / workers)
+    overhead = POOL_STARTUP_SECONDS + POOL_SECONDS_PER_ITEM * sum(map(len, items.values()))
+    return saved > overhead
+
+
+def select_profiles(profiles, items, max_workers=None, use_pool=None):
+    """为所有配置选取各分区的结果，返回 {配置名: {分区: 选取结果}}
+
+    items 为 {分区: 去重后的字典列表}；use_pool 为None时由 should_use_pool 决定是否使用进程池
+    """
+    groups = scoring_groups(profiles, list(items))
+    results = {profile.name: {} for profile in profiles}
+
+    if use_pool is None:
+        use_pool = should_use_pool(groups, items, max_workers)
+    if use_pool:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(items,)) as pool:
+            futures = [(section, pool.submit(_select_in_worker, section, spec, limits))
+                       for section, spec, limits in groups]
+            outcomes = [(section, future.result()) for section, future in futures]
+    else:
+        shared = SharedSections(items)
+        outcomes = [(section, shared.select(section, spec, limits)) for section, spec, limits in groups]
+
+    for section, selected in outcomes:
+        for name, section_items in selected.items():
+            results[name][section] = section_items
+    return results
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+排序规则引擎
+从 ranking.json 读取各分区的排序规则，编译为与手写代码等价的排序键函数；
+修改优先级、权重或地点规则只需改配置，不必改动处理器代码。
+用法:
+  python ranking.py show [ranking.json]
+  python ranking.py compare ranking.json 候选规则.json [--data-dir data]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+from pathlib import Path
+
+DEFAULT_RANKING_FILE = Path(__file__).with_name('ranking.json')
+
+# 对比时用于标识记录的字段
+TITLE_FIELDS = {'environmental_news': 'title', 'ai_tools': 'name', 'opportunities': 'title'}
+
+
+def _contains_any(value, needles):
+    return any(needle in value for needle in needles)
+
+
+def _literal(namespace, value):
+    """标量直接写入生成的代码，其他值放入函数的全局命名空间"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return repr(value)
+    name = f"_c{len(namespace)}"
+    namespace[name] = value
+    return name
+
+
+def _compile_term(term, namespace):
+    """将一条排序规则编译为表达式源码
+
+    支持的规则:
+      {"field", "missing"}                               字段原值
+      {"field", "missing", "priority", "default"}        按取值映射为优先级
+      {"field", "missing", "contains", "match", "default"}  包含任一子串时为match，否则为default
+      {"score": [{...规则, "weight": 权重}, ...]}         多个数值规则的加权和
+    """
+    if 'score' in term:
+        parts = [
+            f"{_literal(namespace, part.get('weight', 1))} * {_compile_term(part, namespace)}"
+            for part in term['score']
+        ]
+        if not parts:
+            raise ValueError(f"加权规则为空: {term}")
+        return '(' + ' + '.join(parts) + ')'
+
+    field = term.get('field')
+    if not isinstance(field, str):
+        raise ValueError(f"排序规则缺少字段名: {term}")
+    if 'priority' in term and 'contains' in term:
+        raise ValueError(f"排序规则不能同时使用priority和contains: {term}")
+
+    value = f"get({_literal(namespace, field)}, {_literal(namespace, term.get('missing', ''))})"
+    if 'priority' in term:
+        priority = _literal(namespace, dict(term['priority']))
+        return f"{priority}.get({value}, {_literal(namespace, term.get('default'))})"
+    if 'contains' in term:
+        needles = term['contains']
+        if isinstance(needles, str):
+            needles = [needles]
+        if len(needles) == 1:
+            test = f"{_literal(namespace, needles[0])} in {value}"
+        else:
+            test = f"_contains_any({value}, {_literal(namespace, tuple(needles))})"
+        match = _literal(namespace, term.get('match', 0))
+        return f"({match} if {test} else {_literal(namespace, term.get('default', 1))})"
+    return value
+
+
+def compile_key(terms, name='rank_key'):
+    """将规则列表编译为排序键函数，参数可以是字典或记录（任何提供get的对象）"""
+    namespace = {'_contains_any': _contains_any}
+    parts = [_compile_term(term, namespace) for term in terms]
+    if not parts:
+        raise ValueError("排序规则为空")
+    trailing = ',' if len(parts) == 1 else ''
+    source = f"def {name}(item):\n    get = item.get\n    return ({', '.join(parts)}{trailing})\n"
+    exec(source, namespace)
+    key = namespace[name]
+    key.source = source
+    return key
+
+
+class Ranking:
+    def __init__(self, config, path=None):
+        self.config = config
+        self.path = path
+        # 规则内容的哈希，写入增量清单，规则变化时旧的分区缓存失效
+        encoded = json.dumps(config, ensure_ascii=False, sort_keys=True)
+        self.digest = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+        self.keys = {}
+        for section, spec in config.items():
+            if spec.get('order', 'asc') not in ('asc', 'desc'):
+                raise ValueError(f"{section} 的排序方向必须是asc或desc")
+            self.keys[section] = compile_key(spec['keys'], name=f"{section}_rank_key")
+
+    def key(self, section):
+        return self.keys[section]
+
+    def descending(self, section):
+        return self.config[section].get('order', 'asc') == 'desc'
+
+
+def load_ranking(path=None):
+    """读取排序规则配置，默认使用仓库根目录的 ranking.json"""
+    path = Path(path or DEFAULT_RANKING_FILE)
+    with open(path, 'r', encoding='utf-8') as f:
+        return Ranking(json.load(f), path)
+
+
+def rank_sections(ranking, data_dir):
+    """用指定规则处理data_dir中的输入，只返回各分区的选取结果，不写入任何文件"""
+    from data_processor import DashboardDataProcessor
+
+    processor = DashboardDataProcessor(incremental=False, ranking=ranking)
+    processor.data_dir = Path(data_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.process_environmental_news()
+        processor.process_ai_tools()
+        processor.process_opportunities()
+    return {section: processor.final_data[section] for section in TITLE_FIELDS}
+
+
+def compare_rankings(path_a, path_b, data_dir="data"):
+    """A/B对比两套规则在同一份输入上的选取结果"""
+    results_a = rank_sections(load_ranking(path_a), data_dir)
+    results_b = rank_sections(load_ranking(path_b), data_dir)
+
+    for section, field in TITLE_FIELDS.items():
+        titles_a = [item.get(field, '') for item in results_a[section]]
+        titles_b = [item.get(field, '') for item in results_b[section]]
+        if titles_a == titles_b:
+            print(f"✅ {section}: 两套规则的选取结果一致")
+            continue
+
+        print(f"🔀 {section}: A={path_a}  B={path_b}")
+        for position in range(max(len(titles_a), len(titles_b))):
+            a = titles_a[position] if position < len(titles_a) else ''
+            b = titles_b[position] if position < len(titles_b) else ''
+            marker = ' ' if a == b else '≠'
+            print(f"   {position + 1:>2} {marker} {a[:36]:<36} | {b[:36]}")
+        dropped = set(titles_a) - set(titles_b)
+        added = set(titles_b) - set(titles_a)
+        if dropped:
+            print(f"   仅A入选: {', '.join(sorted(dropped))}")
+        if added:
+            print(f"   仅B入选: {', '.join(sorted(added))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="仪表盘排序规则工具")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    show_parser = subparsers.add_parser('show', help='打印规则编译后的排序键函数')
+    show_parser.add_argument('path', nargs='?')
+
+    compare_parser = subparsers.add_parser('compare', help='A/B对比两套规则的选取结果')
+    compare_parser.add_argument('path_a')
+    compare_parser.add_argument('path_b')
+    compare_parser.add_argument('--data-dir', default='data')
+
+    args = parser.parse_args()
+    if args.command == 'show':
+        ranking = load_ranking(args.path)
+        for section, key in ranking.keys.items():
+            order = '降序' if ranking.descending(section) else '升序'
+            print(f"# {section} ({order})")
+            print(key.source)
+    elif args.command == 'compare':
+        compare_rankings(args.path_a, args.path_b, args.data_dir)
+
+
+if __name__ == "__main__":
+    main()
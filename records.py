@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+仪表盘记录类型
+新闻、工具和机会的带 __slots__ 的紧凑记录，按规范字段顺序输出JSON字典。
+记录只用于输出：选择阶段直接在输入字典上计算排序键（由 ranking.py 编译的规则）和类别，
+只为最终入选的少数项构造记录；逐条转换全部输入比直接读取字典更慢，节省的内存也有限
+"""
+
+class _Missing:
+    """字段在输入中不存在的标记，与值为None的字段区分"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __bool__(self):
+        return False
+
+
+MISSING = _Missing()
+
+
+class Record:
+    """记录基类：FIELDS为规范字段顺序，其余字段原样保存在extra中
+
+    记录只用于输出：选择阶段直接在输入字典上计算排序键和类别，
+    子类的 __init__ 以关键字参数接收入选项的各字段，缺失的字段为MISSING
+    """
+    __slots__ = ('extra',)
+    FIELDS = ()
+    # 多样性约束使用的类别取自的字段，缺失时为'other'
+    GROUP_FIELD = None
+
+    @classmethod
+    def group_of(cls, data):
+        """输入字典的类别"""
+        return data.get(cls.GROUP_FIELD, 'other')
+
+    def to_dict(self):
+        """按规范字段顺序转换为JSON字典，输入中不存在的字段不输出"""
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not MISSING:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class NewsItem(Record):
+    FIELDS = ('title', 'description', 'source', 'date', 'category', 'link', 'urgency')
+    __slots__ = FIELDS
+
+    def __init__(self, /, title=MISSING, description=MISSING, source=MISSING, date=MISSING,
+                 category=MISSING, link=MISSING, urgency=MISSING, **extra):
+        self.title = title
+        self.description = description
+        self.source = source
+        self.date = date
+        self.category = category
+        self.link = link
+        self.urgency = urgency
+        self.extra = extra or None
+
+
+class ToolItem(Record):
+    FIELDS = ('name', 'summary', 'usefulness', 'technical', 'category', 'difficulty', 'link', 'stars')
+    __slots__ = FIELDS
+    GROUP_FIELD = 'category'
+
+    def __init__(self, /, name=MISSING, summary=MISSING, usefulness=MISSING, technical=MISSING,
+                 category=MISSING, difficulty=MISSING, link=MISSING, stars=MISSING, **extra):
+        self.name = name
+        self.summary = summary
+        self.usefulness = usefulness
+        self.technical = technical
+        self.category = category
+        self.difficulty = difficulty
+        self.link = link
+        self.stars = stars
+        self.extra = extra or None
+
+
+class OpportunityItem(Record):
+    FIELDS = ('title', 'description', 'organization', 'location', 'type', 'commitment',
+              'skills', 'benefits', 'contact', 'link', 'deadline', 'requirements')
+    __slots__ = FIELDS
+    GROUP_FIELD = 'type'
+
+    def __init__(self, /, title=MISSING, description=MISSING, organization=MISSING, location=MISSING,
+                 type=MISSING, commitment=MISSING, skills=MISSING, benefits=MISSING, contact=MISSING,
+                 link=MISSING, deadline=MISSING, requirements=MISSING, **extra):
+        self.title = title
+        self.description = description
+        self.organization = organization
+        self.location = location
+        self.type = type
+        self.commitment = commitment
+        self.skills = skills
+        self.benefits = benefits
+        self.contact = contact
+        self.link = link
+        self.deadline = deadline
+        self.requirements = requirements
+        self.extra = extra or None
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+摘要报告渲染引擎
+报告模板在加载时编译为Python函数（与 ranking.py 的排序键相同的做法），渲染时把片段
+直接写入输出文件，不在内存中拼接整篇报告。一次遍历 final_data 同时输出Markdown、HTML
+和纯文本邮件摘要，每个分区输出的条数可配置；记录缺少的字段显示为占位符，不会抛出KeyError
+"""
+
+import datetime
+import html
+from itertools import islice
+from string import Formatter
+
+from atomic_io import AtomicWriter
+
+# 各分区默认输出的条数，None表示全部输出
+DEFAULT_COUNTS = {'environmental_news': 3, 'ai_tools': 2, 'opportunities': 2}
+
+# 记录缺少字段时显示的内容
+MISSING_TEXT = '—'
+
+
+def _text(value):
+    return value if isinstance(value, str) else str(value)
+
+
+def compile_template(template, name='render', escape=None, missing=MISSING_TEXT):
+    """将 str.format 风格的模板编译为 render(fields, write) 函数
+
+    {字段} 取 fields.get(字段)，缺失时为missing；格式说明按 format() 处理（如 {description:.150}
+    截取前150个字符）；escape 作用于每个字段值（HTML格式用于转义），不作用于模板本身的文字
+    """
+    namespace = {'_escape': escape, '_text': _text}
+    lines = [f"def {name}(fields, write):", "    get = fields.get"]
+    pieces = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        pieces.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        if not field or conversion:
+            raise ValueError(f"模板字段必须有名称且不支持转换: {template!r}")
+        var = f"v{len(lines) - 2}"
+        value = f"get({field!r}, {missing!r})"
+        if escape:
+            # 先截取再转义，避免截断实体
+            if spec:
+                value = f"format(_text({value}), {spec!r})"
+            lines.append(f"    {var} = _escape({value})")
+            pieces.append(f"{{{var}}}")
+        else:
+            lines.append(f"    {var} = {value}")
+            pieces.append(f"{{_text({var}):{spec}}}" if spec else f"{{{var}}}")
+    # 整个模板编译为一个f-string，每次渲染只调用一次write
+    lines.append(f"    write(f{''.join(pieces)!r})")
+    source = '\n'.join(lines) + '\n'
+    exec(source, namespace)
+    render = namespace[name]
+    render.source = source
+    return render
+
+
+class ReportFormat:
+    """一种输出格式：文件后缀、页眉/页脚模板、各分区的标题和条目模板"""
+
+    def __init__(self, suffix, header, footer, sections, escape=None):
+        self.suffix = suffix
+        self.header = compile_template(header, 'header', escape)
+        self.footer = compile_template(footer, 'footer', escape)
+        self.sections = {
+            section: (compile_template(heading, f"{section}_heading", escape),
+                      compile_template(item, f"{section}_item", escape))
+            for section, (heading, item) in sections.items()
+        }
+
+
+MARKDOWN = ReportFormat(
+    suffix='md',
+    header="""# 环境科学每日摘要报告
+
+**生成时间**: {current_date} {generated_time}
+
+## 📊 数据统计
+- 环境科学新闻: {news_count} 条
+- AI工具推荐: {tools_count} 个  
+- 实践机会: {opportunities_count} 个
+- 总计: {total_items} 条记录
+
+""",
+    sections={
+        'environmental_news': ("## 🌳 今日环境科学亮点\n", """
+### {index}. {title}
+- **来源**: {source}
+- **类别**: {category} 
+- **紧急程度**: {urgency}
+- **摘要**: {description:.150}...
+- **链接**: {link}
+"""),
+        'ai_tools': ("\n\n## 🚀 推荐工具亮点\n", """
+### {index}. {name} ({category} - {difficulty})
+- **功能**: {summary}
+- **实用性**: {usefulness:.200}...
+- **链接**: {link}
+"""),
+        'opportunities': ("\n\n## 💼 热门实践机会\n", """
+### {index}. {title} ({type})
+- **机构**: {organization}
+- **地点**: {location}
+- **承诺**: {commitment}
+- **联系**: {contact}
+"""),
+    },
+    footer="""
+
+---
+*本报告由自动化系统生成 | 下次更新: {next_update}*
+*数据来源: {data_sources}*
+""",
+)
+
+HTML = ReportFormat(
+    suffix='html',
+    escape=lambda value: html.escape(_text(value)),
+    header="""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<title>环境科学每日摘要报告 - {current_date}</title>
+</head>
+<body>
+<h1>环境科学每日摘要报告</h1>
+<p><strong>生成时间</strong>: {current_date} {generated_time}</p>
+<h2>📊 数据统计</h2>
+<ul>
+<li>环境科学新闻: {news_count} 条</li>
+<li>AI工具推荐: {tools_count} 个</li>
+<li>实践机会: {opportunities_count} 个</li>
+<li>总计: {total_items} 条记录</li>
+</ul>
+""",
+    sections={
+        'environmental_news': ("<h2>🌳 今日环境科学亮点</h2>\n", """<article>
+<h3>{index}. <a href="{link}">{title}</a></h3>
+<p>{source} · {category} · 紧急程度 {urgency}</p>
+<p>{description:.150}…</p>
+</article>
+"""),
+        'ai_tools': ("<h2>🚀 推荐工具亮点</h2>\n", """<article>
+<h3>{index}. <a href="{link}">{name}</a> ({category} - {difficulty})</h3>
+<p>{summary}</p>
+<p>{usefulness:.200}…</p>
+</article>
+"""),
+        'opportunities': ("<h2>💼 热门实践机会</h2>\n", """<article>
+<h3>{index}. {title} ({type})</h3>
+<ul>
+<li>机构: {organization}</li>
+<li>地点: {location}</li>
+<li>承诺: {commitment}</li>
+<li>联系: {contact}</li>
+</ul>
+</article>
+"""),
+    },
+    footer="""<hr>
+<p><em>本报告由自动化系统生成 | 下次更新: {next_update}</em><br>
+<em>数据来源: {data_sources}</em></p>
+</body>
+</html>
+""",
+)
+
+TEXT = ReportFormat(
+    suffix='txt',
+    header="""环境科学每日摘要 - {current_date} {generated_time}
+
+新闻 {news_count} 条 | 工具 {tools_count} 个 | 机会 {opportunities_count} 个 | 总计 {total_items} 条
+""",
+    sections={
+        'environmental_news': ("\n== 今日环境科学亮点 ==\n", """
+{index}. {title}
+   {source} / {category} / 紧急程度: {urgency}
+   {description:.150}...
+   {link}
+"""),
+        'ai_tools': ("\n== 推荐工具 ==\n", """
+{index}. {name} ({category} - {difficulty})
+   {summary}
+   {link}
+"""),
+        'opportunities': ("\n== 实践机会 ==\n", """
+{index}. {title} ({type})
+   {organization} - {location}
+   {commitment}
+   联系: {contact}
+"""),
+    },
+    footer="""
+--
+本邮件由自动化系统生成，下次更新: {next_update}
+数据来源: {data_sources}
+""",
+)
+
+FORMATS = {fmt.suffix: fmt for fmt in (MARKDOWN, HTML, TEXT)}
+
+
+def report_context(final_data):
+    """页眉/页脚模板使用的字段；使用本次数据的时间戳，数据未变化时报告内容也保持不变"""
+    metadata = final_data.get('metadata', {})
+    last_updated = final_data.get('last_updated')
+    return {
+        'current_date': final_data.get('current_date', MISSING_TEXT),
+        'generated_time': (datetime.datetime.fromisoformat(last_updated).strftime('%H:%M AEST')
+                           if last_updated else MISSING_TEXT),
+        'news_count': len(final_data.get('environmental_news', [])),
+        'tools_count': len(final_data.get('ai_tools', [])),
+        'opportunities_count': len(final_data.get('opportunities', [])),
+        'total_items': metadata.get('total_items', MISSING_TEXT),
+        'next_update': metadata.get('next_update', MISSING_TEXT),
+        'data_sources': ', '.join(metadata.get('data_sources', [])),
+    }
+
+
+class ReportRenderer:
+    def __init__(self, formats=('md',), counts=None):
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"未知的报告格式: {', '.join(sorted(unknown))}（可选: {', '.join(FORMATS)}）")
+        self.formats = [FORMATS[name] for name in formats]
+        counts = counts or {}
+        unknown = set(counts) - set(DEFAULT_COUNTS)
+        if unknown:
+            raise ValueError(f"未知的报告分区: {', '.join(sorted(unknown))}（可选: {', '.join(DEFAULT_COUNTS)}）")
+        invalid = [section for section, count in counts.items()
+                   if count is not None and (not isinstance(count, int) or count < 0)]
+        if invalid:
+            raise ValueError(f"报告条数必须为非负整数: {', '.join(f'{s}={counts[s]!r}' for s in invalid)}")
+        self.counts = dict(DEFAULT_COUNTS, **counts)
+
+    def render(self, final_data, output_dir, basename='daily_summary'):
+        """一次遍历 final_data，将各格式分别流式写入 output_dir/basename.<后缀>
+
+        返回 {输出路径: 是否有变化}；内容与现有文件相同时不改动文件
+        """
+        writers = [AtomicWriter(output_dir / f"{basename}.{fmt.suffix}") for fmt in self.formats]
+        for writer in writers:
+            writer.__enter__()
+        try:
+            targets = [(fmt, writer.write) for fmt, writer in zip(self.formats, writers)]
+            context = report_context(final_data)
+            for fmt, write in targets:
+                fmt.header(context, write)
+
+            for section, count in self.counts.items():
+                for fmt, write in targets:
+                    fmt.sections[section][0](context, write)
+                items = [(fmt.sections[section][1], write) for fmt, write in targets]
+                for index, item in enumerate(islice(final_data.get(section, []), count), 1):
+                    fields = dict(item, index=index)
+                    for render_item, write in items:
+                        render_item(fields, write)
+
+            for fmt, write in targets:
+                fmt.footer(context, write)
+        except BaseException as e:
+            for writer in writers:
+                writer.__exit__(type(e), e, e.__traceback__)
+            raise
+        for writer in writers:
+            writer.__exit__(None, None, None)
+        return {writer.path: writer.changed for writer in writers}
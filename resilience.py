@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+HTTP请求的容错层
+AsyncFetcher 的每个请求都经过这里：可重试的状态码和网络错误按带抖动的指数退避重试
+（优先遵循 Retry-After，但不超过最大退避时间），整次运行共享一个截止时间，同一主机连续失败后熔断，
+在冷却期内直接失败，不再为已经挂起的主机耗尽每个请求的超时
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from metrics import metrics
+
+# 单次运行的默认总时限（秒），与流水线中最长的来源时限相当
+DEFAULT_RUN_DEADLINE = 180
+
+
+class CircuitOpenError(Exception):
+    """主机处于熔断状态，请求未发出"""
+
+
+class DeadlineExceeded(Exception):
+    """本次运行的总时限已到，请求未发出"""
+
+
+class RetryPolicy:
+    """重试策略：retry_statuses 中的状态码和连接/超时错误最多尝试max_attempts次"""
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0,
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def retry_after(self, response):
+        """解析 Retry-After（秒数或HTTP日期），没有或无法解析时返回None"""
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt, response=None):
+        """第attempt次（从0开始）失败后的等待秒数：Retry-After优先（不超过max_delay），否则为全抖动指数退避"""
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class Deadline:
+    """整次运行共享的截止时间，seconds为None时不限时"""
+
+    def __init__(self, seconds=None):
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self):
+        if self.expires_at is None:
+            return float('inf')
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """单个主机的熔断器
+
+    连续失败 failure_threshold 次后打开，冷却 reset_timeout 秒后进入半开状态，
+    只放行一个试探请求：成功则关闭，失败则重新打开
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def cancel_probe(self):
+        """请求在完成前被取消：放弃本次试探，下一个请求可以重新试探"""
+        with self._lock:
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    metrics.incr('http.circuit_opened')
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+
+class Resilience:
+    """重试策略、各主机熔断器和运行截止时间的组合，所有抓取器共享同一个实例"""
+
+    def __init__(self, policy=None, failure_threshold=3, reset_timeout=60.0):
+        self.policy = policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._deadline = None
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def start_run(self, seconds=DEFAULT_RUN_DEADLINE):
+        """开始新一次运行：重设截止时间（熔断状态保留，常驻模式下跨轮次有效）"""
+        self._deadline = Deadline(seconds)
+
+    @property
+    def deadline(self):
+        """当前运行的截止时间；没有调用 start_run 时（如单独运行某个抓取脚本）从首个请求起按默认时限计算"""
+        with self._lock:
+            if self._deadline is None:
+                self._deadline = Deadline(DEFAULT_RUN_DEADLINE)
+            return self._deadline
+
+    def breaker(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def before_request(self, host):
+        """请求发出前检查截止时间和熔断状态，不允许时抛出异常"""
+        if self.deadline.expired():
+            metrics.incr('http.deadline_exceeded')
+            raise DeadlineExceeded(f"运行时限已到，跳过 {host} 的请求")
+        if not self.breaker(host).allow():
+            metrics.incr('http.circuit_rejected')
+            raise CircuitOpenError(f"{host} 连续失败，已熔断")
+
+    def request_timeout(self, timeout):
+        """单个请求的超时不超过剩余的运行时间"""
+        return min(timeout, max(self.deadline.remaining(), 0.1))
+
+    def backoff(self, attempt, response=None):
+        """下一次重试前应等待的秒数；不应再重试（次数用完或等待会超过截止时间）时返回None"""
+        if attempt + 1 >= self.policy.max_attempts:
+            return None
+        delay = self.policy.delay(attempt, response)
+        if delay >= self.deadline.remaining():
+            return None
+        return delay
+
+    def summary(self):
+        """非关闭状态的熔断器，用于运行日志"""
+        with self._lock:
+            return {host: breaker.state for host, breaker in self._breakers.items() if breaker.state != 'closed'}
+
+
+resilience = Resilience()
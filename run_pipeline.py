@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+仪表盘数据流水线编排脚本
+在单个进程内并行运行三个抓取器注册的全部数据来源，并将结果直接交给数据处理器，
+避免多次解释器启动和中间JSON文件的往返读写
+"""
+
+import sys
+import time
+
+from scrape_env_news import EnvironmentalNewsScraper
+from scrape_ai_tools import AIToolsScraper
+from scrape_opportunities import OpportunitiesScraper
+from data_processor import DashboardDataProcessor
+from metrics import metrics
+from resilience import resilience
+from snapshot_store import SnapshotStore
+from sources import SourceRegistry, SourceScheduler
+
+
+class PipelineRunner:
+    # (阶段名称, 抓取器类, 对应的数据文件)
+    SCRAPERS = [
+        ('env_news', EnvironmentalNewsScraper, 'environmental_news.json'),
+        ('ai_tools', AIToolsScraper, 'ai_tools.json'),
+        ('opportunities', OpportunitiesScraper, 'opportunities.json'),
+    ]
+
+    def __init__(self, save_raw=True, max_workers=8, snapshot=False):
+        self.save_raw = save_raw
+        self.max_workers = max_workers
+        # 将抓取结果和最终数据存入快照库（snapshots/），内容未变化时不产生任何文件改动
+        self.snapshot = snapshot
+        self.timings = {}
+
+    def finish_scraper(self, name, scraper, filename, items):
+        """将调度结果交给抓取器并保存，返回数据载荷；失败时返回None"""
+        try:
+            scraper.collect(items)
+            if self.save_raw:
+                scraper.save_to_json(f"data/{filename}")
+            else:
+                scraper.record_history()
+            return scraper.build_payload()
+        except Exception as e:
+            # 与工作流中的 continue-on-error 行为一致：单个抓取器失败不影响整体
+            print(f"⚠️  抓取器 {name} 运行失败: {e}")
+            return None
+
+    def scrape_all(self):
+        """将三个抓取器的全部来源注册到同一调度器中并行运行"""
+        raw_data = {}
+        start = time.perf_counter()
+
+        scrapers = []
+        registry = SourceRegistry()
+        for name, scraper_cls, filename in self.SCRAPERS:
+            try:
+                scraper = scraper_cls()
+                scraper.register_sources(registry)
+            except Exception as e:
+                print(f"⚠️  抓取器 {name} 初始化失败: {e}")
+                continue
+            scrapers.append((name, scraper, filename))
+
+        scheduler = SourceScheduler(registry, max_workers=self.max_workers)
+        results = scheduler.run()
+        for source_name, seconds in scheduler.timings.items():
+            self.timings[f"source.{source_name}"] = seconds
+        for host, state in resilience.summary().items():
+            print(f"🔌 {host} 熔断器状态: {state}")
+
+        for name, scraper, filename in scrapers:
+            payload = self.finish_scraper(name, scraper, filename, results.get(scraper.SECTION, []))
+            if payload is not None:
+                raw_data[filename] = payload
+
+        self.timings['scrape.total'] = time.perf_counter() - start
+        return raw_data
+
+    def run(self):
+        """执行完整流水线：抓取 -> 处理 -> 摘要报告"""
+        pipeline_start = time.perf_counter()
+        # 所有抓取器的HTTP请求共享同一个截止时间，超时后不再发出新请求
+        resilience.start_run()
+
+        raw_data = self.scrape_all()
+
+        # 抓取失败的数据集不在raw_data中，处理器会回退到data/中已有的文件
+        start = time.perf_counter()
+        processor = DashboardDataProcessor(raw_data=raw_data)
+        final_data = processor.process_all_data()
+        self.timings['process'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        processor.generate_summary_report()
+        self.timings['report'] = time.perf_counter() - start
+
+        if self.snapshot:
+            start = time.perf_counter()
+            self.save_snapshot(raw_data, final_data)
+            self.timings['snapshot'] = time.perf_counter() - start
+
+        self.timings['pipeline.total'] = time.perf_counter() - pipeline_start
+        self.print_timings()
+        return final_data
+
+    def save_snapshot(self, raw_data, final_data):
+        """保存本次的抓取结果和仪表盘数据；失败的抓取器沿用上一份快照中的内容"""
+        path = SnapshotStore().snapshot({**raw_data, 'dashboard_data.json': final_data})
+        if path is None:
+            print("📸 数据内容与上一份快照相同，未写入新快照")
+        else:
+            print(f"📸 已保存快照 {path}")
+
+    def print_timings(self):
+        """打印各阶段耗时"""
+        print("⏱️  各阶段耗时:")
+        for stage, seconds in self.timings.items():
+            print(f"   {stage:<40} {seconds:8.3f}s")
+
+
+if __name__ == "__main__":
+    # --no-save-raw: 不写入中间JSON文件，抓取结果只在内存中传递
+    # --metrics: 采集各阶段指标并写入 data/run_metrics.jsonl
+    # --snapshot: 将本次数据存入快照库 snapshots/
+    if '--metrics' in sys.argv[1:]:
+        metrics.enable()
+    runner = PipelineRunner(save_raw='--no-save-raw' not in sys.argv[1:], snapshot='--snapshot' in sys.argv[1:])
+    runner.run()
+    metrics.export()
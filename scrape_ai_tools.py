@@ -5,69 +5,89 @@ AI工具推荐抓取脚本 - 最新版本
 """
 
 import requests
-import json
 import datetime
-import time
 import random
 import os
 
+from atomic_io import atomic_write
+from github_discovery import GitHubDiscovery
+from history_store import HistoryStore
+from http_client import AsyncFetcher
+from http_cache import HTTPCache
+from metrics import metrics
+from serializer import dumps
+from sources import Source, SourceRegistry, SourceScheduler, source_rate_limits
+
 class AIToolsScraper:
+    SECTION = 'tools'
+    # 候选池按星标排序后最多保留的GitHub项目数
+    MAX_GITHUB_TOOLS = 50
+
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/vnd.github.v3+json'
         })
+        self.sources = self.build_sources()
+        self.http_cache = HTTPCache()
+        self.fetcher = AsyncFetcher(self.session, cache=self.http_cache,
+                                    rate_limits=source_rate_limits(self.sources))
+        self.discovery = GitHubDiscovery(self.fetcher)
         self.tools_data = []
 
+    def build_sources(self):
+        """声明本抓取器的数据来源：先添加核心工具，再获取GitHub热门项目"""
+        return [
+            # 内置工具列表很少变化，GitHub搜索结果每小时刷新
+            Source('essential_gis_tools', self.SECTION, self.add_essential_gis_tools, interval=24 * 3600),
+            # 搜索API的配额由发现引擎按响应头控制，超出当前窗口时最多等待一次重置
+            Source('github_environmental_projects', self.SECTION, self.scrape_github_environmental_projects,
+                   timeout=150, interval=3600),
+        ]
+
+    def register_sources(self, registry):
+        for source in self.sources:
+            registry.register(source)
+
+    @metrics.timed('ai_tools.scrape_github_environmental_projects')
     def scrape_github_environmental_projects(self):
-        """抓取GitHub环境科学相关热门项目"""
+        """抓取GitHub环境科学相关热门项目（所有关键词并行分页搜索，见 github_discovery.py）"""
+        github_tools = []
         try:
-            # 搜索环境科学相关的热门项目
-            keywords = ['environmental-data', 'climate-analysis', 'gis-tools', 'earth-observation']
-
-            for keyword in keywords[:2]:  # 限制API调用
-                url = "https://api.github.com/search/repositories"
-                params = {
-                    'q': f'{keyword} language:python stars:>100',
-                    'sort': 'updated',
-                    'per_page': 2
-                }
-
-                try:
-                    response = self.session.get(url, params=params, timeout=10)
-                    if response.status_code == 200:
-                        data = response.json()
-
-                        for repo in data.get('items', [])[:1]:
-                            if repo.get('description'):
-                                self.tools_data.append({
-                                    'name': repo['name'],
-                                    'summary': self.truncate_text(repo['description'], 80),
-                                    'usefulness': f"这个{keyword}相关的Python项目特别适用于环境数据分析和地理空间处理任务。对于环境科学学生来说，它提供了实际的工具和方法来处理复杂的环境数据集。",
-                                    'technical': f"基于Python开发，在GitHub上有{repo['stargazers_count']}个星标。可通过pip安装，与pandas、numpy、matplotlib等科学计算库无缝集成。支持Jupyter Notebook环境。",
-                                    'category': 'programming',
-                                    'difficulty': '中级',
-                                    'link': repo['html_url'],
-                                    'stars': repo['stargazers_count']
-                                })
-
-                    time.sleep(1)  # API调用间隔
-
-                except Exception as api_error:
-                    print(f"GitHub API error for {keyword}: {api_error}")
-
-            print(f"GitHub projects: 收集 {len([t for t in self.tools_data if 'github.com' in t.get('link', '')])} 个热门项目")
+            candidates = self.discovery.discover()
+
+            for entry in candidates:
+                repo, keyword = entry['repo'], entry['keyword']
+                if not repo.get('description'):
+                    continue
+                github_tools.append({
+                    'name': repo['name'],
+                    'summary': self.truncate_text(repo['description'], 80),
+                    'usefulness': f"这个{keyword}相关的Python项目特别适用于环境数据分析和地理空间处理任务。对于环境科学学生来说，它提供了实际的工具和方法来处理复杂的环境数据集。",
+                    'technical': f"基于Python开发，在GitHub上有{repo['stargazers_count']}个星标。可通过pip安装，与pandas、numpy、matplotlib等科学计算库无缝集成。支持Jupyter Notebook环境。",
+                    'category': 'programming',
+                    'difficulty': '中级',
+                    'link': repo['html_url'],
+                    'stars': repo['stargazers_count']
+                })
+                if len(github_tools) >= self.MAX_GITHUB_TOOLS:
+                    break
+
+            print(f"GitHub projects: 收集 {len(github_tools)} 个热门项目")
 
         except Exception as e:
             print(f"GitHub scraping error: {e}")
 
+        return github_tools
+
     def truncate_text(self, text, max_length):
         """截断文本到指定长度"""
         if len(text) <= max_length:
             return text
         return text[:max_length] + "..."
 
+    @metrics.timed('ai_tools.add_essential_gis_tools')
     def add_essential_gis_tools(self):
         """添加核心GIS和环境科学工具"""
         essential_tools = [
@@ -125,38 +145,60 @@ class AIToolsScraper:
 
         # 随机选择3-4个工具以保持新鲜感
         selected_tools = random.sample(essential_tools, min(4, len(essential_tools)))
-        self.tools_data.extend(selected_tools)
         print(f"Essential tools: 添加 {len(selected_tools)} 个核心工具")
+        return selected_tools
 
+    @metrics.timed('ai_tools.scrape_all_sources')
     def scrape_all_sources(self):
         """执行所有收集任务"""
         print("🤖 开始收集AI工具推荐...")
 
-        # 先添加核心工具
-        self.add_essential_gis_tools()
+        registry = SourceRegistry()
+        self.register_sources(registry)
+        results = SourceScheduler(registry).run()
+        return self.collect(results.get(self.SECTION, []))
 
-        # 尝试获取GitHub热门项目
-        self.scrape_github_environmental_projects()
+    def collect(self, items):
+        """接收调度器汇总的本分区记录"""
+        self.tools_data = items
 
         # 随机排序保持新鲜感
         random.shuffle(self.tools_data)
 
         print(f"✅ 成功收集 {len(self.tools_data)} 个工具推荐")
+        metrics.items('ai_tools', len(self.tools_data))
+        print(f"🗄️  HTTP缓存: {self.http_cache.summary()}")
         return self.tools_data
 
+    def build_payload(self):
+        """构建与JSON文件结构一致的数据载荷"""
+        return {
+            'last_updated': datetime.datetime.now().isoformat(),
+            'tools': self.tools_data
+        }
+
+    @metrics.timed('ai_tools.save_to_json')
     def save_to_json(self, filename="data/ai_tools.json"):
         """保存数据到JSON文件"""
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'last_updated': datetime.datetime.now().isoformat(),
-                'tools': self.tools_data
-            }, f, ensure_ascii=False, indent=2)
+        # 原子写入并附带校验文件，运行中途失败不会留下截断的JSON
+        atomic_write(filename, dumps(self.build_payload()), checksum=True)
 
         print(f"📁 数据已保存到 {filename}")
+        self.record_history()
+
+    def record_history(self):
+        """将本次抓取结果写入历史库"""
+        store = HistoryStore()
+        try:
+            _, new_count = store.record(self.SECTION, self.tools_data)
+            print(f"🗃️  历史库: 本次新增 {new_count} 个工具")
+        finally:
+            store.close()
 
 if __name__ == "__main__":
     scraper = AIToolsScraper()
     scraper.scrape_all_sources()
     scraper.save_to_json()
+    metrics.export()
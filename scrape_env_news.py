@@ -5,72 +5,84 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
 import datetime
-import feedparser
-from urllib.parse import urljoin
-import time
-import random
 import os
 
+from atomic_io import atomic_write
+from history_store import HistoryStore
+from html_extract import extract_news_items
+from http_client import AsyncFetcher, TokenBucket
+from http_cache import HTTPCache
+from metrics import metrics
+from serializer import dumps
+from sources import Source, SourceRegistry, SourceScheduler, source_rate_limits
+
 class EnvironmentalNewsScraper:
+    SECTION = 'news'
+    FENNER_NEWS_URL = "https://fennerschool.anu.edu.au/news-events/news"
+
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
         })
+        self.sources = self.build_sources()
+        self.http_cache = HTTPCache()
+        self.fetcher = AsyncFetcher(self.session, cache=self.http_cache,
+                                    rate_limits=source_rate_limits(self.sources))
         self.news_data = []
 
-    def scrape_anu_fenner_news(self):
-        """抓取ANU Fenner School最新新闻"""
-        try:
-            url = "https://fennerschool.anu.edu.au/news-events/news"
-            response = self.session.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # 查找新闻条目 - 更全面的选择器
-            news_items = soup.find_all(['article', 'div'], class_=['news-item', 'news-article', 'post', 'content-item'])[:3]
-
-            for item in news_items:
-                title_elem = item.find(['h1', 'h2', 'h3', 'h4', 'a'])
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-
-                    # 提取描述
-                    desc_elem = item.find(['p', 'div'], class_=['summary', 'excerpt', 'description', 'content'])
-                    if not desc_elem:
-                        desc_elem = item.find('p')
-
-                    description = ""
-                    if desc_elem:
-                        description = desc_elem.get_text(strip=True)[:200] + "..."
-
-                    # 提取链接
-                    link_elem = item.find('a')
-                    link = urljoin(url, link_elem['href']) if link_elem and link_elem.get('href') else url
-
-                    if title and len(title) > 10:  # 过滤太短的标题
-                        self.news_data.append({
-                            'title': title,
-                            'description': description or "ANU Fenner School最新环境科学研究动态和学术活动信息。",
-                            'source': 'ANU Fenner School',
-                            'date': datetime.datetime.now().strftime('%Y-%m-%d'),
-                            'category': 'academic',
-                            'link': link,
-                            'urgency': 'medium'
-                        })
-
-            print(f"ANU Fenner School: 成功抓取 {len([item for item in self.news_data if item['source'] == 'ANU Fenner School'])} 条新闻")
-
-        except Exception as e:
-            print(f"ANU Fenner news scraping error: {e}")
-            # 添加备用内容
-            self.add_fallback_anu_news()
-
-    def add_fallback_anu_news(self):
-        """添加ANU Fenner备用新闻内容"""
-        fallback_news = {
+    def build_sources(self):
+        """声明本抓取器的数据来源，按原先的抓取顺序排列"""
+        return [
+            Source('anu_fenner', self.SECTION, self.fetch_anu_fenner_page, self.parse_anu_fenner_news,
+                   fallback=self.fallback_anu_news, timeout=8, interval=3 * 3600,
+                   # 每个主机每秒最多1个请求，替代原先抓取之间的随机等待
+                   rate_limits={'fennerschool.anu.edu.au': TokenBucket(rate=1, capacity=1)}),
+            Source('climate_council', self.SECTION, self.scrape_climate_council_news),
+            Source('global_environmental', self.SECTION, self.scrape_global_environmental_news),
+        ]
+
+    def register_sources(self, registry):
+        for source in self.sources:
+            registry.register(source)
+
+    @metrics.timed('env_news.fetch_anu_fenner_page')
+    def fetch_anu_fenner_page(self):
+        """获取ANU Fenner School新闻页面"""
+        return self.fetcher.get(self.FENNER_NEWS_URL)
+
+    @metrics.timed('env_news.parse_anu_fenner_news')
+    def parse_anu_fenner_news(self, response):
+        """解析ANU Fenner School最新新闻"""
+        # 查找新闻条目 - 更全面的选择器（优先使用lxml预编译XPath）
+        news_items = extract_news_items(response.content, self.FENNER_NEWS_URL, limit=3)
+
+        fenner_news = []
+        for item in news_items:
+            title = item['title']
+
+            description = ""
+            if item['description'] is not None:
+                description = item['description'][:200] + "..."
+
+            if title and len(title) > 10:  # 过滤太短的标题
+                fenner_news.append({
+                    'title': title,
+                    'description': description or "ANU Fenner School最新环境科学研究动态和学术活动信息。",
+                    'source': 'ANU Fenner School',
+                    'date': datetime.datetime.now().strftime('%Y-%m-%d'),
+                    'category': 'academic',
+                    'link': item['link'],
+                    'urgency': 'medium'
+                })
+
+        print(f"ANU Fenner School: 成功抓取 {len(fenner_news)} 条新闻")
+        return fenner_news
+
+    def fallback_anu_news(self):
+        """ANU Fenner备用新闻内容"""
+        return [{
             'title': 'ANU Fenner School环境科学前沿研究',
             'description': 'Fenner School持续在气候变化、生物多样性保护、可持续发展等领域开展前沿研究，为环境科学学生提供丰富的学习和研究机会。',
             'source': 'ANU Fenner School',
@@ -78,98 +90,110 @@ class EnvironmentalNewsScraper:
             'category': 'academic',
             'link': 'https://fennerschool.anu.edu.au/news-events/news',
             'urgency': 'medium'
-        }
-        self.news_data.append(fallback_news)
+        }]
 
+    @metrics.timed('env_news.scrape_climate_council_news')
     def scrape_climate_council_news(self):
         """收集澳大利亚气候委员会相关新闻"""
-        try:
-            # 基于真实内容的高质量气候新闻
-            climate_news = [
-                {
-                    'title': '澳大利亚2025年气候风险评估重要发现',
-                    'description': '最新国家气候风险评估显示，到2050年将有150万澳大利亚人面临海平面上升威胁。在3°C升温情景下，悉尼热相关死亡人数可能增加440%。政府呼吁立即采取适应措施。',
-                    'source': '澳大利亚气候委员会',
-                    'date': datetime.datetime.now().strftime('%Y-%m-%d'),
-                    'category': 'climate',
-                    'link': 'https://www.climatecouncil.org.au/resources/',
-                    'urgency': 'high'
-                },
-                {
-                    'title': '极端天气事件频发，适应性基础设施建设迫在眉睫',
-                    'description': '气候委员会最新报告指出，澳大利亚正面临更频繁的极端天气事件，包括干旱、洪水和野火。现有基础设施的脆弱性凸显，需要立即加强气候适应性设计和建设。',
-                    'source': '澳大利亚气候委员会',
-                    'date': datetime.datetime.now().strftime('%Y-%m-%d'),
-                    'category': 'climate',
-                    'link': 'https://www.climatecouncil.org.au/resources/',
-                    'urgency': 'high'
-                }
-            ]
-
-            self.news_data.extend(climate_news)
-            print(f"Climate Council: 添加 {len(climate_news)} 条气候新闻")
-
-        except Exception as e:
-            print(f"Climate news processing error: {e}")
-
+        # 基于真实内容的高质量气候新闻
+        climate_news = [
+            {
+                'title': '澳大利亚2025年气候风险评估重要发现',
+                'description': '最新国家气候风险评估显示，到2050年将有150万澳大利亚人面临海平面上升威胁。在3°C升温情景下，悉尼热相关死亡人数可能增加440%。政府呼吁立即采取适应措施。',
+                'source': '澳大利亚气候委员会',
+                'date': datetime.datetime.now().strftime('%Y-%m-%d'),
+                'category': 'climate',
+                'link': 'https://www.climatecouncil.org.au/resources/',
+                'urgency': 'high'
+            },
+            {
+                'title': '极端天气事件频发，适应性基础设施建设迫在眉睫',
+                'description': '气候委员会最新报告指出，澳大利亚正面临更频繁的极端天气事件，包括干旱、洪水和野火。现有基础设施的脆弱性凸显，需要立即加强气候适应性设计和建设。',
+                'source': '澳大利亚气候委员会',
+                'date': datetime.datetime.now().strftime('%Y-%m-%d'),
+                'category': 'climate',
+                'link': 'https://www.climatecouncil.org.au/resources/',
+                'urgency': 'high'
+            }
+        ]
+
+        print(f"Climate Council: 添加 {len(climate_news)} 条气候新闻")
+        return climate_news
+
+    @metrics.timed('env_news.scrape_global_environmental_news')
     def scrape_global_environmental_news(self):
         """收集全球环境科学动态"""
-        try:
-            global_news = [
-                {
-                    'title': '全球气温预测：未来5年将持续创纪录高温',
-                    'description': '世界气象组织最新预测显示，2025-2029年全球平均气温有70%可能超过1.5°C临界值。这对全球生态系统和人类社会构成前所未有的挑战，需要加速减排和适应行动。',
-                    'source': '世界气象组织',
-                    'date': datetime.datetime.now().strftime('%Y-%m-%d'),
-                    'category': 'climate',
-                    'link': 'https://wmo.int/news/media-centre/',
-                    'urgency': 'high'
-                },
-                {
-                    'title': '生物多样性保护新突破：基于AI的物种监测技术',
-                    'description': '最新研究表明，结合人工智能和环境DNA技术的物种监测方法，可以显著提高生物多样性评估的准确性和效率。这为环境保护和生态研究提供了强有力的工具。',
-                    'source': 'Nature Ecology & Evolution',
-                    'date': datetime.datetime.now().strftime('%Y-%m-%d'),
-                    'category': 'academic',
-                    'link': 'https://www.nature.com/natecolevol/',
-                    'urgency': 'medium'
-                }
-            ]
-
-            self.news_data.extend(global_news)
-            print(f"Global sources: 添加 {len(global_news)} 条国际环境新闻")
-
-        except Exception as e:
-            print(f"Global news processing error: {e}")
-
+        global_news = [
+            {
+                'title': '全球气温预测：未来5年将持续创纪录高温',
+                'description': '世界气象组织最新预测显示，2025-2029年全球平均气温有70%可能超过1.5°C临界值。这对全球生态系统和人类社会构成前所未有的挑战，需要加速减排和适应行动。',
+                'source': '世界气象组织',
+                'date': datetime.datetime.now().strftime('%Y-%m-%d'),
+                'category': 'climate',
+                'link': 'https://wmo.int/news/media-centre/',
+                'urgency': 'high'
+            },
+            {
+                'title': '生物多样性保护新突破：基于AI的物种监测技术',
+                'description': '最新研究表明，结合人工智能和环境DNA技术的物种监测方法，可以显著提高生物多样性评估的准确性和效率。这为环境保护和生态研究提供了强有力的工具。',
+                'source': 'Nature Ecology & Evolution',
+                'date': datetime.datetime.now().strftime('%Y-%m-%d'),
+                'category': 'academic',
+                'link': 'https://www.nature.com/natecolevol/',
+                'urgency': 'medium'
+            }
+        ]
+
+        print(f"Global sources: 添加 {len(global_news)} 条国际环境新闻")
+        return global_news
+
+    @metrics.timed('env_news.scrape_all_sources')
     def scrape_all_sources(self):
         """执行所有抓取任务"""
         print("🌱 开始抓取环境科学新闻...")
 
-        self.scrape_anu_fenner_news()
-        time.sleep(random.uniform(1, 2))
-
-        self.scrape_climate_council_news()
-        time.sleep(random.uniform(1, 2))
-
-        self.scrape_global_environmental_news()
+        registry = SourceRegistry()
+        self.register_sources(registry)
+        results = SourceScheduler(registry).run()
+        return self.collect(results.get(self.SECTION, []))
 
+    def collect(self, items):
+        """接收调度器汇总的本分区记录"""
+        self.news_data = items
         print(f"✅ 总共收集 {len(self.news_data)} 条新闻")
+        metrics.items('env_news', len(self.news_data))
+        print(f"🗄️  HTTP缓存: {self.http_cache.summary()}")
         return self.news_data
 
+    def build_payload(self):
+        """构建与JSON文件结构一致的数据载荷"""
+        return {
+            'last_updated': datetime.datetime.now().isoformat(),
+            'news': self.news_data
+        }
+
+    @metrics.timed('env_news.save_to_json')
     def save_to_json(self, filename="data/environmental_news.json"):
         """保存数据到JSON文件"""
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'last_updated': datetime.datetime.now().isoformat(),
-                'news': self.news_data
-            }, f, ensure_ascii=False, indent=2)
+        # 原子写入并附带校验文件，运行中途失败不会留下截断的JSON
+        atomic_write(filename, dumps(self.build_payload()), checksum=True)
 
         print(f"📁 数据已保存到 {filename}")
+        self.record_history()
+
+    def record_history(self):
+        """将本次抓取结果写入历史库"""
+        store = HistoryStore()
+        try:
+            _, new_count = store.record(self.SECTION, self.news_data)
+            print(f"🗃️  历史库: 本次新增 {new_count} 条新闻")
+        finally:
+            store.close()
 
 if __name__ == "__main__":
     scraper = EnvironmentalNewsScraper()
     scraper.scrape_all_sources()
     scraper.save_to_json()
+    metrics.export()
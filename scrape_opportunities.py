@@ -4,15 +4,38 @@
 专门收集堪培拉ACT地区环境相关的志愿者和就业机会
 """
 
-import json
 import datetime
 import random
 import os
 
+from atomic_io import atomic_write
+from history_store import HistoryStore
+from metrics import metrics
+from serializer import dumps
+from sources import Source, SourceRegistry, SourceScheduler
+
 class OpportunitiesScraper:
+    SECTION = 'opportunities'
+
     def __init__(self):
+        self.sources = self.build_sources()
         self.opportunities_data = []
 
+    def build_sources(self):
+        """声明本抓取器的数据来源"""
+        return [
+            # 机会列表为人工整理的静态内容，每天检查一次即可
+            Source('volunteer_opportunities', self.SECTION, self.collect_volunteer_opportunities,
+                   interval=24 * 3600),
+            Source('employment_opportunities', self.SECTION, self.collect_employment_opportunities,
+                   interval=24 * 3600),
+        ]
+
+    def register_sources(self, registry):
+        for source in self.sources:
+            registry.register(source)
+
+    @metrics.timed('opportunities.collect_volunteer_opportunities')
     def collect_volunteer_opportunities(self):
         """收集高质量的志愿者机会"""
 
@@ -75,9 +98,10 @@ class OpportunitiesScraper:
             }
         ]
 
-        self.opportunities_data.extend(volunteer_opportunities)
         print(f"Volunteer opportunities: 收集 {len(volunteer_opportunities)} 个志愿者机会")
+        return volunteer_opportunities
 
+    @metrics.timed('opportunities.collect_employment_opportunities')
     def collect_employment_opportunities(self):
         """收集就业和实习机会"""
 
@@ -140,35 +164,59 @@ class OpportunitiesScraper:
             }
         ]
 
-        self.opportunities_data.extend(employment_opportunities)
         print(f"Employment opportunities: 收集 {len(employment_opportunities)} 个就业机会")
+        return employment_opportunities
 
+    @metrics.timed('opportunities.scrape_all_sources')
     def scrape_all_sources(self):
         """执行所有数据收集任务"""
         print("💼 开始收集实践机会...")
 
-        self.collect_volunteer_opportunities()
-        self.collect_employment_opportunities()
+        registry = SourceRegistry()
+        self.register_sources(registry)
+        results = SourceScheduler(registry).run()
+        return self.collect(results.get(self.SECTION, []))
+
+    def collect(self, items):
+        """接收调度器汇总的本分区记录"""
+        self.opportunities_data = items
 
         # 随机排序保持新鲜感
         random.shuffle(self.opportunities_data)
 
         print(f"✅ 总共收集 {len(self.opportunities_data)} 个实践机会")
+        metrics.items('opportunities', len(self.opportunities_data))
         return self.opportunities_data
 
+    def build_payload(self):
+        """构建与JSON文件结构一致的数据载荷"""
+        return {
+            'last_updated': datetime.datetime.now().isoformat(),
+            'opportunities': self.opportunities_data
+        }
+
+    @metrics.timed('opportunities.save_to_json')
     def save_to_json(self, filename="data/opportunities.json"):
         """保存数据到JSON文件"""
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'last_updated': datetime.datetime.now().isoformat(),
-                'opportunities': self.opportunities_data
-            }, f, ensure_ascii=False, indent=2)
+        # 原子写入并附带校验文件，运行中途失败不会留下截断的JSON
+        atomic_write(filename, dumps(self.build_payload()), checksum=True)
 
         print(f"📁 数据已保存到 {filename}")
+        self.record_history()
+
+    def record_history(self):
+        """将本次抓取结果写入历史库"""
+        store = HistoryStore()
+        try:
+            _, new_count = store.record(self.SECTION, self.opportunities_data)
+            print(f"🗃️  历史库: 本次新增 {new_count} 个机会")
+        finally:
+            store.close()
 
 if __name__ == "__main__":
     scraper = OpportunitiesScraper()
     scraper.scrape_all_sources()
     scraper.save_to_json()
+    metrics.export()
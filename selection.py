@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+带多样性约束的Top-K选择器
+单次遍历、O(n log K)复杂度，结果与"完整排序后按类别上限贪心选取"完全一致
+"""
+
+import heapq
+import operator
+
+
+class _Descending:
+    """反转比较顺序的包装，使最小堆的堆顶成为排序键最大的项"""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __gt__(self, other):
+        return self.key < other.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class _BoundedHeap:
+    """只保留最优的capacity项，堆顶为当前最差项"""
+    __slots__ = ('capacity', 'entries', 'worst_key')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = []
+        # 堆满后最差项的原始排序键，用于在构造条目前快速淘汰
+        self.worst_key = None
+
+    def offer(self, entry, key):
+        if len(self.entries) < self.capacity:
+            heapq.heappush(self.entries, entry)
+        else:
+            heapq.heapreplace(self.entries, entry)
+        if len(self.entries) == self.capacity:
+            worst = self.entries[0][0]
+            self.worst_key = worst.key if isinstance(worst, _Descending) else worst
+
+    def accepts(self, key, better):
+        """后到的项只有严格优于堆顶时才能入选（同优先级时先到者优先）"""
+        return self.worst_key is None or better(key, self.worst_key)
+
+
+class DiversityTopK:
+    """按优先级选取最多limit项，并限制每个类别的入选数量
+
+    limit: 最多选取的数量
+    sort_key: 优先级函数，默认越小越优先；reverse=True时越大越优先
+    group_key: 类别函数；为None时不做多样性约束
+    free_picks: 前free_picks项不受类别上限约束
+    group_cap: 之后每个类别（含自由入选项）最多入选的数量
+    同优先级的项按输入顺序先后入选，与稳定排序的行为一致
+    """
+
+    def __init__(self, limit, sort_key, group_key=None, free_picks=0, group_cap=None, reverse=False):
+        self.limit = limit
+        self.sort_key = sort_key
+        self.group_key = group_key
+        self.free_picks = free_picks
+        self.group_cap = group_cap
+        self.reverse = reverse
+
+    def _entry(self, key, index, item):
+        # 堆条目的比较顺序：越优的条目越大，同优先级时输入越早越优
+        return (key if self.reverse else _Descending(key), -index, item)
+
+    def select(self, items):
+        """从任意可迭代对象中选取，只在内存中保留有界的候选集"""
+        constrained = self.group_key is not None and self.group_cap is not None
+
+        # 自由入选部分只可能来自全局前free_picks项；之后按类别上限入选的项
+        # 只可能来自各类别内的前group_cap项，因此两组有界堆即可覆盖全部候选
+        top = _BoundedHeap(self.free_picks if constrained else self.limit)
+        groups = {}
+
+        better = operator.gt if self.reverse else operator.lt
+        for index, item in enumerate(items):
+            key = self.sort_key(item)
+            entry = None
+            if top.capacity and top.accepts(key, better):
+                entry = self._entry(key, index, item)
+                top.offer(entry, key)
+            if constrained:
+                group = self.group_key(item)
+                heap = groups.get(group)
+                if heap is None:
+                    heap = groups[group] = _BoundedHeap(self.group_cap)
+                if heap.accepts(key, better):
+                    heap.offer(entry or self._entry(key, index, item), key)
+
+        candidates = {-entry[1]: entry for entry in top.entries}
+        for heap in groups.values():
+            for entry in heap.entries:
+                candidates[-entry[1]] = entry
+
+        selected = []
+        group_counts = {}
+        for entry in sorted(candidates.values(), reverse=True):
+            if len(selected) >= self.limit:
+                break
+            item = entry[2]
+            if not constrained:
+                selected.append(item)
+                continue
+            group = self.group_key(item)
+            count = group_counts.get(group, 0)
+            if len(selected) < self.free_picks or count < self.group_cap:
+                selected.append(item)
+                group_counts[group] = count + 1
+        return selected
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+JSON序列化工具
+安装了orjson时用它编码（比标准库快数倍），否则回退到json模块；两者的缩进格式输出逐字节一致。
+发布的文件默认使用紧凑格式，可另存一份缩进格式供人阅读，并生成预压缩的.gz/.br文件
+"""
+
+import gzip
+import json
+import time
+from pathlib import Path
+
+from atomic_io import write_if_changed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def backend_name():
+    return 'orjson' if orjson is not None else 'json'
+
+
+def dumps(obj, pretty=False, backend=None):
+    """编码为UTF-8字节，pretty为两空格缩进；orjson无法编码的值（如超出64位的整数）改用标准库"""
+    if (backend or backend_name()) == 'orjson':
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:
+            pass
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compression_formats():
+    """可用的预压缩格式，brotli需要安装brotli包"""
+    return ['gz', 'br'] if brotli is not None else ['gz']
+
+
+def compress(data, fmt):
+    """按最高压缩级别压缩；gzip头中的时间固定为0，相同内容得到相同字节"""
+    if fmt == 'gz':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if fmt == 'br':
+        if brotli is None:
+            raise ValueError("生成.br文件需要安装brotli")
+        return brotli.compress(data, quality=11)
+    raise ValueError(f"未知的压缩格式: {fmt}")
+
+
+def write_json(path, obj, pretty=False, checksum=False):
+    """编码后原子写入JSON文件，内容未变化时跳过，返回是否写入"""
+    return write_if_changed(path, dumps(obj, pretty=pretty), checksum=checksum)
+
+
+def pretty_path(path):
+    """缩进格式副本的路径: dashboard_data.json -> dashboard_data.pretty.json"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.pretty{path.suffix}")
+
+
+def publish_json(path, obj, pretty_copy=False, precompress=False, checksum=False):
+    """原子写入紧凑格式的发布文件及可选的缩进副本和预压缩文件，checksum只作用于发布文件
+
+    返回报告字典: encode_seconds, compact/pretty的字节数（缩进格式总会计算，用于对比），
+    各压缩格式的字节数，以及实际写入的文件列表
+    """
+    path = Path(path)
+    start = time.perf_counter()
+    compact = dumps(obj)
+    encode_seconds = time.perf_counter() - start
+    pretty = dumps(obj, pretty=True)
+
+    report = {
+        'backend': backend_name(),
+        'encode_seconds': encode_seconds,
+        'compact_bytes': len(compact),
+        'pretty_bytes': len(pretty),
+        'compressed_bytes': {},
+        'written': []
+    }
+    outputs = []
+    if pretty_copy:
+        outputs.append((pretty_path(path), pretty))
+    if precompress:
+        for fmt in compression_formats():
+            data = compress(compact, fmt)
+            report['compressed_bytes'][fmt] = len(data)
+            outputs.append((path.with_name(f"{path.name}.{fmt}"), data))
+
+    # 发布文件最后写入，读取方看到新的发布文件时，副本和压缩文件已经就绪
+    for output, data in outputs:
+        if write_if_changed(output, data):
+            report['written'].append(output)
+    if write_if_changed(path, compact, checksum=checksum):
+        report['written'].append(path)
+    return report
+
+
+def format_report(path, report):
+    """发布报告的单行摘要"""
+    compact, pretty = report['compact_bytes'], report['pretty_bytes']
+    saved = 1 - compact / pretty if pretty else 0
+    line = (f"🗜️  {Path(path).name}: {compact / 1024:.1f} KB（缩进格式 {pretty / 1024:.1f} KB，"
+            f"减少 {saved:.0%}），{report['backend']} 编码 {report['encode_seconds'] * 1000:.1f} ms")
+    for fmt, size in report['compressed_bytes'].items():
+        line += f"，.{fmt} {size / 1024:.1f} KB"
+    return line
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+内容寻址的数据快照库
+每条记录去掉易变字段（last_updated、current_date、抓取日期等）后按内容哈希压缩存为一个对象，
+每天一份的小清单只列出各文件的结构、记录的对象哈希和当天的易变字段。内容与上一份清单相同时
+不写入任何文件，数据未变化的日子没有提交；任意一天的数据由一份清单和其引用的对象即可还原。
+用法:
+  python snapshot_store.py save [--data-dir data] [--date 2026-01-31]
+  python snapshot_store.py restore [日期] [--output data]
+  python snapshot_store.py list
+"""
+
+import argparse
+import bisect
+import datetime
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+from atomic_io import atomic_write, load_json, write_if_changed
+from serializer import compress, dumps
+
+DEFAULT_SNAPSHOT_DIR = Path("snapshots")
+
+# 纳入快照的数据文件
+SNAPSHOT_FILES = ('environmental_news.json', 'ai_tools.json', 'opportunities.json', 'dashboard_data.json')
+
+# 每次运行都会变化、但不代表内容变化的字段：文件顶层、metadata中、以及每条记录中的
+VOLATILE_FIELDS = ('last_updated', 'current_date')
+VOLATILE_METADATA_FIELDS = ('last_processing_time', 'next_update')
+VOLATILE_ITEM_FIELDS = ('date',)
+# 顺序本身无意义的记录列表 (文件名, 字段)：scrape_ai_tools 和 scrape_opportunities 每次随机打乱，
+# 顺序作为易变字段保存。dashboard_data.json 中的同名列表是排序后的结果，顺序属于内容
+UNORDERED_ITEM_LISTS = {('ai_tools.json', 'tools'), ('opportunities.json', 'opportunities')}
+
+# 清单格式变化时递增
+MANIFEST_VERSION = 1
+
+
+def split_volatile(obj, fields):
+    """拆分易变字段：稳定部分保留原有的键顺序，易变字段的值置为None，原值放入易变部分"""
+    stable = {}
+    volatile = {}
+    for key, value in obj.items():
+        if key in fields:
+            stable[key] = None
+            volatile[key] = value
+        else:
+            stable[key] = value
+    return stable, volatile
+
+
+def merge_volatile(stable, volatile):
+    """split_volatile 的逆操作"""
+    return {key: volatile[key] if key in volatile else value for key, value in stable.items()}
+
+
+def is_item_list(value):
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def content_digest(obj):
+    return hashlib.sha256(dumps(obj)).hexdigest()
+
+
+class SnapshotStore:
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+
+    # ---- 对象 ----
+
+    def object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest[2:]}.json.gz"
+
+    def put_object(self, obj):
+        """保存一个对象并返回其哈希；相同内容只存一份，已存在时不重复写入"""
+        data = dumps(obj)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not path.exists():
+            # gzip头中的时间固定为0，同一内容的压缩结果逐字节相同
+            atomic_write(path, compress(data, 'gz'))
+        return digest
+
+    def get_object(self, digest):
+        with open(self.object_path(digest), 'rb') as f:
+            return json.loads(gzip.decompress(f.read()))
+
+    # ---- 文件的拆分与还原 ----
+
+    def split_document(self, document, name=None):
+        """将一个数据文件拆成清单条目：结构、记录的对象哈希、易变字段，以及稳定内容的摘要
+
+        name 为文件名，用于判断哪些记录列表的顺序无意义
+        """
+        skeleton, volatile = split_volatile(document, VOLATILE_FIELDS)
+        entry = {'document': skeleton, 'items': {}, 'volatile': {'document': volatile}}
+
+        metadata = skeleton.get('metadata')
+        if isinstance(metadata, dict):
+            skeleton['metadata'], entry['volatile']['metadata'] = split_volatile(metadata, VOLATILE_METADATA_FIELDS)
+
+        for key, value in document.items():
+            if not is_item_list(value):
+                continue
+            digests = []
+            item_volatile = []
+            for item in value:
+                stable_item, volatile_item = split_volatile(item, VOLATILE_ITEM_FIELDS)
+                digests.append(self.put_object(stable_item))
+                item_volatile.append(volatile_item)
+            if (name, key) in UNORDERED_ITEM_LISTS:
+                # 按对象哈希排序，原来的位置放入易变部分
+                order = sorted(range(len(digests)), key=digests.__getitem__)
+                digests = [digests[position] for position in order]
+                item_volatile = [item_volatile[position] for position in order]
+                entry['volatile'].setdefault('order', {})[key] = order
+            skeleton[key] = None
+            entry['items'][key] = digests
+            if any(item_volatile):
+                entry['volatile'].setdefault('items', {})[key] = item_volatile
+
+        entry['digest'] = content_digest({'document': skeleton, 'items': entry['items']})
+        return entry
+
+    def restore_document(self, entry):
+        """由清单条目还原数据文件的内容"""
+        volatile = entry['volatile']
+        document = merge_volatile(entry['document'], volatile.get('document', {}))
+        if 'metadata' in volatile:
+            document['metadata'] = merge_volatile(document['metadata'], volatile['metadata'])
+        for key, digests in entry['items'].items():
+            item_volatile = volatile.get('items', {}).get(key) or [{}] * len(digests)
+            items = [merge_volatile(self.get_object(digest), extra) for digest, extra in zip(digests, item_volatile)]
+            order = volatile.get('order', {}).get(key)
+            if order is not None:
+                restored = [None] * len(items)
+                for position, item in zip(order, items):
+                    restored[position] = item
+                items = restored
+            document[key] = items
+        return document
+
+    # ---- 清单 ----
+
+    def manifest_dates(self):
+        if not self.manifests_dir.exists():
+            return []
+        return sorted(path.stem for path in self.manifests_dir.glob('*.json'))
+
+    def manifest_path(self, date):
+        return self.manifests_dir / f"{date}.json"
+
+    def load_manifest(self, date=None):
+        """读取不晚于date的最近一份清单（默认最新），没有时返回None"""
+        dates = self.manifest_dates()
+        position = bisect.bisect_right(dates, date) if date else len(dates)
+        if position == 0:
+            return None
+        return load_json(self.manifest_path(dates[position - 1]))
+
+    def snapshot(self, documents, date=None):
+        """保存一次运行的数据文件 {文件名: 内容}
+
+        稳定内容与上一份清单完全相同时不写入清单，返回None；否则写入当天的清单并返回其路径。
+        本次没有提供的文件沿用上一份清单中的条目（如某个抓取器失败）
+        """
+        date = date or datetime.date.today().isoformat()
+        previous = self.load_manifest()
+        files = dict(previous['files']) if previous else {}
+        for name, document in documents.items():
+            files[name] = self.split_document(document, name)
+
+        previous_digests = {name: entry['digest'] for name, entry in previous['files'].items()} if previous else None
+        if previous_digests == {name: entry['digest'] for name, entry in files.items()}:
+            return None
+
+        manifest = {'version': MANIFEST_VERSION, 'date': date, 'files': dict(sorted(files.items()))}
+        path = self.manifest_path(date)
+        # 清单使用缩进格式，每个对象哈希占一行，git只需保存变化的行
+        write_if_changed(path, dumps(manifest, pretty=True))
+        return path
+
+    def restore(self, date=None, output_dir=None):
+        """还原不晚于date的最近一份快照，返回 {文件名: 内容}；指定output_dir时同时写出文件"""
+        manifest = self.load_manifest(date)
+        if manifest is None:
+            raise FileNotFoundError(f"{self.manifests_dir} 中没有{'不晚于 ' + date + ' 的' if date else ''}快照")
+        documents = {name: self.restore_document(entry) for name, entry in manifest['files'].items()}
+        if output_dir is not None:
+            for name, document in documents.items():
+                write_if_changed(Path(output_dir) / name, dumps(document), checksum=True)
+        return documents
+
+
+def load_documents(data_dir):
+    """读取数据目录中存在的快照文件"""
+    documents = {}
+    for name in SNAPSHOT_FILES:
+        path = Path(data_dir) / name
+        if path.exists():
+            documents[name] = load_json(path)
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数据快照库")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    save_parser = subparsers.add_parser('save', help='将数据目录中的文件存入快照库')
+    save_parser.add_argument('--data-dir', default='data')
+    save_parser.add_argument('--date', help='快照日期（默认今天）')
+
+    restore_parser = subparsers.add_parser('restore', help='还原某一天（默认最新）的数据文件')
+    restore_parser.add_argument('date', nargs='?')
+    restore_parser.add_argument('--output', default='data')
+
+    subparsers.add_parser('list', help='列出所有快照')
+
+    parser.add_argument('--root', default=str(DEFAULT_SNAPSHOT_DIR))
+    args = parser.parse_args()
+    store = SnapshotStore(args.root)
+
+    if args.command == 'save':
+        documents = load_documents(args.data_dir)
+        path = store.snapshot(documents, args.date)
+        if path is None:
+            print(f"📸 {len(documents)} 个文件的内容与上一份快照相同，未写入新快照")
+        else:
+            print(f"📸 已保存快照 {path}（{len(documents)} 个文件）")
+    elif args.command == 'restore':
+        documents = store.restore(args.date, args.output)
+        manifest_date = store.load_manifest(args.date)['date']
+        print(f"♻️  已从 {manifest_date} 的快照还原 {len(documents)} 个文件到 {args.output}/")
+    elif args.command == 'list':
+        for date in store.manifest_dates():
+            manifest = load_json(store.manifest_path(date))
+            counts = ', '.join(f"{name} {sum(len(d) for d in entry['items'].values())} 条"
+                               for name, entry in manifest['files'].items())
+            print(f"{date}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
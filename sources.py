@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+数据来源插件与调度
+每个来源声明自己的获取函数、解析函数、限速规则、超时预算和备用内容；
+调度器在线程池中并行运行所有已注册的来源，超时或失败的来源改用备用内容，
+不会阻塞其他来源。结果按注册顺序汇总，与原先逐个调用的顺序一致
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from metrics import metrics
+
+# 常驻模式下来源未声明刷新间隔时使用的默认值（秒）
+DEFAULT_INTERVAL = 6 * 3600
+
+
+class Source:
+    """一个数据来源
+
+    fetch() 返回原始内容，parse(raw) 将其解析为记录列表；不需要解析的来源
+    可省略parse，此时fetch()直接返回记录。fallback() 在超时或失败时提供备用记录。
+    interval 是常驻模式（daemon.py）下的刷新间隔（秒）
+    """
+
+    def __init__(self, name, section, fetch, parse=None, fallback=None, timeout=15, rate_limits=None,
+                 interval=DEFAULT_INTERVAL):
+        self.name = name
+        self.section = section
+        self.fetch = fetch
+        self.parse = parse
+        self.fallback = fallback
+        self.timeout = timeout
+        self.rate_limits = rate_limits or {}
+        self.interval = interval
+
+    def run(self):
+        raw = self.fetch()
+        items = self.parse(raw) if self.parse else raw
+        return list(items)
+
+    def fallback_items(self):
+        return list(self.fallback()) if self.fallback else []
+
+
+def source_rate_limits(sources):
+    """合并多个来源声明的按主机限速规则"""
+    rate_limits = {}
+    for source in sources:
+        rate_limits.update(source.rate_limits)
+    return rate_limits
+
+
+class SourceRegistry:
+    def __init__(self):
+        self._sources = {}
+
+    def register(self, source):
+        if source.name in self._sources:
+            raise ValueError(f"数据来源重复注册: {source.name}")
+        self._sources[source.name] = source
+        return source
+
+    def sources(self, section=None):
+        """按注册顺序返回来源，可按分区过滤"""
+        return [s for s in self._sources.values() if section is None or s.section == section]
+
+    def __len__(self):
+        return len(self._sources)
+
+
+class SourceScheduler:
+    def __init__(self, registry, max_workers=8):
+        self.registry = registry
+        self.max_workers = max_workers
+        self.timings = {}
+        # 最近一次运行中超时或失败的来源 {名称: 原因}
+        self.failures = {}
+
+    def _run_source(self, source):
+        start = time.perf_counter()
+        try:
+            return source.run()
+        finally:
+            self.timings[source.name] = time.perf_counter() - start
+
+    def _use_fallback(self, source, reason):
+        self.failures[source.name] = reason
+        if source.fallback is None:
+            print(f"⚠️  来源 {source.name} {reason}，已跳过")
+            return []
+        print(f"⚠️  来源 {source.name} {reason}，改用备用内容")
+        metrics.incr('sources.fallbacks')
+        return source.fallback_items()
+
+    def run(self, section=None):
+        """并行运行来源，返回 {分区: 按注册顺序拼接的记录列表}"""
+        sources = self.registry.sources(section)
+        results = self.run_sources(sources)
+
+        by_section = {}
+        for source in sources:
+            by_section.setdefault(source.section, []).extend(results[source.name])
+        return by_section
+
+    def run_sources(self, sources):
+        """并行运行指定的来源，返回 {来源名称: 记录列表}"""
+        self.failures = {}
+        results = {}
+        if not sources:
+            return results
+
+        start = time.monotonic()
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources)),
+                                  thread_name_prefix='source')
+        try:
+            futures = {pool.submit(self._run_source, source): source for source in sources}
+            deadlines = {future: start + source.timeout for future, source in futures.items()}
+            pending = set(futures)
+
+            while pending:
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[f] <= now and not f.done()]:
+                    # 已在运行的线程无法强制终止：放弃等待，迟到的结果直接丢弃
+                    future.cancel()
+                    pending.discard(future)
+                    source = futures[future]
+                    metrics.incr('sources.timeouts')
+                    results[source.name] = self._use_fallback(source, f"超过 {source.timeout}s 时限")
+                if not pending:
+                    break
+
+                done, pending = wait(pending, timeout=max(0, min(deadlines[f] for f in pending) - now),
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = futures[future]
+                    try:
+                        results[source.name] = future.result()
+                        metrics.items(f"source.{source.name}", len(results[source.name]))
+                    except Exception as e:
+                        results[source.name] = self._use_fallback(source, f"运行失败: {e}")
+        finally:
+            # 不等待超时的来源结束，其请求受HTTP客户端自身的超时约束
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+流式JSON加载工具
+逐条读取抓取结果中的数据列表，支持JSON Lines和常规JSON两种格式，
+内存占用只与单条记录和读取块大小有关，与文件总大小无关
+"""
+
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JsonArrayStream:
+    """从 {"key": [...], ...} 结构的JSON文件中逐条读取 key 对应的列表元素"""
+
+    def __init__(self, path, key, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.key = key
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.file = None
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """读入下一块数据，丢弃已经消费的缓冲区内容"""
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _skip_whitespace(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self._fill():
+                return
+
+    def _peek(self):
+        self._skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError(f"{self.path}: JSON意外结束")
+        return self.buffer[self.pos]
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"{self.path}: 位置 {self.pos} 处应为 {char!r}")
+        self.pos += 1
+
+    def _decode_value(self):
+        """解码下一个完整的JSON值，缓冲区不足时继续读取"""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # 数值可能恰好在块边界被截断，需确认其后还有内容
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                self.pos = end
+                return value
+
+    def _seek_to_array(self):
+        """定位到目标列表的起始位置，找不到目标键时返回False"""
+        self._expect('{')
+        if self._peek() == '}':
+            return False
+        while True:
+            name = self._decode_value()
+            self._expect(':')
+            if name == self.key:
+                self._expect('[')
+                return True
+            self._decode_value()
+            if self._peek() == ',':
+                self.pos += 1
+                continue
+            self._expect('}')
+            return False
+
+    def __iter__(self):
+        with open(self.path, 'r', encoding='utf-8') as self.file:
+            if not self._seek_to_array():
+                raise KeyError(self.key)
+            if self._peek() == ']':
+                return
+            while True:
+                yield self._decode_value()
+                if self._peek() == ',':
+                    self.pos += 1
+                    continue
+                self._expect(']')
+                return
+
+
+def iter_json_lines(path):
+    """逐行读取JSON Lines文件，每行一条记录"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def has_section(path, key):
+    """检查常规JSON文件中是否存在目标列表（只扫描到该键为止）"""
+    stream = JsonArrayStream(path, key)
+    with open(path, 'r', encoding='utf-8') as stream.file:
+        return stream._seek_to_array()
+
+
+def iter_section_items(path, key):
+    """按文件后缀选择读取方式，逐条返回数据列表中的记录"""
+    if str(path).endswith('.jsonl'):
+        return iter_json_lines(path)
+    return iter(JsonArrayStream(path, key))
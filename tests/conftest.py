@@ -0,0 +1,7 @@
+"""测试直接导入仓库根目录下的模块"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
@@ -0,0 +1,115 @@
+import gzip
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+from api_server import create_server
+from atomic_io import atomic_write
+
+
+def dashboard(titles):
+    return {'last_updated': '2026-10-17T10:00:00', 'current_date': '2026年10月17日',
+            'environmental_news': [{'title': title} for title in titles],
+            'ai_tools': [], 'opportunities': [], 'metadata': {'total_items': len(titles)}}
+
+
+def write_dashboard(path, titles):
+    atomic_write(path, json.dumps(dashboard(titles), ensure_ascii=False), checksum=True)
+
+
+@pytest.fixture
+def api(tmp_path):
+    data_file = tmp_path / 'dashboard_data.json'
+    write_dashboard(data_file, ['新闻一', '新闻二'])
+    server = create_server(port=0, data_file=data_file, check_interval=0)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server, data_file
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path, headers=None, method='GET'):
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    try:
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def test_endpoints_serve_json(api):
+    server, _ = api
+    status, headers, body = request(server, '/news')
+    assert status == 200
+    assert headers['Content-Type'] == 'application/json; charset=utf-8'
+    assert [item['title'] for item in json.loads(body)] == ['新闻一', '新闻二']
+    assert json.loads(request(server, '/metadata')[2])['total_items'] == 2
+    assert request(server, '/missing')[0] == 404
+
+
+def test_etag_revalidation_returns_304(api):
+    server, _ = api
+    _, headers, _ = request(server, '/news')
+    etag = headers['ETag']
+    status, headers, body = request(server, '/news', {'If-None-Match': etag})
+    assert status == 304
+    assert body == b''
+    assert headers['ETag'] == etag
+    assert request(server, '/news', {'If-None-Match': '"stale"'})[0] == 200
+    assert request(server, '/news', {'If-None-Match': f'W/{etag}'})[0] == 304
+
+
+def test_gzip_has_its_own_etag(api):
+    server, _ = api
+    _, plain_headers, plain = request(server, '/news')
+    status, headers, body = request(server, '/news', {'Accept-Encoding': 'gzip'})
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip'
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(body) == plain
+    assert headers['ETag'] != plain_headers['ETag']
+    assert 'Content-Encoding' not in request(server, '/news', {'Accept-Encoding': 'gzip;q=0'})[1]
+    # 任一编码的ETag都可用于重新验证
+    assert request(server, '/news', {'Accept-Encoding': 'gzip', 'If-None-Match': plain_headers['ETag']})[0] == 304
+
+
+def test_head_sends_headers_only(api):
+    server, _ = api
+    status, headers, body = request(server, '/news', method='HEAD')
+    assert status == 200
+    assert int(headers['Content-Length']) > 0
+    assert body == b''
+
+
+def test_hot_reload_after_data_file_changes(api):
+    server, data_file = api
+    _, headers, _ = request(server, '/news')
+    write_dashboard(data_file, ['新闻三'])
+    # 确保修改时间不同，与文件系统的时间精度无关
+    stat = os.stat(data_file)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    status, new_headers, body = request(server, '/news', {'If-None-Match': headers['ETag']})
+    assert status == 200
+    assert [item['title'] for item in json.loads(body)] == ['新闻三']
+    assert new_headers['ETag'] != headers['ETag']
+
+
+def test_corrupt_reload_keeps_old_data_and_retries(api):
+    server, data_file = api
+    _, headers, body = request(server, '/news')
+    # 数据文件已更新但校验和文件还是旧的，视为发布尚未完成
+    data_file.write_text(json.dumps(dashboard(['新闻四']), ensure_ascii=False), encoding='utf-8')
+
+    status, _, served = request(server, '/news')
+    assert status == 200
+    assert served == body
+
+    write_dashboard(data_file, ['新闻四'])
+    stat = os.stat(data_file)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10 ** 9))
+    assert [item['title'] for item in json.loads(request(server, '/news')[2])] == ['新闻四']
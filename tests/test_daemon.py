@@ -0,0 +1,24 @@
+import pytest
+
+from daemon import parse_args
+
+
+def test_intervals_can_be_repeated():
+    _, args = parse_args(['--once', '--interval', 'fenner_news=600', '--interval', 'github=1.5'])
+    assert args.once
+    assert args.intervals == {'fenner_news': 600.0, 'github': 1.5}
+
+
+@pytest.mark.parametrize('argv', [
+    ['--interval'],
+    ['--interval', 'fenner_news'],
+    ['--interval', 'fenner_news=soon'],
+    ['--interval', '=60'],
+    ['--interval', 'fenner_news=0'],
+    ['--serve', 'http'],
+])
+def test_malformed_arguments_are_reported(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        parse_args(argv)
+    assert exc.value.code == 2
+    assert 'error' in capsys.readouterr().err
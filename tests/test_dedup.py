@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+import html_extract
+from data_processor import DashboardDataProcessor
+from dedup import NearDuplicateFilter
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'fixtures' / 'fenner_news.html'
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return DashboardDataProcessor(incremental=False)
+
+
+def kept(dedup_filter, items):
+    return list(dedup_filter.filter(items))
+
+
+@pytest.mark.parametrize('names', [
+    [f"tool-{i}" for i in range(1000)],
+    [f"{keyword}-{i}" for keyword in ('ecology', 'climate', 'gis', 'remote-sensing') for i in range(60)],
+    ['Python地理空间生态系统', 'R地理空间生态系统'],
+])
+def test_distinct_short_names_are_not_merged(names):
+    items = [{'name': name} for name in names]
+    assert kept(NearDuplicateFilter(['name']), items) == items
+
+
+def test_tools_with_different_links_are_not_merged(processor):
+    items = [{'name': 'geopandas', 'summary': '地理空间数据处理', 'link': f"https://github.com/{owner}/geopandas"}
+             for owner in ('geopandas', 'fork')]
+    assert list(processor.deduplicate('ai_tools', items)) == items
+
+
+def test_fenner_stories_survive_and_reposts_merge(processor):
+    stories = html_extract.extract_news_items(FIXTURE.read_bytes(), 'https://fennerschool.anu.edu.au/', limit=None)
+    for story in stories:
+        story['source'] = 'ANU Fenner School'
+    reposts = [dict(story, source='澳大利亚气候委员会', link=f"{story['link']}#repost") for story in stories]
+
+    result = list(processor.deduplicate('environmental_news', stories + reposts))
+
+    assert len(stories) == 24
+    assert result == stories
+
+
+def test_list_input_is_not_bounded():
+    items = [{'title': f"报道 {i} 关于 流域 {i * 7} 水质"} for i in range(30)]
+    dedup_filter = NearDuplicateFilter(['title'])
+    assert len(kept(dedup_filter, items + items)) == 30
+
+
+def test_stream_index_is_bounded():
+    items = [{'title': f"报道 {i} 关于 流域 {i * 7} 水质"} for i in range(30)]
+    dedup_filter = NearDuplicateFilter(['title'], max_entries=10)
+    # 最近10条之内的重复项被合并，更早的已被淘汰
+    assert len(kept(dedup_filter, iter(items + items[-5:] + items[:5]))) == 35
+    assert len(dedup_filter.entries) == 10
+
+
+def test_result_does_not_depend_on_hash_seed():
+    import subprocess
+    import sys
+
+    code = ("import dedup; f = dedup.NearDuplicateFilter(['t']);"
+            "print(sum(1 for _ in f.filter({'t': f'tool {i % 97} {i % 13}'} for i in range(500))))")
+    root = Path(__file__).resolve().parent.parent
+    outputs = {subprocess.run([sys.executable, '-c', code], cwd=root, env={'PYTHONHASHSEED': seed},
+                              capture_output=True, text=True, check=True).stdout
+               for seed in ('1', '2', '3')}
+    assert len(outputs) == 1
@@ -0,0 +1,56 @@
+from github_discovery import GitHubDiscovery, RepoCache, mock_search_server
+from http_client import AsyncFetcher
+from resilience import Resilience
+
+
+class BrokenResponse:
+    status_code = 200
+    headers = {}
+
+    def json(self):
+        raise ValueError("Expecting value: line 1 column 1 (char 0)")
+
+
+class BrokenFetcher:
+    async def fetch(self, url, params=None, headers=None):
+        return BrokenResponse()
+
+
+def make_discovery(fetcher, cache_path, search_url, keywords):
+    return GitHubDiscovery(fetcher, keywords=keywords, search_url=search_url, per_page=50,
+                           max_pages=2, max_requests=10, cache=RepoCache(cache_path))
+
+
+def test_discovery_against_stub_and_pool_filtered_by_keywords(tmp_path):
+    server = mock_search_server(total_per_keyword=60)
+    search_url = f"http://127.0.0.1:{server.server_port}/search/repositories"
+    cache_path = tmp_path / 'repos.json'
+    try:
+        fetcher = AsyncFetcher(resilience=Resilience())
+        pool = make_discovery(fetcher, cache_path, search_url, ['hydrology', 'ecology']).discover()
+        assert len(pool) == 120
+        stars = [entry['repo']['stargazers_count'] for entry in pool]
+        assert stars == sorted(stars, reverse=True)
+
+        # 同一个缓存，换一组关键词：候选池不包含其他关键词的仓库
+        second = make_discovery(fetcher, cache_path, search_url, ['geospatial'])
+        pool = second.discover()
+        assert len(pool) == 60
+        assert {entry['keyword'] for entry in pool} == {'geospatial'}
+        assert len(RepoCache(cache_path).entries) == 180
+    finally:
+        server.shutdown()
+
+
+def test_unparseable_page_is_a_failed_page_and_cache_is_saved(tmp_path):
+    cache_path = tmp_path / 'repos.json'
+    cache = RepoCache(cache_path)
+    cache.put({'full_name': 'mock/ecology-1', 'stargazers_count': 120}, 'ecology')
+    discovery = GitHubDiscovery(BrokenFetcher(), keywords=['ecology', 'hydrology'], cache=cache)
+
+    pool = discovery.discover()
+
+    assert discovery.stats['pages'] == 0
+    assert [entry['repo']['full_name'] for entry in pool] == ['mock/ecology-1']
+    assert cache_path.exists()
+    assert 'mock/ecology-1' in RepoCache(cache_path).entries
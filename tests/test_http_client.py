@@ -0,0 +1,161 @@
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_cache import HTTPCache
+from http_client import AsyncFetcher, TokenBucket
+from resilience import CircuitOpenError, Resilience, RetryPolicy
+
+BODY = '环境数据 ok'.encode('utf-8')
+
+
+class StubServer:
+    """本地桩服务器：按路径返回慢响应、间歇性503、限流429或带ETag的gzip响应"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.hits = {}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with stub.lock:
+                    stub.hits[self.path] = stub.hits.get(self.path, 0) + 1
+                    count = stub.hits[self.path]
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    self.route(count)
+                finally:
+                    with stub.lock:
+                        stub.active -= 1
+
+            def route(self, count):
+                if self.path.startswith('/slow'):
+                    time.sleep(0.2)
+                    self.reply(200, BODY)
+                elif self.path == '/flaky':
+                    self.reply(503 if count <= 2 else 200, BODY)
+                elif self.path == '/down':
+                    self.reply(503, b'down')
+                elif self.path == '/limited':
+                    self.reply(429 if count == 1 else 200, BODY, {'Retry-After': '3600'})
+                elif self.path == '/etag':
+                    if self.headers.get('If-None-Match') == '"v1"':
+                        self.reply(304, b'', {'ETag': '"v1"'})
+                    else:
+                        self.reply(200, gzip.compress(BODY), {'ETag': '"v1"', 'Content-Encoding': 'gzip'})
+                else:
+                    self.reply(404, b'')
+
+            def reply(self, status, body, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+def fast_resilience(**kwargs):
+    return Resilience(RetryPolicy(base_delay=0.01, max_delay=0.05), **kwargs)
+
+
+def test_concurrent_requests_share_the_host_limit(stub):
+    fetcher = AsyncFetcher(per_host_limit=4, resilience=fast_resilience())
+    start = time.perf_counter()
+    results = fetcher.fetch_all([{'url': f"{stub.url}/slow/{i}"} for i in range(4)])
+    elapsed = time.perf_counter() - start
+
+    assert [r.status_code for r in results] == [200] * 4
+    assert results[0].content == BODY
+    assert elapsed < 0.6
+    assert stub.max_active > 1
+
+
+def test_per_host_limit_serializes_requests(stub):
+    fetcher = AsyncFetcher(per_host_limit=1, resilience=fast_resilience())
+    fetcher.fetch_all([{'url': f"{stub.url}/slow/{i}"} for i in range(3)])
+    assert stub.max_active == 1
+
+
+def test_token_bucket_paces_requests(stub):
+    fetcher = AsyncFetcher(rate_limits={'127.0.0.1': TokenBucket(rate=20, capacity=1)},
+                           resilience=fast_resilience())
+    start = time.perf_counter()
+    fetcher.fetch_all([{'url': f"{stub.url}/flaky"}] + [{'url': f"{stub.url}/etag"} for _ in range(4)])
+    # 容量为1，之后每个请求等待1/20秒
+    assert time.perf_counter() - start >= 0.2
+
+
+def test_retryable_status_is_retried(stub):
+    fetcher = AsyncFetcher(resilience=fast_resilience())
+    response = fetcher.get(f"{stub.url}/flaky")
+    assert response.status_code == 200
+    assert stub.hits['/flaky'] == 3
+
+
+def test_retry_after_is_capped(stub):
+    fetcher = AsyncFetcher(resilience=fast_resilience())
+    start = time.perf_counter()
+    response = fetcher.get(f"{stub.url}/limited")
+    assert response.status_code == 200
+    assert time.perf_counter() - start < 1
+
+
+def test_breaker_opens_after_repeated_failures(stub):
+    fetcher = AsyncFetcher(resilience=fast_resilience(failure_threshold=3))
+    assert fetcher.get(f"{stub.url}/down").status_code == 503
+    with pytest.raises(CircuitOpenError):
+        fetcher.get(f"{stub.url}/down")
+    assert stub.hits['/down'] == 3
+
+
+def test_results_keep_input_order_and_errors():
+    closed = ThreadingHTTPServer(('127.0.0.1', 0), BaseHTTPRequestHandler)
+    url = f"http://127.0.0.1:{closed.server_port}/"
+    closed.server_close()
+
+    fetcher = AsyncFetcher(resilience=fast_resilience())
+    results = fetcher.fetch_all([{'url': url}])
+    assert isinstance(results[0], requests.ConnectionError)
+    assert fetcher.fetch_all([]) == []
+
+
+def test_conditional_cache_reuses_decoded_body(stub, tmp_path):
+    cache = HTTPCache(tmp_path / 'http')
+    fetcher = AsyncFetcher(cache=cache, resilience=fast_resilience())
+
+    first = fetcher.get(f"{stub.url}/etag")
+    second = fetcher.get(f"{stub.url}/etag")
+
+    assert first.content == second.content == BODY
+    assert not first.from_cache
+    assert second.from_cache
+    assert 'Content-Encoding' not in second.headers
+    assert second.headers['Content-Length'] == str(len(BODY))
+    assert cache.stats['hits'] == 1
@@ -0,0 +1,49 @@
+import copy
+import random
+
+import pytest
+
+from profiles import (DEFAULT_LIMITS, Profile, scoring_groups, select_profiles, should_use_pool)
+from ranking import load_ranking
+
+
+def make_profiles(count):
+    base = load_ranking()
+    profiles = []
+    for index in range(count):
+        config = copy.deepcopy(base.config)
+        if index % 2:
+            config['environmental_news']['order'] = 'asc'
+        profiles.append(Profile(f"p{index}", type(base)(config),
+                                {'ai_tools': 3 + index % 3, 'opportunities': 4}))
+    return profiles
+
+
+def make_items(n, seed=0):
+    rng = random.Random(seed)
+    return {
+        'environmental_news': [{'title': f"新闻标题 {i}", 'date': f"2026-10-{rng.randint(1, 28):02d}",
+                                'category': rng.choice(['climate', 'policy'])} for i in range(n)],
+        'ai_tools': [{'name': f"tool-{i}", 'stars': rng.randint(0, 5000),
+                      'category': rng.choice(['GIS', '数据分析', '建模'])} for i in range(n)],
+        'opportunities': [{'title': f"机会 {i}", 'type': rng.choice(['志愿者', '实习', '工作']),
+                           'location': rng.choice(['悉尼', '堪培拉'])} for i in range(n)],
+    }
+
+
+@pytest.mark.parametrize('n, count, workers, expected', [
+    (20000, 16, 1, False),   # 单个CPU时进程池不会更快
+    (500, 2, 8, False),      # 工作量太小，抵不上进程池开销
+    (20000, 16, 8, True),
+])
+def test_pool_is_sized_by_total_work(n, count, workers, expected):
+    items = make_items(n)
+    groups = scoring_groups(make_profiles(count), list(items))
+    assert should_use_pool(groups, items, workers) is expected
+
+
+def test_pooled_selection_matches_shared():
+    profiles = make_profiles(4)
+    items = make_items(300)
+    assert select_profiles(profiles, items, 2, use_pool=True) == select_profiles(profiles, items, use_pool=False)
+    assert set(select_profiles(profiles, items, use_pool=False)['p0']) == set(DEFAULT_LIMITS)
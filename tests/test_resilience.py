@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+
+from http_client import AsyncFetcher
+from resilience import DEFAULT_RUN_DEADLINE, Resilience, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_retry_after_is_capped_at_max_delay():
+    policy = RetryPolicy(max_delay=8.0)
+    assert policy.delay(0, FakeResponse({'Retry-After': '3600'})) == 8.0
+    assert policy.delay(0, FakeResponse({'Retry-After': '2'})) == 2.0
+
+
+def test_run_without_start_run_has_default_deadline():
+    resilience = Resilience()
+    remaining = resilience.deadline.remaining()
+    assert remaining <= DEFAULT_RUN_DEADLINE
+    assert remaining > DEFAULT_RUN_DEADLINE - 5
+    # 同一次运行共用同一个截止时间
+    assert resilience.deadline is resilience.deadline
+    resilience.start_run(None)
+    assert resilience.deadline.remaining() == float('inf')
+
+
+class SlowSession:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def get(self, url, **kwargs):
+        time.sleep(self.delay)
+        raise AssertionError("请求应已被取消")
+
+
+def test_cancelled_probe_releases_half_open_breaker():
+    resilience = Resilience(failure_threshold=1, reset_timeout=0.0)
+    breaker = resilience.breaker('example.org')
+    breaker.record_failure()
+    assert breaker.state == 'half-open'
+
+    fetcher = AsyncFetcher(session=SlowSession(0.2), resilience=resilience)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(fetcher.fetch('http://example.org/'), 0.05))
+
+    assert not breaker.probing
+    assert breaker.allow()
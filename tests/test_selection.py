@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from data_processor import DashboardDataProcessor
+from profiles import DEFAULT_LIMITS, RECORD_TYPES
+from ranking import load_ranking
+
+URGENCIES = ['high', 'medium', 'low', 'unknown', None]
+CATEGORIES = ['climate', 'academic', 'policy', 'GIS', '编程', 'other', None]
+TYPES = ['志愿者', '兼职研究', '全职就业', '其他']
+LOCATIONS = ['堪培拉ACT - ANU Acton校区', '悉尼NSW', 'Namadgi National Park', '']
+
+
+def tied_items(rng, n):
+    """取值范围很小、含缺失字段的三个分区数据，制造大量同分项"""
+    sections = {
+        'environmental_news': [{'title': rng.choice('ab'), 'urgency': rng.choice(URGENCIES),
+                                'category': rng.choice(CATEGORIES),
+                                'date': rng.choice(['2026-01-01', '2026-01-02', ''])} for _ in range(n)],
+        'ai_tools': [{'name': rng.choice('abc'), 'category': rng.choice(CATEGORIES),
+                      'difficulty': rng.choice(['初级', '中级', '高级', '?'])} for _ in range(n)],
+        'opportunities': [{'title': rng.choice('abcd'), 'type': rng.choice(TYPES),
+                           'location': rng.choice(LOCATIONS)} for _ in range(n)],
+    }
+    for items in sections.values():
+        for item in items:
+            for field in list(item):
+                if rng.random() < 0.1:
+                    del item[field]
+    return sections
+
+
+def full_sort_select(section, items, ranking):
+    """对照实现：完整稳定排序后贪心选取，前3项自由入选，之后每个类别只再选一项"""
+    ordered = sorted(items, key=ranking.key(section), reverse=ranking.descending(section))
+    limit = DEFAULT_LIMITS[section]
+    if section == 'environmental_news':
+        return ordered[:limit]
+    selected, seen = [], set()
+    for item in ordered:
+        if len(selected) >= limit:
+            break
+        group = RECORD_TYPES[section].group_of(item)
+        if len(selected) < 3 or group not in seen:
+            selected.append(item)
+            seen.add(group)
+    return selected
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_top_k_selection_matches_full_sort(seed, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = random.Random(seed)
+    processor = DashboardDataProcessor(incremental=False)
+    ranking = load_ranking()
+    for section, items in tied_items(rng, rng.randint(0, 60)).items():
+        assert processor.rank_and_select(section, items) == full_sort_select(section, items, ranking)
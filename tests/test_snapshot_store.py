@@ -0,0 +1,46 @@
+import random
+
+from snapshot_store import SnapshotStore
+
+
+def dashboard(opportunities):
+    return {'last_updated': '2026-10-17T10:00:00', 'current_date': '2026年10月17日',
+            'environmental_news': [], 'ai_tools': [], 'opportunities': opportunities,
+            'metadata': {'total_items': len(opportunities), 'last_processing_time': 'x', 'next_update': 'y'}}
+
+
+OPPORTUNITIES = [{'title': f"机会{i}", 'type': '志愿者', 'date': '2026-10-17'} for i in range(6)]
+
+
+def test_dashboard_ranking_order_is_content(tmp_path):
+    store = SnapshotStore(tmp_path)
+    ranked = store.split_document(dashboard(OPPORTUNITIES), 'dashboard_data.json')
+    reordered = store.split_document(dashboard(OPPORTUNITIES[::-1]), 'dashboard_data.json')
+    assert ranked['digest'] != reordered['digest']
+
+
+def test_shuffled_scraper_output_is_unchanged(tmp_path):
+    store = SnapshotStore(tmp_path)
+    shuffled = OPPORTUNITIES[:]
+    random.Random(1).shuffle(shuffled)
+    first = store.split_document({'last_updated': 'a', 'opportunities': OPPORTUNITIES}, 'opportunities.json')
+    second = store.split_document({'last_updated': 'b', 'opportunities': shuffled}, 'opportunities.json')
+    assert first['digest'] == second['digest']
+
+
+def test_snapshot_round_trip_restores_order_and_volatile_fields(tmp_path):
+    store = SnapshotStore(tmp_path)
+    shuffled = OPPORTUNITIES[:]
+    random.Random(2).shuffle(shuffled)
+    documents = {'opportunities.json': {'last_updated': 'a', 'opportunities': shuffled},
+                 'dashboard_data.json': dashboard(OPPORTUNITIES)}
+    assert store.snapshot(documents, '2026-10-17') is not None
+    assert store.restore() == documents
+    # 内容相同、只有顺序和时间戳不同时不写入新清单
+    again = {'opportunities.json': {'last_updated': 'b', 'opportunities': OPPORTUNITIES},
+             'dashboard_data.json': dashboard(OPPORTUNITIES)}
+    assert store.snapshot(again, '2026-10-18') is None
+    # 仪表盘的排序变化写入新清单
+    reranked = dict(again, **{'dashboard_data.json': dashboard(OPPORTUNITIES[::-1])})
+    assert store.snapshot(reranked, '2026-10-19') is not None
+    assert store.restore() == reranked